@@ -4,49 +4,57 @@ Episode: cursor_foodapp → postvibereportmajorfixes_2026
 
 Clean, modular backend for 3-ring comfort food system.
 Now with centralized food registry and metadata.
+
+Public names are imported lazily (PEP 562): `import backend` is cheap and
+each submodule loads on first attribute access.
 """
 
+import importlib
+
 __version__ = "1.0.1"
 
-from .taste_vector import UserTasteVector, FoodDistance, PersonalityProfile, ComfortRingAssignment
-from .archetypes import Archetype
-from .food_data import FOODS, DIMENSION_NAMES, VALID_VALUES
-from .food_registry import (
-    FOOD_REGISTRY,
-    FoodProfile,
-    validate_food_registry,
-    get_food_metadata,
-    list_all_foods
-)
-from .distance import euclidean_distance, compute_distance_with_archetypes
-from .ring_assignment import assign_to_rings, compute_ring_thresholds
-from .explanations import (
-    determine_personality,
-    generate_personality_explanation,
-    explain_ring_assignment,
-    explain_food_distance
-)
-
-__all__ = [
-    "UserTasteVector",
-    "FoodDistance",
-    "PersonalityProfile",
-    "ComfortRingAssignment",
-    "Archetype",
-    "FOODS",
-    "DIMENSION_NAMES",
-    "VALID_VALUES",
-    "FOOD_REGISTRY",
-    "FoodProfile",
-    "validate_food_registry",
-    "get_food_metadata",
-    "list_all_foods",
-    "euclidean_distance",
-    "compute_distance_with_archetypes",
-    "assign_to_rings",
-    "compute_ring_thresholds",
-    "determine_personality",
-    "generate_personality_explanation",
-    "explain_ring_assignment",
-    "explain_food_distance",
-]
+# Public name -> defining submodule
+_EXPORTS = {
+    "UserTasteVector": ".taste_vector",
+    "FoodDistance": ".taste_vector",
+    "PersonalityProfile": ".taste_vector",
+    "ComfortRingAssignment": ".taste_vector",
+    "Archetype": ".archetypes",
+    "FOODS": ".food_data",
+    "DIMENSION_NAMES": ".food_data",
+    "VALID_VALUES": ".food_data",
+    "FOOD_REGISTRY": ".food_registry",
+    "FoodProfile": ".food_registry",
+    "validate_food_registry": ".food_registry",
+    "get_food_metadata": ".food_registry",
+    "list_all_foods": ".food_registry",
+    "euclidean_distance": ".distance",
+    "compute_distance_with_archetypes": ".distance",
+    "assign_to_rings": ".ring_assignment",
+    "compute_ring_thresholds": ".ring_assignment",
+    "determine_personality": ".explanations",
+    "generate_personality_explanation": ".explanations",
+    "explain_ring_assignment": ".explanations",
+    "explain_food_distance": ".explanations",
+    "write_ring_assignment": ".explanations",
+    "write_food_distance": ".explanations",
+    "Catalog": ".catalog",
+    "get_catalog": ".catalog",
+    "register_food": ".catalog",
+    "unregister_food": ".catalog",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # cache: later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,275 @@
+"""
+Admission control and load shedding for the scoring endpoints.
+Episode: perf_2026
+
+Without a limit, a traffic spike queues /assign_to_rings requests in the
+threadpool and every request's latency grows until clients time out.
+AdmissionMiddleware bounds that:
+
+- at most FOOD_API_ADMISSION_CONCURRENCY requests run at once (0 disables
+  admission control);
+- up to FOOD_API_ADMISSION_QUEUE more wait, first come first served, for
+  at most FOOD_API_ADMISSION_MAX_WAIT_MS (or the client's
+  X-Request-Timeout-Ms, if shorter);
+- anything else is shed at once with 503 and a Retry-After estimate: when
+  the queue is full, or when the expected wait (queue position × recent
+  service time / concurrency) already exceeds the request's wait budget.
+  Waiters whose budget runs out are shed the same way.
+
+Requests admitted while FOOD_API_ADMISSION_DEGRADE_DEPTH or more are
+queued run degraded (see degraded()): the endpoint serves a cached answer
+for the nearest canonical profile with the same filter (canonical_keys())
+or a lean response
+without contributions and explanation, instead of the full computation.
+
+The controller lives on the event loop; no locks are needed because the
+middleware only touches it from coroutines.
+"""
+
+import asyncio
+import json
+import math
+import os
+from collections import deque
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Deque, FrozenSet, Iterable, Iterator, Optional, Set, Tuple
+
+from .archetypes import Archetype
+from .metrics import REGISTRY
+from .result_cache import ResultKey, result_key
+
+ADMISSION_CONCURRENCY = int(os.environ.get("FOOD_API_ADMISSION_CONCURRENCY", "32"))
+ADMISSION_QUEUE = int(os.environ.get("FOOD_API_ADMISSION_QUEUE", "64"))
+ADMISSION_MAX_WAIT_MS = float(os.environ.get("FOOD_API_ADMISSION_MAX_WAIT_MS", "1000"))
+ADMISSION_DEGRADE_DEPTH = int(os.environ.get("FOOD_API_ADMISSION_DEGRADE_DEPTH", "16"))
+ADMISSION_PATHS: FrozenSet[str] = frozenset(
+    path.strip()
+    for path in os.environ.get("FOOD_API_ADMISSION_PATHS", "/assign_to_rings").split(",")
+    if path.strip()
+)
+
+TIMEOUT_HEADER = b"x-request-timeout-ms"
+
+# Initial service time estimate, before any request has completed
+INITIAL_SERVICE_SECONDS = 0.005
+# Weight of the latest request in the service time moving average
+SERVICE_TIME_ALPHA = 0.1
+
+QUEUE_DEPTH = REGISTRY.gauge(
+    "food_api_admission_queue_depth",
+    "Requests waiting for an admission slot.",
+)
+IN_FLIGHT = REGISTRY.gauge(
+    "food_api_admission_in_flight",
+    "Admitted requests currently running.",
+)
+SHED = REGISTRY.counter(
+    "food_api_admission_shed_total",
+    "Requests rejected with 503 by reason (queue_full, deadline, timeout).",
+    ("reason",),
+)
+DEGRADED = REGISTRY.counter(
+    "food_api_admission_degraded_total",
+    "Requests served degraded under load, by mode (canonical, lean).",
+    ("mode",),
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    "food_api_admission_wait_seconds",
+    "Time admitted requests spent waiting for a slot.",
+)
+
+_degraded: ContextVar[bool] = ContextVar("food_api_degraded", default=False)
+
+
+def degraded() -> bool:
+    """True inside a request that was admitted under load and should degrade."""
+    return _degraded.get()
+
+
+class Shed(Exception):
+    """A request rejected by admission control."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded, deadline-aware FIFO wait queue."""
+
+    def __init__(
+        self,
+        concurrency: int = ADMISSION_CONCURRENCY,
+        queue_size: int = ADMISSION_QUEUE,
+        max_wait_ms: float = ADMISSION_MAX_WAIT_MS,
+        degrade_depth: int = ADMISSION_DEGRADE_DEPTH,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.max_wait = max_wait_ms / 1000
+        self.degrade_depth = degrade_depth
+        self.in_flight = 0
+        self.service_time = INITIAL_SERVICE_SECONDS
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self, position: int) -> float:
+        """Estimated seconds until the request at queue `position` (1-based) is admitted."""
+        return position * self.service_time / self.concurrency
+
+    def retry_after(self) -> int:
+        """Whole seconds until the current queue should have drained (at least 1)."""
+        return max(1, math.ceil(self.expected_wait(self.queue_depth + 1)))
+
+    async def acquire(self, budget: Optional[float] = None) -> bool:
+        """
+        Wait for a slot for at most `budget` seconds (default: max_wait).
+        Returns whether the request should run degraded.
+
+        Raises:
+            Shed: If the request is rejected; no slot is held.
+        """
+        budget = self.max_wait if budget is None else min(budget, self.max_wait)
+        if self.in_flight < self.concurrency and not self._waiters:
+            self._admit()
+            return self.queue_depth >= self.degrade_depth
+
+        position = self.queue_depth + 1
+        if position > self.queue_size:
+            raise Shed("queue_full", self.retry_after())
+        if self.expected_wait(position) > budget:
+            raise Shed("deadline", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        QUEUE_DEPTH.set(self.queue_depth)
+        started = perf_counter()
+        try:
+            await asyncio.wait((waiter,), timeout=budget)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if not waiter.done():
+            self._abandon(waiter)
+            raise Shed("timeout", self.retry_after())
+        QUEUE_WAIT.observe(perf_counter() - started)
+        # release() handed its slot over (in_flight already counts it)
+        return self.queue_depth >= self.degrade_depth
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        IN_FLIGHT.set(self.in_flight)
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        """Drop a waiter that gave up; a slot handed to it in the meantime is released."""
+        if waiter.done() and not waiter.cancelled():
+            self.release()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        QUEUE_DEPTH.set(self.queue_depth)
+
+    def release(self, service_time: Optional[float] = None) -> None:
+        """Free a slot, handing it to the oldest live waiter if any."""
+        if service_time is not None:
+            self.service_time += SERVICE_TIME_ALPHA * (service_time - self.service_time)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                QUEUE_DEPTH.set(self.queue_depth)
+                return
+        QUEUE_DEPTH.set(0)
+        self.in_flight -= 1
+        IN_FLIGHT.set(self.in_flight)
+
+
+def _client_budget(scope) -> Optional[float]:
+    for name, value in scope.get("headers", ()):
+        if name == TIMEOUT_HEADER:
+            try:
+                return max(0.0, float(value) / 1000)
+            except ValueError:
+                return None
+    return None
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware applying an AdmissionController to POST requests
+    on `paths` (default FOOD_API_ADMISSION_PATHS).
+    """
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None, paths: Iterable[str] = ADMISSION_PATHS):
+        self.app = app
+        self.controller = controller if controller is not None else AdmissionController()
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller
+        try:
+            degrade = await controller.acquire(_client_budget(scope))
+        except Shed as shed:
+            SHED.inc(reason=shed.reason)
+            await _send_overloaded(send, shed)
+            return
+
+        token = _degraded.set(degrade)
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _degraded.reset(token)
+            controller.release(perf_counter() - started)
+
+
+async def _send_overloaded(send, shed: Shed) -> None:
+    body = json.dumps({"detail": "Server overloaded, retry later", "reason": shed.reason}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"retry-after", str(int(shed.retry_after)).encode("latin-1")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def canonical_keys(
+    user_vec: Tuple[float, ...],
+    dislikes: Set[str],
+    archetypes: Set[Archetype],
+    catalog_version: str,
+    subset: Optional[int] = None,
+) -> Iterator[ResultKey]:
+    """
+    Result keys of the nearest canonical profiles, nearest first: the same
+    taste vector and filter without dislikes, with the same archetypes,
+    then each single archetype, then none. The warmup set covers the last
+    two for unfiltered requests; a filter is a hard constraint, so filtered
+    requests only match cached results for the same subset and otherwise
+    fall through to the lean path.
+    """
+    seen = {result_key(user_vec, dislikes, archetypes, catalog_version, subset)}
+    candidates = [archetypes] + [{arch} for arch in sorted(archetypes, key=lambda a: a.value)] + [set()]
+    for candidate in candidates:
+        key = result_key(user_vec, (), candidate, catalog_version, subset)
+        if key not in seen:
+            seen.add(key)
+            yield key
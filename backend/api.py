@@ -10,35 +10,87 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, field_validator
-from typing import List, Optional, Set
+from typing import List, Optional, Set, Tuple
+import json
+import threading
 
 from backend import (
     UserTasteVector,
     Archetype,
     assign_to_rings,
     VALID_VALUES,
+    DIMENSION_NAMES,
     FOODS,
     validate_food_registry,
     get_food_metadata,
     list_all_foods
 )
+from backend.metrics import REGISTRY, PROMETHEUS_CONTENT_TYPE
+from backend.timing import TIMING_ENABLED, ServerTimingMiddleware, stage, mark
+from backend import profiling
+from backend.catalog import build_catalog, get_catalog, install_catalog
+from backend.snapshot import load_snapshot
+from backend.result_cache import ResultCache, result_key
+from backend.shared_cache import RESULT_STORE
+from backend.warmup import WarmupScheduler, warmup_plan
+from backend.live import LiveSession
+from backend.deltas import diff_ring_responses, result_hash
+from backend.neighborhood import neighborhood_preview
+from backend import streaming
+from backend.topk import top_k_stretch
+from backend.spatial_index import foods_within, nearest_foods
+from backend.similarity import SIMILAR_MAX_K
+from backend.filters import resolve_filter, subset_food_ids
+from backend.search import search_foods
+from backend.browse import DEFAULT_PAGE_SIZE, browse_foods
+from backend.http_cache import conditional_parts
+from backend.binary_format import BINARY_MEDIA_TYPE, encode_ring_response, wants_binary
+from backend import bundle  # noqa: F401  (registers the "bundle_bodies" table)
+from backend.assignment_store import ASSIGNMENT_RESCORE, open_assignment_store
+from backend.approx_thresholds import THRESHOLD_ERROR, error_field, sampled_selection
+from backend.admission import (
+    ADMISSION_CONCURRENCY,
+    DEGRADED,
+    AdmissionController,
+    AdmissionMiddleware,
+    canonical_keys,
+    degraded,
+)
 
 app = FastAPI(title="Food Personality API", version="1.0.1")
 
-# Validate food registry on startup
+# Load the catalog on startup: use the precompiled snapshot when its content
+# hash matches the registry, otherwise validate and compile from scratch.
 @app.on_event("startup")
 async def startup_validation():
     """Validate food registry on application startup."""
+    catalog = load_snapshot()
+    if catalog is not None:
+        install_catalog(catalog)
+        print(f"✅ Catalog loaded from snapshot: {len(catalog)} foods (version {catalog.version})")
+        return
     try:
         validate_food_registry()
-        print("✅ Food registry validated: 18 foods with complete metadata")
+        catalog = build_catalog(validated=True)
+        catalog.table("food_similarity")
+        catalog.table("http_bodies")
+        install_catalog(catalog)
+        print(f"✅ Food registry validated: {len(catalog)} foods with complete metadata")
     except ValueError as e:
         print(f"❌ Food registry validation failed:\n{e}")
         raise
 
+# Admission control for the scoring endpoint (FOOD_API_ADMISSION_*, see
+# backend/admission.py). Added before CORS so shed 503s still carry CORS headers.
+ADMISSION = AdmissionController() if ADMISSION_CONCURRENCY > 0 else None
+if ADMISSION is not None:
+    app.add_middleware(AdmissionMiddleware, controller=ADMISSION)
+
 # CORS configuration - allow frontend on localhost:8081
 app.add_middleware(
     CORSMiddleware,
@@ -50,8 +102,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "Retry-After", "X-Degraded"],
 )
 
+# Per-stage timing (Server-Timing header + /metrics histograms).
+# Disabled entirely with FOOD_API_TIMING=0.
+if TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
 
 class AssignRingsRequest(BaseModel):
     """Request payload for /assign_to_rings endpoint"""
@@ -62,6 +120,9 @@ class AssignRingsRequest(BaseModel):
     psychological_distance: float
     dislikes: Optional[List[str]] = []
     archetypes: Optional[List[str]] = []
+    since: Optional[str] = None  # result_hash of the client's previous result
+    filter: Optional[str] = None  # catalog subset, see backend/filters.py
+    user_id: Optional[str] = None  # store the result for this user (if the assignment store is enabled)
 
     @field_validator('spice_intensity', 'texture_intensity', 'preparation_familiarity', 'richness', 'psychological_distance')
     @classmethod
@@ -93,8 +154,180 @@ class AssignRingsRequest(BaseModel):
         return v
 
 
+def format_food_distance(fd) -> dict:
+    """Response entry for one food: distance result + display metadata."""
+    metadata = get_food_metadata(fd.food_name)
+    return {
+        "food_name": fd.food_name,
+        "display_name": metadata["display_name"],
+        "distance": fd.distance,
+        "ring": fd.ring,
+        "dimension_contributions": fd.dimension_contributions,
+        "image_url": metadata["image_url"],
+        "description": metadata["description"],
+        "origin": metadata["origin"],
+        "region": metadata["region"],
+    }
+
+
+def format_lean_food_distance(fd) -> dict:
+    """format_food_distance() without dimension_contributions (never computed)."""
+    metadata = get_food_metadata(fd.food_name)
+    return {
+        "food_name": fd.food_name,
+        "display_name": metadata["display_name"],
+        "distance": fd.distance,
+        "ring": fd.ring,
+        "image_url": metadata["image_url"],
+        "description": metadata["description"],
+        "origin": metadata["origin"],
+        "region": metadata["region"],
+    }
+
+
+def threshold_error_field(assignment) -> Optional[dict]:
+    """The "threshold_error" entry of approximate responses, None for exact thresholds."""
+    return error_field(assignment.threshold_error)
+
+
+def format_ring_assignment(assignment) -> dict:
+    """Full /assign_to_rings response body for an assignment."""
+    body = {
+        "ring_0": [format_food_distance(fd) for fd in assignment.ring_0],
+        "ring_1": [format_food_distance(fd) for fd in assignment.ring_1],
+        "ring_2": [format_food_distance(fd) for fd in assignment.ring_2],
+        "personality": {
+            "primary_personality": assignment.personality.primary_personality,
+            "secondary_personality": assignment.personality.secondary_personality,
+            "confidence_primary": assignment.personality.confidence_primary,
+            "confidence_secondary": assignment.personality.confidence_secondary,
+            "explanation": assignment.personality.explanation,
+        },
+        "ring_thresholds": list(assignment.ring_thresholds),
+    }
+    threshold_error = threshold_error_field(assignment)
+    if threshold_error is not None:
+        body["threshold_error"] = threshold_error
+    return body
+
+
+def compute_ring_response(
+    user_vector: UserTasteVector,
+    dislikes: Set[str],
+    archetypes: Set[Archetype],
+    subset: Optional[int] = None,
+) -> dict:
+    """
+    Ring assignment response for the given inputs, served from the result
+    cache when possible. Cached bodies are shared: callers must not mutate them.
+
+    `subset` is a resolved filter bitmap (filters.resolve_filter); None
+    assigns the whole catalog.
+    """
+    catalog = get_catalog()
+    key = result_key(user_vector.to_tuple(), dislikes, archetypes, catalog.version, subset)
+    response = RESULT_STORE.get(key)
+    if response is None:
+        assignment = assign_to_rings(
+            user_vector=user_vector,
+            dislikes=dislikes,
+            archetypes=archetypes,
+            food_ids=subset_food_ids(subset, catalog),
+            threshold_error=THRESHOLD_ERROR,
+        )
+        with stage("format"):
+            response = format_ring_assignment(assignment)
+            response["result_hash"] = result_hash(response)
+        RESULT_STORE.put(key, response)
+    RESULT_HISTORY.put(response["result_hash"], response)
+    return response
+
+
+def degraded_ring_response(
+    user_vector: UserTasteVector,
+    dislikes: Set[str],
+    archetypes: Set[Archetype],
+    subset: Optional[int] = None,
+) -> Optional[Tuple[str, dict]]:
+    """
+    Cheaper stand-in for compute_ring_response() under load, as (mode, body):
+    - "canonical": the cached result of the nearest canonical profile
+      (admission.canonical_keys), if any is cached;
+    - "lean": a fresh assignment without dimension_contributions, the
+      personality explanation or a result_hash (not cached).
+    None when the exact result is cached: it is served normally.
+    """
+    catalog = get_catalog()
+    user_vec = user_vector.to_tuple()
+    if RESULT_STORE.get(result_key(user_vec, dislikes, archetypes, catalog.version, subset)) is not None:
+        return None
+    for key in canonical_keys(user_vec, dislikes, archetypes, catalog.version, subset):
+        response = RESULT_STORE.get(key)
+        if response is not None:
+            return "canonical", response
+
+    assignment = assign_to_rings(
+        user_vector=user_vector,
+        dislikes=dislikes,
+        archetypes=archetypes,
+        food_ids=subset_food_ids(subset, catalog),
+        contributions=False,
+        threshold_error=THRESHOLD_ERROR,
+    )
+    with stage("format"):
+        personality = assignment.personality
+        body = {
+            "ring_0": [format_lean_food_distance(fd) for fd in assignment.ring_0],
+            "ring_1": [format_lean_food_distance(fd) for fd in assignment.ring_1],
+            "ring_2": [format_lean_food_distance(fd) for fd in assignment.ring_2],
+            "personality": {
+                "primary_personality": personality.primary_personality,
+                "secondary_personality": personality.secondary_personality,
+                "confidence_primary": personality.confidence_primary,
+                "confidence_secondary": personality.confidence_secondary,
+            },
+            "ring_thresholds": list(assignment.ring_thresholds),
+        }
+        threshold_error = threshold_error_field(assignment)
+        if threshold_error is not None:
+            body["threshold_error"] = threshold_error
+    return "lean", body
+
+
+# Recently served results by result_hash: bases for `since` patches
+RESULT_HISTORY = ResultCache(
+    maxsize=int(os.environ.get("FOOD_API_RESULT_HISTORY_SIZE", "4096")),
+    tier="history",
+)
+
+
+def conditional_response(response: dict, since: Optional[str]) -> dict:
+    """
+    Answer relative to the client's previous result `since`:
+    - same hash: {"unchanged": true, "result_hash": ...}
+    - base still in RESULT_HISTORY: {"patch": ..., "base_hash": ..., "result_hash": ...}
+    - otherwise (no base / evicted): the full response
+    """
+    if since is None:
+        return response
+    if since == response["result_hash"]:
+        return {"unchanged": True, "result_hash": since}
+    base = RESULT_HISTORY.get(since)
+    if base is None:
+        return response
+    return {
+        "patch": diff_ring_responses(base, response),
+        "base_hash": since,
+        "result_hash": response["result_hash"],
+    }
+
+
 @app.post("/assign_to_rings")
-def assign_to_rings_endpoint(request: AssignRingsRequest):
+def assign_to_rings_endpoint(
+    request: AssignRingsRequest,
+    response: Response,
+    accept: Optional[str] = Header(None),
+):
     """
     Compute comfort rings for the given taste vector.
     
@@ -102,64 +335,300 @@ def assign_to_rings_endpoint(request: AssignRingsRequest):
     - ring_0, ring_1, ring_2: lists of foods with distances
     - personality: primary + secondary personality with confidence scores
     - ring_thresholds: the distance thresholds used
+    - threshold_error: {quantile, confidence} bound of approximate thresholds
+      (FOOD_API_THRESHOLD_ERROR, large catalogs only); absent when exact
+    - result_hash: stable hash of this result
+
+    If `since` (a previous result_hash) is sent, the reply is an "unchanged"
+    marker or a compact patch against that result when it is still cached
+    (see conditional_response); clients rebuild ring order by sorting on
+    (distance, food_name).
+
+    `filter` restricts the assignment to a catalog subset, e.g.
+    "origin=Mexico|Japan; spice_intensity!=high" (see backend/filters.py).
+
+    With `Accept: application/x-food-rings`, full responses are sent in the
+    compact binary layout of backend/binary_format.py (`since` replies stay JSON).
+
+    Under load (see backend/admission.py) requests may be shed with 503 +
+    Retry-After, or served degraded: a JSON body marked by an `X-Degraded:
+    canonical|lean` header (see degraded_ring_response), never persisted.
     """
+    # Time since request start covers body parsing + Pydantic validation
+    mark("validate")
     try:
-        # Build user taste vector
-        user_vector = UserTasteVector(
-            spice_intensity=request.spice_intensity,
-            texture_intensity=request.texture_intensity,
-            preparation_familiarity=request.preparation_familiarity,
-            richness=request.richness,
-            psychological_distance=request.psychological_distance,
-        )
+        user_vector, dislikes, archetype_set = request_inputs(request)
+        with stage("filter"):
+            subset = resolve_filter(request.filter)
+        if degraded():
+            fallback = degraded_ring_response(user_vector, dislikes, archetype_set, subset)
+            if fallback is not None:
+                mode, body = fallback
+                DEGRADED.inc(mode=mode)
+                response.headers["X-Degraded"] = mode
+                return body
+        result_body = compute_ring_response(user_vector, dislikes, archetype_set, subset)
+        if request.user_id and ASSIGNMENT_STORE is not None:
+            with stage("persist"):
+                ASSIGNMENT_STORE.record(request.user_id, stored_inputs(request), result_body, get_catalog())
+        result = conditional_response(result_body, request.since)
+        if result is result_body and wants_binary(accept):
+            with stage("encode"):
+                body = encode_ring_response(result_body, get_catalog())
+            return Response(content=body, media_type=BINARY_MEDIA_TYPE, headers={"Vary": "Accept"})
+        return result
 
-        # Convert archetypes from strings to Archetype enums
-        archetype_set: Set[Archetype] = set()
-        for arch_str in request.archetypes:
-            archetype_set.add(Archetype(arch_str))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
-        # Call backend logic
-        assignment = assign_to_rings(
-            user_vector=user_vector,
-            dislikes=set(request.dislikes),
-            archetypes=archetype_set
+
+@app.post("/assign_to_rings/neighbors")
+def assign_to_rings_neighbors(request: AssignRingsRequest):
+    """
+    Preview ring changes for every one-step slider move (±1 level on each
+    dimension) in a single call. Returns the base thresholds/ring sizes and,
+    per adjacent profile, only the foods whose ring would change.
+    """
+    mark("validate")
+    reject_filter(request)
+    try:
+        user_vector, dislikes, archetype_set = request_inputs(request)
+        with stage("neighbors"):
+            return neighborhood_preview(user_vector, dislikes, archetype_set, threshold_error=THRESHOLD_ERROR)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
+
+@app.post("/assign_to_rings/stream")
+def assign_to_rings_stream(
+    request: AssignRingsRequest,
+    format: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+):
+    """
+    Progressive variant of /assign_to_rings: thresholds and Ring 0 first,
+    then Rings 1 and 2, then the personality.
+
+    Server-sent events by default; newline-delimited JSON with
+    ?format=ndjson or `Accept: application/x-ndjson`.
+    """
+    try:
+        media_type = streaming.choose_stream_format(accept, format)
+        user_vector, dislikes, archetype_set = request_inputs(request)
+        user_vector.validate()
+        subset = resolve_filter(request.filter)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    catalog = get_catalog()
+    key = result_key(user_vector.to_tuple(), dislikes, archetype_set, catalog.version, subset)
+    cached = RESULT_STORE.get(key)
+    if cached is not None:
+        events = streaming.cached_ring_events(cached)
+    else:
+        events = streaming.ring_events(
+            user_vector, dislikes, archetype_set, format_food_distance, subset_food_ids(subset, catalog),
+            threshold_error=THRESHOLD_ERROR,
         )
 
-        # Format response
-        def format_food_distance(fd):
-            metadata = get_food_metadata(fd.food_name)
-            return {
-                "food_name": fd.food_name,
-                "display_name": metadata["display_name"],
-                "distance": fd.distance,
-                "ring": fd.ring,
-                "dimension_contributions": fd.dimension_contributions,
-                "image_url": metadata["image_url"],
-                "description": metadata["description"],
-                "origin": metadata["origin"],
-                "region": metadata["region"],
-            }
+    encode = streaming.encode_sse if media_type == streaming.SSE_MEDIA_TYPE else streaming.encode_ndjson
+    return StreamingResponse(encode(events), media_type=media_type, headers={"Cache-Control": "no-cache"})
 
-        return {
-            "ring_0": [format_food_distance(fd) for fd in assignment.ring_0],
-            "ring_1": [format_food_distance(fd) for fd in assignment.ring_1],
-            "ring_2": [format_food_distance(fd) for fd in assignment.ring_2],
-            "personality": {
-                "primary_personality": assignment.personality.primary_personality,
-                "secondary_personality": assignment.personality.secondary_personality,
-                "confidence_primary": assignment.personality.confidence_primary,
-                "confidence_secondary": assignment.personality.confidence_secondary,
-                "explanation": assignment.personality.explanation,
-            },
-            "ring_thresholds": list(assignment.ring_thresholds),
-        }
 
+@app.post("/recommendations/stretch")
+def stretch_recommendations(request: AssignRingsRequest, k: int = 10):
+    """
+    The K closest Ring 1 ("Safe Stretch") and K closest Ring 2 dishes,
+    selected without sorting or formatting the rest of the catalog.
+    """
+    mark("validate")
+    reject_filter(request)
+    if not 0 <= k <= 1000:
+        raise HTTPException(status_code=400, detail="k must be between 0 and 1000")
+    try:
+        user_vector, dislikes, archetype_set = request_inputs(request)
+        with stage("topk"):
+            result = top_k_stretch(user_vector, dislikes, archetype_set, k, threshold_error=THRESHOLD_ERROR)
+        with stage("format"):
+            body = {
+                "k": k,
+                "ring_1": [format_food_distance(fd) for fd in result.ring_1],
+                "ring_2": [format_food_distance(fd) for fd in result.ring_2],
+                "ring_thresholds": list(result.ring_thresholds),
+                "ring_sizes": list(result.ring_sizes),
+            }
+            threshold_error = threshold_error_field(result)
+            if threshold_error is not None:
+                body["threshold_error"] = threshold_error
+            return body
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
 
+class NearbyFoodsRequest(AssignRingsRequest):
+    """Request payload for /foods/nearby: a taste profile plus a radius or k"""
+    metric: str = "euclidean"  # "euclidean" or "archetype"
+    radius: Optional[float] = None
+    k: Optional[int] = None
+
+
+def reject_filter(request: AssignRingsRequest) -> None:
+    """400 for endpoints that always work on the whole catalog."""
+    if request.filter:
+        raise HTTPException(status_code=400, detail="filter is not supported by this endpoint")
+
+
+def request_inputs(request: AssignRingsRequest) -> Tuple[UserTasteVector, Set[str], Set[Archetype]]:
+    """Backend inputs (taste vector, dislikes, archetype enums) for a validated request."""
+    # Build user taste vector
+    user_vector = UserTasteVector(
+        spice_intensity=request.spice_intensity,
+        texture_intensity=request.texture_intensity,
+        preparation_familiarity=request.preparation_familiarity,
+        richness=request.richness,
+        psychological_distance=request.psychological_distance,
+    )
+
+    # Convert archetypes from strings to Archetype enums
+    archetype_set: Set[Archetype] = set()
+    for arch_str in request.archetypes:
+        archetype_set.add(Archetype(arch_str))
+
+    return user_vector, set(request.dislikes), archetype_set
+
+
+# Optional per-user persistence (FOOD_API_ASSIGNMENT_DB), see backend/assignment_store.py
+ASSIGNMENT_STORE = open_assignment_store()
+
+
+def stored_inputs(request: AssignRingsRequest) -> dict:
+    """The request fields a stored assignment can be re-scored from."""
+    return request.model_dump(include=set(DIMENSION_NAMES) | {"dislikes", "archetypes", "filter"})
+
+
+def rescore_inputs(inputs: dict) -> dict:
+    """
+    Ring response for stored inputs on the current catalog.
+
+    Raises:
+        ValueError: If the inputs no longer validate (e.g. a disliked food was removed).
+    """
+    request = AssignRingsRequest(**inputs)
+    user_vector, dislikes, archetype_set = request_inputs(request)
+    return compute_ring_response(user_vector, dislikes, archetype_set, resolve_filter(request.filter))
+
+
+@app.on_event("startup")
+async def start_assignment_store():
+    """Start the batched writer and, if configured, the bulk re-score of stale rows."""
+    if ASSIGNMENT_STORE is None:
+        return
+    ASSIGNMENT_STORE.start()
+    if ASSIGNMENT_RESCORE:
+        threading.Thread(
+            target=ASSIGNMENT_STORE.rescore_stale,
+            args=(get_catalog(), rescore_inputs),
+            name="assignment-rescore",
+            daemon=True,
+        ).start()
+
+
+@app.on_event("shutdown")
+async def stop_assignment_store():
+    if ASSIGNMENT_STORE is not None:
+        ASSIGNMENT_STORE.close()
+
+
+@app.get("/users/{user_id}/assignment")
+def get_user_assignment(user_id: str):
+    """
+    A user's last stored assignment (compact entries: food_name, ring,
+    distance, dimension_contributions), re-scored on the fly if it was
+    computed on an older catalog version.
+
+    Raises:
+        HTTPException: 404 if the store is disabled or the user is unknown,
+            409 if stale inputs can no longer be re-scored
+    """
+    if ASSIGNMENT_STORE is None:
+        raise HTTPException(status_code=404, detail="Assignment store is disabled (set FOOD_API_ASSIGNMENT_DB)")
+    try:
+        stored = ASSIGNMENT_STORE.get(user_id, get_catalog(), rescore_inputs)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=f"Stored inputs can no longer be re-scored: {e}")
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"No stored assignment for user '{user_id}'")
+    return stored
+
+
+def _compute_live_state(state: dict) -> dict:
+    # pydantic's ValidationError is a ValueError: invalid state -> error frame
+    user_vector, dislikes, archetype_set = request_inputs(AssignRingsRequest(**state))
+    return compute_ring_response(user_vector, dislikes, archetype_set)
+
+
+@app.websocket("/ws/rings")
+async def live_rings(websocket: WebSocket):
+    """
+    Live-slider session. Each client message is an incremental change to
+    the profile (see backend/live.py); the first reply is a full snapshot,
+    later replies carry only the foods whose ring or distance changed plus
+    the new thresholds and personality. Invalid messages get an error frame
+    and leave the session state unchanged.
+    """
+    await websocket.accept()
+    session = LiveSession(_compute_live_state)
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                frame = await run_in_threadpool(session.apply, json.loads(text))
+            except ValueError as e:
+                frame = {"type": "error", "detail": str(e)}
+            await websocket.send_json(frame)
+    except WebSocketDisconnect:
+        pass
+
+
+def _warm_result(vector, archetypes) -> None:
+    compute_ring_response(UserTasteVector(*vector), set(), set(archetypes))
+
+
+# Background cache warmup, started once the catalog is loaded
+warmup_scheduler = WarmupScheduler(_warm_result, warmup_plan())
+
+
+@app.on_event("startup")
+async def start_warmup():
+    """Start precomputing the warm set (after the catalog is installed)."""
+    warmup_scheduler.start()
+
+
+@app.on_event("shutdown")
+async def stop_warmup():
+    warmup_scheduler.stop()
+
+
+@app.get("/ready")
+def ready():
+    """
+    Readiness probe: 503 until the warm set is computed. Items that keep
+    failing after their retries are reported in "errors" but stay cold
+    rather than holding readiness back.
+    Unlike the / health check, load balancers should gate traffic on this.
+    """
+    body = {"ready": warmup_scheduler.ready, "warmup": warmup_scheduler.progress()}
+    if not warmup_scheduler.ready:
+        return JSONResponse(status_code=503, content=body)
+    return body
+
+
 @app.get("/")
 def root():
     """Health check endpoint"""
@@ -171,22 +640,173 @@ def root():
     }
 
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus metrics (text exposition format)."""
+    return Response(content=REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def require_debug_access(x_admin_token: Optional[str] = Header(None)):
+    """
+    Gate for /debug endpoints.
+
+    404 unless FOOD_API_DEBUG=1 (so the routes are invisible by default);
+    403 if FOOD_API_ADMIN_TOKEN is set and X-Admin-Token doesn't match.
+    """
+    if not profiling.DEBUG_ENDPOINTS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if profiling.ADMIN_TOKEN is not None and x_admin_token != profiling.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.post("/debug/profile", dependencies=[Depends(require_debug_access)])
+def debug_profile(seconds: float = 5.0, interval_ms: float = 5.0, include_idle: bool = False, format: str = "json"):
+    """
+    Run a sampling profile of this worker for `seconds`.
+
+    The collapsed-stack flamegraph file is written to FOOD_API_PROFILE_DIR.
+    format=collapsed returns the file contents instead of a JSON summary.
+    Only one profile runs at a time (409 otherwise).
+    """
+    try:
+        result = profiling.run_sampling_profile(seconds, interval_ms / 1000.0, include_idle)
+    except profiling.ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if format == "collapsed":
+        return PlainTextResponse("".join(f"{stack} {count}\n" for stack, count in sorted(result.stacks.items())))
+    return {
+        "path": result.path,
+        "duration": result.duration,
+        "interval": result.interval,
+        "samples": result.samples,
+        "top_stacks": [{"stack": stack, "count": count} for stack, count in result.top()],
+    }
+
+
+@app.post("/debug/memory/start", dependencies=[Depends(require_debug_access)])
+def debug_memory_start(frames: int = 25):
+    """Start tracemalloc allocation tracking (`frames` traceback depth, 1-65535)."""
+    try:
+        return profiling.start_allocation_tracking(frames)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/debug/memory/snapshot", dependencies=[Depends(require_debug_access)])
+def debug_memory_snapshot(limit: int = 20, key_type: str = "lineno"):
+    """Top allocation sites, plus the diff against the previous snapshot."""
+    if key_type not in ("lineno", "filename", "traceback"):
+        raise HTTPException(status_code=400, detail="key_type must be lineno, filename or traceback")
+    try:
+        return profiling.take_allocation_snapshot(limit, key_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@app.post("/debug/memory/stop", dependencies=[Depends(require_debug_access)])
+def debug_memory_stop():
+    """Stop tracemalloc allocation tracking."""
+    return profiling.stop_allocation_tracking()
+
+
 @app.get("/foods")
-def get_all_foods():
+def get_all_foods(
+    filter: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
     """
     Get list of all available foods with their IDs.
-    
+
+    Args:
+        filter: Optional filter expression (see backend/filters.py)
+        limit, cursor: Page size and the previous page's next_cursor
+        fields: Comma-separated metadata columns to include per food
+
     Returns:
-        List of food IDs
+        List of food IDs. When limit, cursor or fields is given, one page in
+        stable catalog order with "total" and "next_cursor" (see backend/browse.py)
+
+    The unparameterised list is pre-rendered per catalog version and served
+    with an ETag, Cache-Control and gzip/br encodings (see backend/http_cache.py).
     """
+    if filter is None and limit is None and cursor is None and fields is None:
+        return prerendered_response("/foods", if_none_match, accept_encoding)
+
+    try:
+        subset = resolve_filter(filter)
+        if limit is not None or cursor is not None or fields is not None:
+            return browse_foods(DEFAULT_PAGE_SIZE if limit is None else limit, cursor, fields, subset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    foods = list_all_foods() if subset is None else list(subset_food_ids(subset))
     return {
-        "foods": list_all_foods(),
-        "count": len(list_all_foods())
+        "foods": foods,
+        "count": len(foods)
     }
 
 
+@app.post("/foods/nearby")
+def get_nearby_foods(request: NearbyFoodsRequest):
+    """
+    Foods near a taste profile, from the grid spatial index.
+
+    Pass `radius` for every food within that distance, or `k` for the k
+    nearest (default 10). With metric "archetype", dislikes and archetypes
+    adjust distances exactly as in /assign_to_rings.
+    """
+    reject_filter(request)
+    if request.radius is not None and request.k is not None:
+        raise HTTPException(status_code=400, detail="Pass either radius or k, not both")
+    try:
+        user_vector, dislikes, archetype_set = request_inputs(request)
+        vector = user_vector.to_tuple()
+        with stage("index"):
+            if request.radius is not None:
+                neighbors = foods_within(vector, request.radius, request.metric, dislikes, archetype_set)
+            else:
+                k = 10 if request.k is None else request.k
+                neighbors = nearest_foods(vector, k, request.metric, dislikes, archetype_set)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "metric": request.metric,
+        "foods": [{"food_name": food_id, "distance": distance} for food_id, distance in neighbors],
+        "count": len(neighbors),
+    }
+
+
+# Declared before /foods/{food_id} so "search" is not taken as a food ID
+@app.get("/foods/search")
+def search_food_catalog(q: str, limit: int = 10, prefix: bool = True):
+    """
+    Ranked full-text search over food names, descriptions, origins and
+    regions. The last query word also matches as a prefix (typeahead)
+    unless prefix=false.
+    """
+    try:
+        with stage("search"):
+            results = search_foods(q, limit, prefix)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"query": q, "results": results, "count": len(results)}
+
+
 @app.get("/foods/{food_id}")
-def get_food(food_id: str):
+def get_food(
+    food_id: str,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
     """
     Get complete metadata for a specific food.
     
@@ -195,15 +815,99 @@ def get_food(food_id: str):
     
     Returns:
         Complete food metadata including taste profile, description, origin, image URL
+        (pre-rendered, with ETag / 304 support)
     
     Raises:
         HTTPException: 404 if food not found
     """
     try:
-        metadata = get_food_metadata(food_id)
-        return metadata
+        return prerendered_response(f"/foods/{food_id}", if_none_match, accept_encoding)
+    except KeyError:
+        pass
+    try:
+        # Registry changed since the catalog was compiled: serve uncached
+        return get_food_metadata(food_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+def prerendered_response(
+    path: str,
+    if_none_match: Optional[str],
+    accept_encoding: Optional[str],
+    table: str = "http_bodies",
+) -> Response:
+    """
+    Serve a catalog body rendered for the current catalog version (from
+    the catalog table `table`, keyed by path).
+
+    Raises:
+        KeyError: If no body is rendered for `path`.
+    """
+    rendered = get_catalog().table(table)[path]
+    status, body, headers = conditional_parts(rendered, if_none_match, accept_encoding)
+    media_type = "application/json" if status == 200 else None
+    return Response(content=body, status_code=status, headers=headers, media_type=media_type)
+
+
+def reject_approximate_bundle() -> None:
+    """
+    The bundle reproduces exact thresholds only: refuse it (409) while this
+    server estimates thresholds for the catalog (FOOD_API_THRESHOLD_ERROR),
+    since client results would not match the server's.
+    """
+    if sampled_selection(len(get_catalog()), THRESHOLD_ERROR):
+        raise HTTPException(
+            status_code=409,
+            detail="The evaluation bundle uses exact thresholds; this server estimates them for the current catalog",
+        )
+
+
+@app.get("/bundle")
+def get_evaluation_bundle(
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    """
+    Client-side evaluation bundle: catalog vectors plus the distance,
+    threshold and personality rules, to compute rings without a round trip
+    (see backend/bundle.py). Pre-rendered, with ETag / 304 support.
+    409 while thresholds are approximate.
+    """
+    reject_approximate_bundle()
+    return prerendered_response("/bundle", if_none_match, accept_encoding, table="bundle_bodies")
+
+
+@app.get("/bundle/conformance")
+def get_bundle_conformance(
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    """Conformance cases (inputs + exact expected results) for the current bundle."""
+    reject_approximate_bundle()
+    return prerendered_response("/bundle/conformance", if_none_match, accept_encoding, table="bundle_bodies")
+
+
+@app.get("/foods/{food_id}/similar")
+def get_similar_foods(food_id: str, k: int = 10):
+    """
+    Dishes most similar to `food_id` (nearest taste vectors), served from
+    the precomputed similarity index.
+
+    Raises:
+        HTTPException: 404 if food not found, 400 if k is out of range
+    """
+    if not 0 <= k <= SIMILAR_MAX_K:
+        raise HTTPException(status_code=400, detail=f"k must be between 0 and {SIMILAR_MAX_K}")
+    try:
+        similar = get_catalog().table("food_similarity").similar(food_id, k)
     except KeyError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    return {
+        "food_id": food_id,
+        "similar": [{"food_name": name, "distance": distance} for name, distance in similar],
+        "count": len(similar),
+    }
 
 
 if __name__ == "__main__":
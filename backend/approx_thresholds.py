@@ -0,0 +1,106 @@
+"""
+Approximate ring thresholds for very large catalogs.
+Episode: perf_2026
+
+Exact thresholds (ring_assignment.compute_ring_thresholds) sort every
+distance before any food can be classified. With an error bound ε > 0
+(assign_to_rings(..., threshold_error=ε); FOOD_API_THRESHOLD_ERROR in the
+API), the base percentiles are estimated from a stratified sample
+instead, and every food is then classified in one pass:
+
+- The rows are split into m equal strata and one row is drawn from each
+  (seeded, so results are deterministic). m = ⌈ln(2/δ) / (2ε²)⌉ is the
+  Dvoretzky–Kiefer–Wolfowitz sample size. With probability at least
+  1 - δ (δ = 1 - FOOD_API_THRESHOLD_CONFIDENCE), each estimated base
+  threshold lies between the (p - ε) and (p + ε) quantiles of the exact
+  distances.
+- Only the m sampled distances are computed up front and sorted: the
+  sample needs nothing but catalog indices (sample_rows). Every food is
+  then computed, classified and bucketed in one pass
+  (ring_assignment.partitioned_distance_table).
+
+The bound is on the rank of the base thresholds. Archetype scaling is
+applied to the estimate as in exact mode. Selections no larger than m
+are always assigned exactly (bound 0). validate_thresholds.py measures
+how often ring membership actually differs from exact mode.
+
+Every server path that produces rings (full and lean assignments,
+streaming, neighborhood previews, top-K stretch) honours the bound and
+reports it with error_field(). The client evaluation bundle (bundle.py)
+can only reproduce exact thresholds, so the API refuses to serve it while
+the catalog is large enough to be sampled (sampled_selection()).
+"""
+
+import math
+import os
+import random
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Optional, Sequence, Tuple
+
+THRESHOLD_ERROR = float(os.environ.get("FOOD_API_THRESHOLD_ERROR", "0"))
+THRESHOLD_CONFIDENCE = float(os.environ.get("FOOD_API_THRESHOLD_CONFIDENCE", "0.99"))
+
+# Seed of the per-stratum draws
+SAMPLE_SEED = 0
+
+
+def sample_size(error: float, confidence: float = THRESHOLD_CONFIDENCE) -> int:
+    """
+    Sample size for quantile rank error at most `error` with probability `confidence`.
+
+    Raises:
+        ValueError: If error is not in (0, 0.5) or confidence not in (0, 1).
+    """
+    if not 0 < error < 0.5:
+        raise ValueError("threshold error must be between 0 and 0.5")
+    if not 0 < confidence < 1:
+        raise ValueError("threshold confidence must be between 0 and 1")
+    return math.ceil(math.log(2 / (1 - confidence)) / (2 * error * error))
+
+
+@lru_cache(maxsize=32)
+def stratified_sample(n: int, size: int, seed: int = SAMPLE_SEED) -> Tuple[int, ...]:
+    """`size` row numbers out of range(n), one from each of `size` equal strata, ascending."""
+    rng = random.Random(seed)
+    return tuple(rng.randrange(k * n // size, (k + 1) * n // size) for k in range(size))
+
+
+def sample_rows(n: int, error: float, confidence: float = THRESHOLD_CONFIDENCE) -> Optional[Tuple[int, ...]]:
+    """
+    Rows of a selection of `n` foods to sample for thresholds within
+    `error`, or None when the sample would not be smaller than the
+    selection (use the exact thresholds).
+    """
+    size = sample_size(error, confidence)
+    if n <= size:
+        return None
+    return stratified_sample(n, size)
+
+
+def threshold_sample(
+    distances: Sequence[float],
+    error: float,
+    confidence: float = THRESHOLD_CONFIDENCE
+) -> Optional[List[float]]:
+    """sample_rows() of already computed `distances`, or None (use the exact thresholds)."""
+    rows = sample_rows(len(distances), error, confidence)
+    if rows is None:
+        return None
+    return list(itemgetter(*rows)(distances))
+
+
+def sampled_selection(n: int, error: float, confidence: float = THRESHOLD_CONFIDENCE) -> bool:
+    """True if a selection of `n` foods gets estimated (not exact) thresholds under `error`."""
+    return error > 0 and n > sample_size(error, confidence)
+
+
+def error_field(error: float, confidence: float = THRESHOLD_CONFIDENCE) -> Optional[dict]:
+    """The "threshold_error" response entry for an error bound, None for exact thresholds."""
+    if not error:
+        return None
+    return {"quantile": error, "confidence": confidence}
+
+
+if THRESHOLD_ERROR:
+    sample_size(THRESHOLD_ERROR)  # reject a bad configuration at startup, not per request
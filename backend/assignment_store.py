@@ -0,0 +1,348 @@
+"""
+Persistent per-user assignment store.
+Episode: perf_2026
+
+Optional (enabled by FOOD_API_ASSIGNMENT_DB=path/to/assignments.db). When
+a request carries a user_id, the user's inputs and a compact copy of the
+result are kept in SQLite, so re-engagement campaigns can read assignments
+back instead of recomputing everyone from raw quiz answers.
+
+- Rows hold the request inputs (JSON), the catalog version and the result
+  in the binary layout of binary_format.py (catalog indices, a few hundred
+  bytes per user).
+- Writes go through a bounded queue to a single writer thread that commits
+  them in batches (FOOD_API_ASSIGNMENT_BATCH rows or every
+  FOOD_API_ASSIGNMENT_FLUSH_MS), so the request path never waits on disk.
+  When the queue is full a write is dropped and counted, never blocking.
+- Reads use a small connection pool (FOOD_API_ASSIGNMENT_POOL).
+- Rows from an older catalog version are stale: they are re-scored from
+  their stored inputs when read, or all at once by rescore_stale() (run at
+  startup with FOOD_API_ASSIGNMENT_RESCORE=1, or via this module's CLI).
+  Re-scores are conditional writes: they only replace a row that still
+  holds the stale version and the same inputs, so an answer the user
+  submitted meanwhile is never overwritten.
+"""
+
+import sys
+import os
+
+# Add parent directory to path for imports (when run as a script)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from backend.metrics import REGISTRY
+
+ASSIGNMENT_DB = os.environ.get("FOOD_API_ASSIGNMENT_DB", "")
+ASSIGNMENT_POOL_SIZE = int(os.environ.get("FOOD_API_ASSIGNMENT_POOL", "4"))
+ASSIGNMENT_BATCH = int(os.environ.get("FOOD_API_ASSIGNMENT_BATCH", "200"))
+ASSIGNMENT_FLUSH_MS = float(os.environ.get("FOOD_API_ASSIGNMENT_FLUSH_MS", "50"))
+ASSIGNMENT_QUEUE_SIZE = int(os.environ.get("FOOD_API_ASSIGNMENT_QUEUE", "10000"))
+ASSIGNMENT_RESCORE = os.environ.get("FOOD_API_ASSIGNMENT_RESCORE", "0") == "1"
+
+ASSIGNMENT_WRITES = REGISTRY.counter(
+    "food_api_assignment_writes_total",
+    "Assignment store writes by outcome (written, dropped, failed).",
+    ("result",),
+)
+ASSIGNMENT_RESCORES = REGISTRY.counter(
+    "food_api_assignment_rescores_total",
+    "Stale stored assignments re-scored, by trigger (read, bulk).",
+    ("trigger",),
+)
+
+# (user_id, inputs JSON, catalog version, compact result, updated timestamp,
+#  stale catalog version the row must still have: re-scores only, else None)
+Row = Tuple[str, str, str, bytes, float, Optional[str]]
+
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections (WAL mode) shared across threads."""
+
+    def __init__(self, path: str, size: int = ASSIGNMENT_POOL_SIZE):
+        self.path = path
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        for _ in range(size):
+            conn = sqlite3.connect(path, timeout=10.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._pool.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+class AssignmentStore:
+    """
+    Args:
+        path: SQLite database file.
+        encode: (response, catalog) -> compact bytes
+        decode: (bytes, catalog) -> compact response
+    """
+
+    def __init__(
+        self,
+        path: str,
+        encode: Callable[[dict, object], bytes],
+        decode: Callable[[bytes, object], dict],
+        pool_size: int = ASSIGNMENT_POOL_SIZE,
+        batch_size: int = ASSIGNMENT_BATCH,
+        flush_ms: float = ASSIGNMENT_FLUSH_MS,
+        queue_size: int = ASSIGNMENT_QUEUE_SIZE,
+    ):
+        self.encode = encode
+        self.decode = decode
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS assignments ("
+                " user_id TEXT PRIMARY KEY, inputs TEXT NOT NULL, catalog_version TEXT NOT NULL,"
+                " result BLOB NOT NULL, updated REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS assignments_version ON assignments (catalog_version)")
+        self._queue: "queue.Queue[Optional[Row]]" = queue.Queue(maxsize=queue_size)
+        self._writer: Optional[threading.Thread] = None
+
+    # -- writes --
+
+    def start(self) -> None:
+        """Start the batched writer thread."""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="assignment-writer", daemon=True)
+            self._writer.start()
+
+    def record(self, user_id: str, inputs: dict, response: dict, catalog, stale_version: Optional[str] = None) -> bool:
+        """
+        Queue a user's latest assignment for writing. Returns False (and
+        drops the write) if the queue is full.
+
+        With `stale_version` (re-scores), the write only applies if the
+        stored row still has that catalog version and the same inputs.
+        """
+        row = (
+            user_id,
+            json.dumps(inputs, sort_keys=True, separators=(",", ":")),
+            catalog.version,
+            self.encode(response, catalog),
+            time.time(),
+            stale_version,
+        )
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            ASSIGNMENT_WRITES.inc(result="dropped")
+            return False
+
+    def _write_loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                self._queue.task_done()
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if row is None:
+                    stop = True
+                    break
+                batch.append(row)
+            self._write_batch(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[Row]) -> None:
+        latest = {row[0]: row[:5] for row in batch if row[5] is None}  # last write per user wins
+        # Conditional re-scores run after the request writes: they no-op on any row written since
+        rescores = [
+            (version, result, updated, user_id, stale_version, inputs)
+            for user_id, inputs, version, result, updated, stale_version in batch
+            if stale_version is not None
+        ]
+        with self.pool.connection() as conn:
+            try:
+                conn.execute("BEGIN")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO assignments (user_id, inputs, catalog_version, result, updated)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    list(latest.values()),
+                )
+                conn.executemany(
+                    "UPDATE assignments SET catalog_version = ?, result = ?, updated = ?"
+                    " WHERE user_id = ? AND catalog_version = ? AND inputs = ?",
+                    rescores,
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                ASSIGNMENT_WRITES.inc(len(batch), result="failed")
+                return
+        ASSIGNMENT_WRITES.inc(len(batch), result="written")
+
+    def flush(self) -> None:
+        """Block until every queued write is committed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending writes, stop the writer and close connections."""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        self.pool.close()
+
+    # -- reads --
+
+    def load(self, user_id: str) -> Optional[Tuple[dict, str, bytes]]:
+        """(inputs, catalog_version, compact result) for a user, or None."""
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT inputs, catalog_version, result FROM assignments WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1], row[2]
+
+    def get(self, user_id: str, catalog, rescore: Callable[[dict], dict]) -> Optional[dict]:
+        """
+        A user's stored assignment for `catalog`, re-scoring it from the
+        stored inputs when it was computed on another catalog version.
+
+        Returns {"user_id", "inputs", "catalog_version", "rescored", "assignment"},
+        or None for unknown users.
+
+        Raises:
+            ValueError: If a stale row's inputs are no longer valid.
+        """
+        stored = self.load(user_id)
+        if stored is None:
+            return None
+        inputs, version, blob = stored
+        rescored = version != catalog.version
+        if rescored:
+            response = rescore(inputs)
+            self.record(user_id, inputs, response, catalog, stale_version=version)
+            ASSIGNMENT_RESCORES.inc(trigger="read")
+            blob = self.encode(response, catalog)
+        return {
+            "user_id": user_id,
+            "inputs": inputs,
+            "catalog_version": catalog.version,
+            "rescored": rescored,
+            "assignment": self.decode(blob, catalog),
+        }
+
+    def stale_users(self, catalog_version: str, limit: int = 1000) -> List[Tuple[str, dict, str]]:
+        """(user_id, inputs, stored catalog version) of rows from other catalog versions."""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT user_id, inputs, catalog_version FROM assignments WHERE catalog_version != ? LIMIT ?",
+                (catalog_version, limit),
+            ).fetchall()
+        return [(user_id, json.loads(inputs), version) for user_id, inputs, version in rows]
+
+    def stale_count(self, catalog_version: str) -> int:
+        with self.pool.connection() as conn:
+            (count,) = conn.execute(
+                "SELECT COUNT(*) FROM assignments WHERE catalog_version != ?", (catalog_version,)
+            ).fetchone()
+        return count
+
+    def rescore_stale(self, catalog, rescore: Callable[[dict], dict], chunk: int = 1000) -> int:
+        """
+        Re-score every row from an older catalog version (bulk job).
+        Rows whose inputs no longer validate are left as they are. Stops
+        early when a pass leaves as many stale rows as before (writes
+        failing).
+        Returns the number of rows re-scored.
+        """
+        done = 0
+        skipped = set()
+        remaining = self.stale_count(catalog.version)
+        while True:
+            pending = [
+                row for row in self.stale_users(catalog.version, chunk + len(skipped)) if row[0] not in skipped
+            ]
+            if not pending:
+                break
+            for user_id, inputs, version in pending:
+                try:
+                    response = rescore(inputs)
+                except ValueError:
+                    skipped.add(user_id)
+                    continue
+                while not self.record(user_id, inputs, response, catalog, stale_version=version):
+                    self.flush()  # queue full: let the writer catch up
+                done += 1
+                ASSIGNMENT_RESCORES.inc(trigger="bulk")
+            self.flush()
+            previous, remaining = remaining, self.stale_count(catalog.version)
+            if remaining >= previous:
+                break
+        return done
+
+
+def open_assignment_store(path: str = ASSIGNMENT_DB) -> Optional[AssignmentStore]:
+    """The configured store (call start() before recording), or None when persistence is disabled."""
+    if not path:
+        return None
+    from backend.binary_format import decode_ring_response, encode_ring_response
+    return AssignmentStore(path, encode_ring_response, decode_ring_response)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Assignment store maintenance")
+    parser.add_argument("--db", default=ASSIGNMENT_DB, help="SQLite file (default: $FOOD_API_ASSIGNMENT_DB)")
+    parser.add_argument("--rescore", action="store_true", help="Re-score rows from older catalog versions")
+    args = parser.parse_args(argv)
+    if not args.db:
+        parser.error("--db or FOOD_API_ASSIGNMENT_DB is required")
+
+    from backend.api import rescore_inputs
+    from backend.catalog import get_catalog
+
+    store = open_assignment_store(args.db)
+    store.start()
+    catalog = get_catalog()
+    if args.rescore:
+        count = store.rescore_stale(catalog, rescore_inputs)
+        print(f"Re-scored {count} assignments for catalog {catalog.version}")
+    with store.pool.connection() as conn:
+        total, stale = conn.execute(
+            "SELECT COUNT(*), SUM(catalog_version != ?) FROM assignments", (catalog.version,)
+        ).fetchone()
+    print(f"{total} assignments stored, {stale or 0} stale")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
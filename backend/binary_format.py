@@ -0,0 +1,198 @@
+"""
+Compact binary encoding of /assign_to_rings responses.
+Episode: perf_2026
+
+Clients that send `Accept: application/x-food-rings` get the ring
+response in a fixed struct layout instead of JSON. Foods are sent as
+catalog indices (resolve them with GET /foods, which lists food IDs in
+catalog order). Contribution names are one-byte codes. Display metadata
+(display_name, image_url, ...) is omitted; it is cacheable catalog data
+(see http_cache.py, browse.py).
+
+Layout (little-endian):
+
+    magic             4s   b"FRB2"
+    catalog_version   16s  ASCII catalog hash (the indices refer to it)
+    result_hash       20s  ASCII, same value as the JSON "result_hash"
+    threshold_0/1     2d
+    threshold_error   2d   quantile, confidence; 0, 0 for exact thresholds
+    personality       str primary, str secondary, d conf_primary,
+                      d conf_secondary, text explanation
+    3 × ring:
+      count           I
+      count × food:   I catalog index, d distance, B n_contributions,
+                      n × (B contribution code, d value)
+
+    str  = H length + UTF-8 bytes;  text = I length + UTF-8 bytes
+
+Contribution codes are positions in CONTRIBUTION_KEYS. New keys must be
+appended (and the magic bumped if existing codes ever change).
+
+b"FRB1" bodies (no threshold_error field, always exact) still decode:
+assignment_store rows written before FRB2 stay readable.
+"""
+
+import struct
+from typing import List, Tuple
+
+from .food_data import DIMENSION_NAMES
+
+BINARY_MEDIA_TYPE = "application/x-food-rings"
+MAGIC = b"FRB2"
+LEGACY_MAGICS = (b"FRB1",)
+
+CONTRIBUTION_KEYS: Tuple[str, ...] = tuple(DIMENSION_NAMES) + (
+    "psychological_distance_damping",
+    "spice_intensity_damping",
+    "preparation_familiarity_damping",
+    "dislike_penalty",
+    "texture_avoider_penalty",
+    "heat_seeker_reduction",
+    "refined_minimalist_penalty",
+)
+_KEY_CODES = {key: code for code, key in enumerate(CONTRIBUTION_KEYS)}
+
+_HEADER = struct.Struct("<4s16s20s2d")
+_CONFIDENCES = struct.Struct("<2d")
+_THRESHOLD_ERROR = struct.Struct("<2d")
+_FOOD = struct.Struct("<IdB")
+_CONTRIBUTION = struct.Struct("<Bd")
+_COUNT = struct.Struct("<I")
+_STR_LEN = struct.Struct("<H")
+_TEXT_LEN = struct.Struct("<I")
+
+
+def wants_binary(accept: str) -> bool:
+    """True if the Accept header lists the binary media type with q > 0."""
+    for part in (accept or "").split(","):
+        media_type, _, params = part.strip().partition(";")
+        if media_type.strip().lower() == BINARY_MEDIA_TYPE:
+            params = params.strip()
+            if not params.startswith("q="):
+                return True
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def _pack_str(parts: List[bytes], value: str, length: struct.Struct) -> None:
+    data = value.encode("utf-8")
+    parts.append(length.pack(len(data)))
+    parts.append(data)
+
+
+def encode_ring_response(response: dict, catalog) -> bytes:
+    """
+    Binary form of a formatted /assign_to_rings response.
+
+    Raises:
+        ValueError: If a food is not in `catalog` or a contribution key has no code.
+    """
+    threshold_0, threshold_1 = response["ring_thresholds"]
+    parts = [_HEADER.pack(
+        MAGIC,
+        catalog.version.encode("ascii"),
+        response["result_hash"].encode("ascii"),
+        threshold_0,
+        threshold_1,
+    )]
+    threshold_error = response.get("threshold_error")
+    if threshold_error is None:
+        parts.append(_THRESHOLD_ERROR.pack(0.0, 0.0))
+    else:
+        parts.append(_THRESHOLD_ERROR.pack(threshold_error["quantile"], threshold_error["confidence"]))
+
+    personality = response["personality"]
+    _pack_str(parts, personality["primary_personality"], _STR_LEN)
+    _pack_str(parts, personality["secondary_personality"], _STR_LEN)
+    parts.append(_CONFIDENCES.pack(personality["confidence_primary"], personality["confidence_secondary"]))
+    _pack_str(parts, personality["explanation"], _TEXT_LEN)
+
+    for ring_key in ("ring_0", "ring_1", "ring_2"):
+        ring = response[ring_key]
+        parts.append(_COUNT.pack(len(ring)))
+        for entry in ring:
+            try:
+                index = catalog.index[entry["food_name"]]
+            except KeyError:
+                raise ValueError(f"Food '{entry['food_name']}' is not in catalog {catalog.version}")
+            contributions = entry["dimension_contributions"]
+            parts.append(_FOOD.pack(index, entry["distance"], len(contributions)))
+            for key, value in contributions.items():
+                if key not in _KEY_CODES:
+                    raise ValueError(f"No binary code for contribution '{key}'")
+                parts.append(_CONTRIBUTION.pack(_KEY_CODES[key], value))
+    return b"".join(parts)
+
+
+def decode_ring_response(data: bytes, catalog) -> dict:
+    """
+    Inverse of encode_ring_response(): the JSON response shape without
+    display metadata (food_name, ring, distance, dimension_contributions).
+
+    Raises:
+        ValueError: On malformed data or a catalog version mismatch.
+    """
+    try:
+        magic, version, digest, threshold_0, threshold_1 = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC and magic not in LEGACY_MAGICS:
+            raise ValueError("Not a food-rings binary response")
+        if version.decode("ascii") != catalog.version:
+            raise ValueError(f"Response was encoded for catalog {version.decode('ascii')}, not {catalog.version}")
+        offset = _HEADER.size
+        error_quantile = error_confidence = 0.0
+        if magic == MAGIC:
+            error_quantile, error_confidence = _THRESHOLD_ERROR.unpack_from(data, offset)
+            offset += _THRESHOLD_ERROR.size
+
+        def read_str(length: struct.Struct) -> str:
+            nonlocal offset
+            (size,) = length.unpack_from(data, offset)
+            offset += length.size
+            value = bytes(data[offset:offset + size]).decode("utf-8")
+            offset += size
+            return value
+
+        primary = read_str(_STR_LEN)
+        secondary = read_str(_STR_LEN)
+        confidence_primary, confidence_secondary = _CONFIDENCES.unpack_from(data, offset)
+        offset += _CONFIDENCES.size
+        explanation = read_str(_TEXT_LEN)
+
+        response = {}
+        for ring_num in range(3):
+            (count,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            ring = []
+            for _ in range(count):
+                index, distance, n_contributions = _FOOD.unpack_from(data, offset)
+                offset += _FOOD.size
+                contributions = {}
+                for _ in range(n_contributions):
+                    code, value = _CONTRIBUTION.unpack_from(data, offset)
+                    offset += _CONTRIBUTION.size
+                    contributions[CONTRIBUTION_KEYS[code]] = value
+                ring.append({
+                    "food_name": catalog.food_ids[index],
+                    "distance": distance,
+                    "ring": ring_num,
+                    "dimension_contributions": contributions,
+                })
+            response[f"ring_{ring_num}"] = ring
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed binary response: {e}")
+
+    response["personality"] = {
+        "primary_personality": primary,
+        "secondary_personality": secondary,
+        "confidence_primary": confidence_primary,
+        "confidence_secondary": confidence_secondary,
+        "explanation": explanation,
+    }
+    response["ring_thresholds"] = [threshold_0, threshold_1]
+    if error_quantile:
+        response["threshold_error"] = {"quantile": error_quantile, "confidence": error_confidence}
+    response["result_hash"] = digest.decode("ascii")
+    return response
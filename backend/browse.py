@@ -0,0 +1,131 @@
+"""
+Catalog browsing: cursor pagination and field projection for /foods.
+Episode: perf_2026
+
+Pages follow the stable catalog order (catalog indices). A cursor is an
+opaque token naming the catalog version and the last food returned. On the
+same catalog version the next page starts right after that index. After a
+catalog refresh it resumes after the same food_id, if it still exists.
+With a filter, the page is decoded lazily from the filter bitmap's bytes
+(filters.iter_bitmap_indices): Python work is O(page) plus the skipped
+empty bytes, on top of one C-level copy of the bitmap.
+
+Projection reads only the requested metadata columns from the catalog's
+column store instead of building full metadata dicts per food.
+"""
+
+import base64
+import json
+from itertools import islice
+from typing import List, Optional, Sequence, Tuple
+
+from .catalog import METADATA_COLUMNS, get_catalog
+from .filters import iter_bitmap_indices
+from .food_data import DIMENSION_NAMES
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+PROJECTABLE_FIELDS = METADATA_COLUMNS + ("taste_profile",)
+
+
+def encode_cursor(catalog_version: str, index: int, food_id: str) -> str:
+    payload = json.dumps([catalog_version, index, food_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, catalog) -> int:
+    """
+    Catalog index of the last food returned by the previous page.
+
+    Raises:
+        ValueError: If the cursor is malformed or its food no longer exists.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        version, index, food_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if version == catalog.version:
+        if not isinstance(index, int) or not 0 <= index < len(catalog):
+            raise ValueError("Invalid cursor")
+        return index
+    if not isinstance(food_id, str) or food_id not in catalog.index:
+        raise ValueError("Cursor is no longer valid (catalog changed); restart from the first page")
+    return catalog.index[food_id]
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Comma-separated projection list → field names (None: IDs only)."""
+    if fields is None:
+        return None
+    names = tuple(name.strip() for name in fields.split(",") if name.strip())
+    unknown = [name for name in names if name not in PROJECTABLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {unknown}. Valid: {list(PROJECTABLE_FIELDS)}")
+    return names
+
+
+def page_indices(after: int, limit: int, subset: Optional[int], catalog) -> Tuple[List[int], bool]:
+    """
+    Up to `limit` catalog indices after index `after` (-1: from the start),
+    restricted to the `subset` bitmap if given. Returns (indices, has_more).
+    """
+    if subset is None:
+        start = after + 1
+        indices = list(range(start, min(start + limit, len(catalog))))
+        return indices, start + limit < len(catalog)
+
+    # One index past the page tells whether there is a next page
+    indices = list(islice(iter_bitmap_indices(subset, after + 1), limit + 1))
+    return indices[:limit], len(indices) > limit
+
+
+def project(indices: Sequence[int], fields: Optional[Tuple[str, ...]], catalog) -> list:
+    """Food IDs, or dicts with food_id plus the requested fields."""
+    if fields is None:
+        return [catalog.food_ids[i] for i in indices]
+    columns = [(name, catalog.columns[name]) for name in fields if name != "taste_profile"]
+    with_taste = "taste_profile" in fields
+    items = []
+    for i in indices:
+        item = {"food_id": catalog.food_ids[i]}
+        for name, column in columns:
+            item[name] = column[i]
+        if with_taste:
+            item["taste_profile"] = dict(zip(DIMENSION_NAMES, catalog.vectors[i]))
+        items.append(item)
+    return items
+
+
+def browse_foods(
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    subset: Optional[int] = None,
+    catalog=None,
+) -> dict:
+    """
+    One page of the catalog:
+        {"foods": [...], "count": n, "total": matching foods, "next_cursor": token or None}
+
+    Raises:
+        ValueError: On an invalid limit, cursor or field list.
+    """
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    if catalog is None:
+        catalog = get_catalog()
+    projection = parse_fields(fields)
+    after = -1 if cursor is None else decode_cursor(cursor, catalog)
+
+    indices, has_more = page_indices(after, limit, subset, catalog)
+    next_cursor = None
+    if has_more and indices:
+        last = indices[-1]
+        next_cursor = encode_cursor(catalog.version, last, catalog.food_ids[last])
+    return {
+        "foods": project(indices, projection, catalog),
+        "count": len(indices),
+        "total": len(catalog) if subset is None else subset.bit_count(),
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Client-side evaluation bundle.
+Episode: perf_2026
+
+Everything a client needs to compute comfort rings locally, without a
+round trip per slider change, exported as one versioned JSON document:
+the catalog's food ids and taste vectors, the distance constants of
+distance.py, the threshold rules of ring_assignment.py and the
+personality rules of explanations.py (predicates precomputed per grid
+cell, bonuses as data).
+
+A conformance set accompanies it: inputs with the exact
+assign_to_rings() results (food indices, distances, thresholds,
+personality) a port must reproduce bit for bit. evaluate_bundle() is the
+reference evaluator: it uses nothing but the bundle, and is the algorithm
+to port.
+
+Thresholds are always exact here. The API refuses both documents (409)
+while FOOD_API_THRESHOLD_ERROR makes its own thresholds approximate for
+the catalog (approx_thresholds.sampled_selection).
+
+Served as GET /bundle and GET /bundle/conformance (pre-rendered, with
+ETags). Export:
+    python backend/bundle.py [--out bundle.json] [--conformance conformance.json] [--check]
+
+format_version changes whenever the document layout or the evaluation
+algorithm does; bundle_version is a content hash and changes with any
+catalog or rule change.
+"""
+
+import sys
+import os
+
+# Add parent directory to path (when run as a script)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import random
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.archetypes import Archetype
+from backend.catalog import GRID_CELLS, code_vector, get_catalog, register_table
+from backend import distance as distance_rules
+from backend import ring_assignment as threshold_rules
+from backend.explanations import ARCHETYPE_BONUSES, PERSONALITY_PREDICATES, RING_BONUSES
+from backend.food_registry import DIMENSION_NAMES, VALID_VALUES
+from backend.http_cache import render_json
+from backend.ring_assignment import assign_to_rings
+from backend.taste_vector import UserTasteVector
+
+BUNDLE_FORMAT = "food-rings-bundle"
+BUNDLE_FORMAT_VERSION = 1
+
+# Conformance set: every grid vector bare, plus random profiles per archetype combination
+CONFORMANCE_PROFILES_PER_COMBINATION = 4
+CONFORMANCE_MAX_DISLIKES = 2
+
+# (taste vector, dislikes, archetype values)
+ConformanceInput = Tuple[Tuple[float, ...], List[str], List[str]]
+
+
+def build_bundle(catalog) -> dict:
+    """The evaluation bundle for `catalog`."""
+    names = list(PERSONALITY_PREDICATES)
+    grid_matches = []
+    for code in range(GRID_CELLS):
+        vec = code_vector(code)
+        grid_matches.append(sum(1 << i for i, name in enumerate(names) if PERSONALITY_PREDICATES[name](vec)))
+
+    bundle = {
+        "format": BUNDLE_FORMAT,
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "catalog_version": catalog.version,
+        "dimensions": list(DIMENSION_NAMES),
+        "valid_values": list(VALID_VALUES),
+        "foods": {
+            "ids": list(catalog.food_ids),
+            "vectors": [list(vec) for vec in catalog.vectors],
+        },
+        "distance": {
+            # [dimension, damping] in the order they are applied
+            "asymmetric_damping": [[dim, damping] for dim, damping in distance_rules.ASYMMETRIC_DAMPING.items()],
+            "dislike_penalty": distance_rules.DISLIKE_PENALTY,
+            "texture_dimension": distance_rules.TEXTURE_IDX,
+            "texture_avoider_factor": distance_rules.TEXTURE_AVOIDER_FACTOR,
+            "spice_dimension": distance_rules.SPICE_IDX,
+            "heat_seeker_reduction": distance_rules.HEAT_SEEKER_REDUCTION,
+            "richness_dimension": distance_rules.RICHNESS_IDX,
+            "refined_minimalist_richness": distance_rules.REFINED_MINIMALIST_RICHNESS,
+            "refined_minimalist_penalty": distance_rules.REFINED_MINIMALIST_PENALTY,
+        },
+        "thresholds": {
+            "percentiles": [threshold_rules.RING_0_PERCENTILE, threshold_rules.RING_1_PERCENTILE],
+            "comfort_maximalist_factor": threshold_rules.COMFORT_MAXIMALIST_THRESHOLD_FACTOR,
+            "flavor_explorer_factor": threshold_rules.FLAVOR_EXPLORER_THRESHOLD_FACTOR,
+            "min_gap": threshold_rules.THRESHOLD_MIN_GAP,
+        },
+        "personality": {
+            "names": names,
+            # Per grid cell (code = sum(level[d] * 3**d)): bit i set if names[i]'s predicate holds
+            "grid_matches": grid_matches,
+            # [personality, archetype, applies when present?, bonus]
+            "archetype_bonuses": [[name, arch.value, present, bonus] for name, arch, present, bonus in ARCHETYPE_BONUSES],
+            # [personality, ring, other ring, bonus]: applies when ring holds more foods
+            "ring_bonuses": [list(rule) for rule in RING_BONUSES],
+        },
+    }
+    bundle["bundle_version"] = _content_hash(bundle)
+    return bundle
+
+
+def _content_hash(document: dict) -> str:
+    encoded = json.dumps(document, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def evaluate_bundle(bundle: dict, vector: Iterable[float], dislikes: Iterable[str], archetypes: Iterable[str]) -> dict:
+    """
+    Reference client evaluation: rings, thresholds and personality for one
+    profile, from the bundle alone. Same result format as the conformance set:
+
+        {"rings": [[[food index, distance], ...] × 3], "ring_thresholds": [t0, t1],
+         "personality": {primary_personality, secondary_personality,
+                         confidence_primary, confidence_secondary}}
+
+    Floating point operations are done in the same order as the server's,
+    so a port using IEEE doubles gets bit-identical distances. Food ids
+    compare by Unicode code point.
+    """
+    user = tuple(vector)
+    disliked = set(dislikes)
+    archetypes = set(archetypes)
+    rules = bundle["distance"]
+    texture, spice, richness = rules["texture_dimension"], rules["spice_dimension"], rules["richness_dimension"]
+    food_ids = bundle["foods"]["ids"]
+
+    # 1. Distances
+    distances = []
+    for food_id, food in zip(food_ids, bundle["foods"]["vectors"]):
+        base = [(u - f) ** 2 for u, f in zip(user, food)]
+        adjusted = list(base)
+        for dim, damping in rules["asymmetric_damping"]:
+            if food[dim] < user[dim]:
+                adjusted[dim] = base[dim] * damping
+        if food_id in disliked:
+            adjusted = [value + rules["dislike_penalty"] for value in adjusted]
+        if "texture_avoider" in archetypes:
+            adjusted[texture] += base[texture] * rules["texture_avoider_factor"]
+        if "heat_seeker" in archetypes:
+            adjusted[spice] = max(0, adjusted[spice] - base[spice] * rules["heat_seeker_reduction"])
+        if "refined_minimalist" in archetypes and food[richness] >= rules["refined_minimalist_richness"]:
+            adjusted[richness] += rules["refined_minimalist_penalty"]
+        distances.append(math.sqrt(sum(adjusted)))
+
+    # 2. Thresholds: percentiles of the sorted distances, then archetype factors
+    thresholds = bundle["thresholds"]
+    ordered = sorted(distances)
+    n = len(ordered)
+    idx_0, idx_1 = (int(n * p) for p in thresholds["percentiles"])
+    threshold_0 = ordered[idx_0] if idx_0 < n else ordered[-1]
+    threshold_1 = ordered[idx_1] if idx_1 < n else ordered[-1]
+    if "comfort_maximalist" in archetypes:
+        threshold_0 *= thresholds["comfort_maximalist_factor"]
+    if "flavor_explorer" in archetypes:
+        threshold_1 *= thresholds["flavor_explorer_factor"]
+    if threshold_0 >= threshold_1:
+        threshold_1 = threshold_0 + thresholds["min_gap"]
+
+    # 3. Rings: d <= t0 → 0, d <= t1 → 1, else 2; each sorted by (distance, food id)
+    rings: List[List[int]] = [[], [], []]
+    for i, d in enumerate(distances):
+        rings[0 if d <= threshold_0 else 1 if d <= threshold_1 else 2].append(i)
+    for ring in rings:
+        ring.sort(key=lambda i: (distances[i], food_ids[i]))
+
+    # 4. Personality: predicate (1.0 or 0.0), + archetype bonuses, + ring bonuses;
+    #    top two by (-score, name), confidences normalized by the score total
+    personality = bundle["personality"]
+    levels = bundle["valid_values"]
+    code = sum(levels.index(value) * len(levels) ** d for d, value in enumerate(user))
+    matches = personality["grid_matches"][code]
+    sizes = [len(ring) for ring in rings]
+    scores = []
+    for i, name in enumerate(personality["names"]):
+        score = 1.0 if matches >> i & 1 else 0.0
+        for rule_name, archetype, present, bonus in personality["archetype_bonuses"]:
+            if rule_name == name and (archetype in archetypes) == present:
+                score += bonus
+        for rule_name, ring, other, bonus in personality["ring_bonuses"]:
+            if rule_name == name and sizes[ring] > sizes[other]:
+                score += bonus
+        scores.append((name, score))
+    scores.sort(key=lambda item: (-item[1], item[0]))
+    total = sum(score for _, score in scores)
+    (primary, primary_score), (secondary, secondary_score) = scores[0], scores[1]
+
+    return {
+        "rings": [[[i, distances[i]] for i in ring] for ring in rings],
+        "ring_thresholds": [threshold_0, threshold_1],
+        "personality": {
+            "primary_personality": primary,
+            "secondary_personality": secondary,
+            "confidence_primary": min(primary_score / total if total > 0 else 0.0, 1.0),
+            "confidence_secondary": min(secondary_score / total if total > 0 else 0.0, 1.0),
+        },
+    }
+
+
+def conformance_inputs(catalog) -> List[ConformanceInput]:
+    """
+    Every grid vector with no dislikes or archetypes, then every archetype
+    combination on a few seeded random profiles with dislikes.
+    """
+    inputs: List[ConformanceInput] = [
+        (vec, [], []) for vec in itertools.product(VALID_VALUES, repeat=len(DIMENSION_NAMES))
+    ]
+    rng = random.Random(BUNDLE_FORMAT_VERSION)
+    food_ids = sorted(catalog.food_ids)
+    values = sorted(arch.value for arch in Archetype)
+    for size in range(len(values) + 1):
+        for combo in itertools.combinations(values, size):
+            for _ in range(CONFORMANCE_PROFILES_PER_COMBINATION):
+                vec = tuple(rng.choice(VALID_VALUES) for _ in DIMENSION_NAMES)
+                dislikes = sorted(rng.sample(food_ids, rng.randint(0, min(CONFORMANCE_MAX_DISLIKES, len(food_ids)))))
+                inputs.append((vec, dislikes, list(combo)))
+    return inputs
+
+
+def build_conformance(catalog, bundle: Optional[dict] = None) -> dict:
+    """Conformance set for `catalog`'s bundle: inputs with their assign_to_rings() results."""
+    if bundle is None:
+        bundle = build_bundle(catalog)
+    cases = []
+    for vec, dislikes, archetypes in conformance_inputs(catalog):
+        assignment = assign_to_rings(
+            UserTasteVector(*vec), set(dislikes), {Archetype(value) for value in archetypes},
+            contributions=False, catalog=catalog,
+        )
+        personality = assignment.personality
+        cases.append({
+            "input": {"vector": list(vec), "dislikes": dislikes, "archetypes": archetypes},
+            "expected": {
+                "rings": [
+                    [[catalog.index[fd.food_name], fd.distance] for fd in ring]
+                    for ring in (assignment.ring_0, assignment.ring_1, assignment.ring_2)
+                ],
+                "ring_thresholds": list(assignment.ring_thresholds),
+                "personality": {
+                    "primary_personality": personality.primary_personality,
+                    "secondary_personality": personality.secondary_personality,
+                    "confidence_primary": personality.confidence_primary,
+                    "confidence_secondary": personality.confidence_secondary,
+                },
+            },
+        })
+    return {
+        "format": BUNDLE_FORMAT + "-conformance",
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "bundle_version": bundle["bundle_version"],
+        "cases": cases,
+    }
+
+
+def check_conformance(bundle: dict, conformance: dict) -> List[int]:
+    """Indices of the conformance cases evaluate_bundle() gets wrong (empty when conformant)."""
+    if conformance["bundle_version"] != bundle["bundle_version"]:
+        raise ValueError(
+            f"Conformance set is for bundle {conformance['bundle_version']}, not {bundle['bundle_version']}"
+        )
+    failures = []
+    for i, case in enumerate(conformance["cases"]):
+        inputs = case["input"]
+        if evaluate_bundle(bundle, inputs["vector"], inputs["dislikes"], inputs["archetypes"]) != case["expected"]:
+            failures.append(i)
+    return failures
+
+
+def _bundle_bodies(catalog) -> Dict[str, object]:
+    """Pre-rendered /bundle and /bundle/conformance bodies."""
+    bundle = build_bundle(catalog)
+    return {
+        "/bundle": render_json(bundle),
+        "/bundle/conformance": render_json(build_conformance(catalog, bundle)),
+    }
+
+
+register_table("bundle_bodies", _bundle_bodies)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the client evaluation bundle")
+    parser.add_argument("--out", default="bundle.json", help="bundle path")
+    parser.add_argument("--conformance", default=None, help="also write the conformance set to this path")
+    parser.add_argument("--check", action="store_true", help="verify the reference evaluator against the conformance set")
+    args = parser.parse_args(argv)
+
+    catalog = get_catalog()
+    bundle = build_bundle(catalog)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(bundle, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"✅ Bundle {bundle['bundle_version']} written to {args.out} ({len(catalog)} foods)")
+
+    if args.conformance or args.check:
+        conformance = build_conformance(catalog, bundle)
+        if args.conformance:
+            with open(args.conformance, "w", encoding="utf-8") as f:
+                json.dump(conformance, f, ensure_ascii=False, separators=(",", ":"))
+            print(f"✅ {len(conformance['cases'])} conformance cases written to {args.conformance}")
+        if args.check:
+            failures = check_conformance(bundle, conformance)
+            if failures:
+                print(f"❌ {len(failures)} conformance cases differ (first: {failures[0]})")
+                sys.exit(1)
+            print(f"✅ Reference evaluator matches all {len(conformance['cases'])} cases")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Compiled food catalog: stable ordering, content hash and derived indexes.
+Episode: perf_2026
+
+The Catalog is built once from FOOD_REGISTRY (or loaded from a startup
+snapshot, see snapshot.py) and shared by everything that needs catalog
+indices rather than food names:
+- food_ids / index: stable catalog order and name → index map
+- vectors / codes: 5D taste vectors and their cell on the 3^5 taste grid
+- columns: display metadata stored column-wise
+- version: content hash of the catalog, used to key caches
+
+Heavier derived structures are registered with `register_table()` and
+built lazily on first `catalog.table(name)` call (or ahead of time by the
+snapshot builder). Tables registered with an updater are carried over
+incrementally by `refresh_catalog()` instead of being rebuilt.
+
+Scoring reads the active catalog, not FOOD_REGISTRY. Add, replace or
+remove foods at runtime with `register_food()` / `unregister_food()`,
+which keep FOOD_REGISTRY, FOODS and the catalog in step. Other direct
+edits of FOOD_REGISTRY must be followed by `refresh_catalog()`;
+get_catalog() only notices on its own when the number of foods changed.
+"""
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .food_registry import FOOD_REGISTRY, FOODS, FoodProfile, DIMENSION_NAMES, VALID_VALUES
+
+# Metadata columns kept in the compact column store
+METADATA_COLUMNS = ("display_name", "description", "origin", "region", "image_url")
+
+# Grid level (0, 1, 2) of each valid dimension value
+LEVELS: Dict[float, int] = {value: level for level, value in enumerate(VALID_VALUES)}
+GRID_CELLS = len(VALID_VALUES) ** len(DIMENSION_NAMES)
+
+
+def vector_code(vec: Tuple[float, ...]) -> int:
+    """Cell of a taste vector on the 3^5 grid (dimension 0 is least significant)."""
+    code = 0
+    for value in reversed(vec):
+        code = code * len(VALID_VALUES) + LEVELS[value]
+    return code
+
+
+def code_vector(code: int) -> Tuple[float, ...]:
+    """Inverse of vector_code()."""
+    vec = []
+    for _ in DIMENSION_NAMES:
+        code, level = divmod(code, len(VALID_VALUES))
+        vec.append(VALID_VALUES[level])
+    return tuple(vec)
+
+
+def catalog_hash(registry: Dict[str, FoodProfile]) -> str:
+    """Content hash of a registry (order-sensitive, since order defines indices)."""
+    digest = hashlib.sha256()
+    for food_id, profile in registry.items():
+        record = [food_id] + [getattr(profile, name) for name in ("food_id",) + METADATA_COLUMNS]
+        record += list(profile.to_taste_tuple())
+        digest.update(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()[:16]
+
+
+# name -> builder(catalog) for lazily computed tables
+TABLE_BUILDERS: Dict[str, Callable[["Catalog"], object]] = {}
+# name -> updater(table, old_catalog, new_catalog) for incremental refresh
+TABLE_UPDATERS: Dict[str, Callable[[object, "Catalog", "Catalog"], object]] = {}
+
+
+def register_table(
+    name: str,
+    builder: Callable[["Catalog"], object],
+    updater: Optional[Callable[[object, "Catalog", "Catalog"], object]] = None
+) -> None:
+    """
+    Register a derived table built from the catalog.
+
+    Builders must return picklable data so the snapshot can ship them.
+    An updater, if given, turns the table built for one catalog into the
+    table for its successor; refresh_catalog() uses it instead of a rebuild.
+    """
+    TABLE_BUILDERS[name] = builder
+    if updater is not None:
+        TABLE_UPDATERS[name] = updater
+
+
+def _food_levels(catalog: "Catalog") -> Tuple[Tuple[int, ...], ...]:
+    return tuple(tuple(LEVELS[v] for v in vec) for vec in catalog.vectors)
+
+
+register_table("food_levels", _food_levels)
+
+
+@dataclass
+class Catalog:
+    """Immutable, index-addressed view of the food registry."""
+    version: str
+    food_ids: Tuple[str, ...]
+    vectors: Tuple[Tuple[float, ...], ...]
+    codes: Tuple[int, ...]
+    columns: Dict[str, Tuple[str, ...]]
+    index: Dict[str, int]
+    cells: Dict[int, Tuple[int, ...]]  # grid cell code -> catalog indices
+    validated: bool = False
+    tables: Dict[str, object] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.food_ids)
+
+    def table(self, name: str):
+        """Derived table `name`, built on first use."""
+        value = self.tables.get(name)
+        if value is None:
+            if name not in TABLE_BUILDERS:
+                raise KeyError(f"Unknown catalog table '{name}'")
+            value = self.tables[name] = TABLE_BUILDERS[name](self)
+        return value
+
+    def build_tables(self) -> None:
+        """Build every registered table (used by the snapshot builder)."""
+        for name in TABLE_BUILDERS:
+            self.table(name)
+
+
+def build_catalog(registry: Optional[Dict[str, FoodProfile]] = None, validated: bool = False) -> Catalog:
+    """Compile a registry into a Catalog."""
+    if registry is None:
+        registry = FOOD_REGISTRY
+    food_ids = tuple(registry.keys())
+    vectors = tuple(profile.to_taste_tuple() for profile in registry.values())
+    codes = tuple(vector_code(vec) for vec in vectors)
+
+    cells: Dict[int, List[int]] = {}
+    for i, code in enumerate(codes):
+        cells.setdefault(code, []).append(i)
+
+    return Catalog(
+        version=catalog_hash(registry),
+        food_ids=food_ids,
+        vectors=vectors,
+        codes=codes,
+        columns={
+            name: tuple(getattr(profile, name) for profile in registry.values())
+            for name in METADATA_COLUMNS
+        },
+        index={food_id: i for i, food_id in enumerate(food_ids)},
+        cells={code: tuple(indices) for code, indices in cells.items()},
+        validated=validated,
+    )
+
+
+_catalog: Optional[Catalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> Catalog:
+    """
+    The active catalog, compiled from FOOD_REGISTRY on first use and
+    recompiled if foods were added to or removed from FOOD_REGISTRY directly.
+    """
+    global _catalog
+    catalog = _catalog
+    if catalog is not None and len(catalog) != len(FOOD_REGISTRY):
+        return refresh_catalog()
+    if catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = build_catalog()
+            catalog = _catalog
+    return catalog
+
+
+def install_catalog(catalog: Catalog) -> None:
+    """Make `catalog` the active catalog (e.g. one loaded from a snapshot)."""
+    global _catalog
+    with _catalog_lock:
+        _catalog = catalog
+
+
+def refresh_catalog() -> Catalog:
+    """
+    Recompile the active catalog after FOOD_REGISTRY has been modified.
+
+    Tables already built on the previous catalog are updated incrementally
+    when their updater is registered; the rest are rebuilt lazily.
+    """
+    previous = _catalog
+    catalog = build_catalog()
+    if previous is not None:
+        for name, updater in TABLE_UPDATERS.items():
+            if name in previous.tables:
+                catalog.tables[name] = updater(previous.tables[name], previous, catalog)
+    install_catalog(catalog)
+    return catalog
+
+
+def register_food(profile: FoodProfile) -> Catalog:
+    """Add (or replace) a food in FOOD_REGISTRY and FOODS, and refresh the active catalog."""
+    FOOD_REGISTRY[profile.food_id] = profile
+    FOODS[profile.food_id] = profile.to_taste_tuple()
+    return refresh_catalog()
+
+
+def unregister_food(food_id: str) -> Catalog:
+    """
+    Remove a food from FOOD_REGISTRY and FOODS, and refresh the active catalog.
+
+    Raises:
+        KeyError: If the food is not registered.
+    """
+    del FOOD_REGISTRY[food_id]
+    FOODS.pop(food_id, None)
+    return refresh_catalog()
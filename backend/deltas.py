@@ -0,0 +1,112 @@
+"""
+Differences between two ring assignment responses.
+Episode: perf_2026
+
+Works on the formatted /assign_to_rings response bodies (the shape cached
+by result_cache.py), so interactive clients can be sent only the foods
+whose ring, distance or dimension contributions changed instead of the
+full payload. apply_ring_patch() is the reference for rebuilding the new
+body from the old one.
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+
+RING_KEYS = ("ring_0", "ring_1", "ring_2")
+
+
+def result_hash(response: dict) -> str:
+    """
+    Stable content hash of a response body (ignoring any existing
+    "result_hash" key): equal results always hash equal.
+    """
+    body = {k: v for k, v in response.items() if k != "result_hash"}
+    encoded = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:20]
+
+
+def ring_entries(response: dict) -> Dict[str, dict]:
+    """food_name -> food entry across all three rings."""
+    return {
+        entry["food_name"]: entry
+        for ring_key in RING_KEYS
+        for entry in response[ring_key]
+    }
+
+
+def compact_entry(entry: dict) -> dict:
+    """Fields of a food entry that depend on the user's inputs."""
+    return {
+        "food_name": entry["food_name"],
+        "ring": entry["ring"],
+        "distance": entry["distance"],
+        "dimension_contributions": entry["dimension_contributions"],
+    }
+
+
+def diff_ring_responses(old: Optional[dict], new: dict) -> dict:
+    """
+    Changes needed to turn `old` into `new`.
+
+    Returns:
+        {
+          "changed": [compact entries whose ring, distance or
+                      dimension_contributions differ, with
+                      "previous_ring" (None for foods new to the catalog)],
+          "removed": [food names no longer present],
+          "ring_thresholds": new thresholds,
+          "personality": new personality,
+          "ring_sizes": [len(ring_0), len(ring_1), len(ring_2)],
+          "threshold_error": as in `new`, if present,
+        }
+    """
+    old_entries = ring_entries(old) if old is not None else {}
+    changed: List[dict] = []
+    seen = set()
+
+    for ring_key in RING_KEYS:
+        for entry in new[ring_key]:
+            name = entry["food_name"]
+            seen.add(name)
+            previous = old_entries.get(name)
+            item = compact_entry(entry)
+            if previous is None or compact_entry(previous) != item:
+                item["previous_ring"] = previous["ring"] if previous is not None else None
+                changed.append(item)
+
+    delta = {
+        "changed": changed,
+        "removed": sorted(name for name in old_entries if name not in seen),
+        "ring_thresholds": new["ring_thresholds"],
+        "personality": new["personality"],
+        "ring_sizes": [len(new[ring_key]) for ring_key in RING_KEYS],
+    }
+    if "threshold_error" in new:
+        delta["threshold_error"] = new["threshold_error"]
+    return delta
+
+
+def apply_ring_patch(old: dict, patch: dict) -> dict:
+    """
+    Rebuild the new response body from `old` and diff_ring_responses(old, new).
+    Entries keep `old`'s display metadata (foods new to the catalog get only
+    the compact fields); rings are ordered by (distance, food_name).
+    """
+    entries = ring_entries(old)
+    for name in patch["removed"]:
+        del entries[name]
+    for item in patch["changed"]:
+        entry = dict(entries.get(item["food_name"], {}))
+        entry.update((key, value) for key, value in item.items() if key != "previous_ring")
+        entries[item["food_name"]] = entry
+
+    body = {ring_key: [] for ring_key in RING_KEYS}
+    for entry in sorted(entries.values(), key=lambda e: (e["distance"], e["food_name"])):
+        body[RING_KEYS[entry["ring"]]].append(entry)
+    body["personality"] = patch["personality"]
+    body["ring_thresholds"] = patch["ring_thresholds"]
+    if "threshold_error" in patch:
+        body["threshold_error"] = patch["threshold_error"]
+    body["result_hash"] = result_hash(body)
+    return body
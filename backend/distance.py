@@ -8,9 +8,11 @@ P0 Fix #3: Asymmetric distance for tolerance dimensions.
 """
 
 import math
-from typing import Dict, Set, Tuple
+from array import array
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 from .archetypes import Archetype
-from .food_data import DIMENSION_NAMES
+from .food_data import DIMENSION_NAMES, VALID_VALUES
 
 # Asymmetric damping factors for tolerance dimensions
 # When food is LESS exotic/spicy/unfamiliar than user tolerance, reduce penalty dramatically
@@ -21,6 +23,27 @@ PSYCHOLOGICAL_DISTANCE_DAMPING = 0.05  # 95% reduction for overly familiar foods
 SPICE_INTENSITY_DAMPING = 0.05  # 95% reduction for overly mild foods
 PREPARATION_FAMILIARITY_DAMPING = 0.05  # 95% reduction for overly familiar preparations
 
+# Archetype / dislike adjustments
+DISLIKE_PENALTY = 1.5  # added to every dimension of a disliked food
+TEXTURE_AVOIDER_FACTOR = 0.5  # extra fraction of the texture mismatch
+HEAT_SEEKER_REDUCTION = 0.3  # fraction of the spice mismatch removed
+REFINED_MINIMALIST_RICHNESS = 0.8  # richness at or above this is penalized
+REFINED_MINIMALIST_PENALTY = 0.4
+
+# Dimension indices
+SPICE_IDX = 0
+TEXTURE_IDX = 1
+PREP_FAM_IDX = 2
+RICHNESS_IDX = 3
+PSYCH_DIST_IDX = 4
+
+# Tolerance dimensions with asymmetric damping, in the order it is applied
+ASYMMETRIC_DAMPING = {
+    PSYCH_DIST_IDX: PSYCHOLOGICAL_DISTANCE_DAMPING,
+    SPICE_IDX: SPICE_INTENSITY_DAMPING,
+    PREP_FAM_IDX: PREPARATION_FAMILIARITY_DAMPING,
+}
+
 
 def euclidean_distance(vec1: Tuple[float, ...], vec2: Tuple[float, ...]) -> float:
     """
@@ -72,13 +95,6 @@ def compute_distance_with_archetypes(
     
     Returns: (adjusted_distance, dimension_contributions)
     """
-    # Dimension indices
-    SPICE_IDX = 0
-    TEXTURE_IDX = 1
-    PREP_FAM_IDX = 2
-    RICHNESS_IDX = 3
-    PSYCH_DIST_IDX = 4
-    
     # Base dimension-wise differences (BEFORE asymmetric adjustments)
     base_diffs = [(a - b) ** 2 for a, b in zip(user_vec, food_vec)]
     dim_contributions = {name: diff for name, diff in zip(DIMENSION_NAMES, base_diffs)}
@@ -131,28 +147,143 @@ def compute_distance_with_archetypes(
     
     # Dislikes: add flat penalty to all dimensions
     if food_name in dislikes:
-        penalty = 1.5
+        penalty = DISLIKE_PENALTY
         adjusted_diffs = [d + penalty for d in adjusted_diffs]
         dim_contributions["dislike_penalty"] = penalty * len(adjusted_diffs)
     
     # Texture Avoider: amplify texture dimension mismatch
     if Archetype.TEXTURE_AVOIDER in archetypes:
-        texture_penalty = base_diffs[TEXTURE_IDX] * 0.5
+        texture_penalty = base_diffs[TEXTURE_IDX] * TEXTURE_AVOIDER_FACTOR
         adjusted_diffs[TEXTURE_IDX] += texture_penalty
         dim_contributions["texture_avoider_penalty"] = texture_penalty
     
     # Heat Seeker: reduce spice dimension mismatch (legacy - now less impactful due to asymmetry)
     if Archetype.HEAT_SEEKER in archetypes:
-        spice_reduction = base_diffs[SPICE_IDX] * 0.3
+        spice_reduction = base_diffs[SPICE_IDX] * HEAT_SEEKER_REDUCTION
         adjusted_diffs[SPICE_IDX] = max(0, adjusted_diffs[SPICE_IDX] - spice_reduction)
         dim_contributions["heat_seeker_reduction"] = -spice_reduction
     
     # Refined Minimalist: penalize high richness
     if Archetype.REFINED_MINIMALIST in archetypes:
-        if food_vec[RICHNESS_IDX] >= 0.8:  # high richness
-            richness_penalty = 0.4
+        if food_vec[RICHNESS_IDX] >= REFINED_MINIMALIST_RICHNESS:  # high richness
+            richness_penalty = REFINED_MINIMALIST_PENALTY
             adjusted_diffs[RICHNESS_IDX] += richness_penalty
             dim_contributions["refined_minimalist_penalty"] = richness_penalty
     
     distance = math.sqrt(sum(adjusted_diffs))
     return distance, dim_contributions
+
+
+def dimension_penalty(
+    dim: int,
+    user_value: float,
+    food_value: float,
+    archetypes: FrozenSet[Archetype],
+    disliked: bool
+) -> float:
+    """
+    Adjusted squared difference for one dimension, exactly as
+    compute_distance_with_archetypes() computes it (same operations in the
+    same order, so results are bit-identical).
+
+    Every adjustment depends only on that dimension's user/food values,
+    which makes the distance separable:
+        distance = sqrt(sum(dimension_penalty(d, ...) for d in 0..4))
+    """
+    base = (user_value - food_value) ** 2
+    adjusted = base
+
+    damping = ASYMMETRIC_DAMPING.get(dim)
+    if damping is not None and food_value < user_value:
+        adjusted = base * damping
+
+    if disliked:
+        adjusted = adjusted + DISLIKE_PENALTY
+
+    if dim == TEXTURE_IDX and Archetype.TEXTURE_AVOIDER in archetypes:
+        adjusted += base * TEXTURE_AVOIDER_FACTOR
+
+    if dim == SPICE_IDX and Archetype.HEAT_SEEKER in archetypes:
+        adjusted = max(0, adjusted - base * HEAT_SEEKER_REDUCTION)
+
+    if dim == RICHNESS_IDX and Archetype.REFINED_MINIMALIST in archetypes:
+        if food_value >= REFINED_MINIMALIST_RICHNESS:
+            adjusted += REFINED_MINIMALIST_PENALTY
+
+    return adjusted
+
+
+PenaltyTable = Tuple[Tuple[Tuple[Tuple[float, ...], ...], ...], ...]
+
+
+@lru_cache(maxsize=None)
+def dimension_penalty_table(archetypes: FrozenSet[Archetype]) -> Tuple[PenaltyTable, PenaltyTable]:
+    """
+    Precomputed dimension_penalty() for every grid level pair.
+
+    Returns (not_disliked, disliked), each indexed [dim][user_level][food_level]
+    with levels as positions in VALID_VALUES. 32 archetype sets × 2 × 5 × 3 × 3.
+    """
+    def build(disliked: bool) -> PenaltyTable:
+        return tuple(
+            tuple(
+                tuple(dimension_penalty(dim, u, f, archetypes, disliked) for f in VALID_VALUES)
+                for u in VALID_VALUES
+            )
+            for dim in range(len(DIMENSION_NAMES))
+        )
+    return (build(False), build(True))
+
+
+def catalog_penalty_rows(
+    user_levels: Tuple[int, ...],
+    food_levels: Tuple[Tuple[int, ...], ...],
+    disliked: List[bool],
+    archetypes: FrozenSet[Archetype]
+) -> List[Tuple[float, ...]]:
+    """Per-food rows of the 5 adjusted dimension penalties, via table lookups."""
+    tables = dimension_penalty_table(archetypes)
+    rows = []
+    for levels, is_disliked in zip(food_levels, disliked):
+        table = tables[is_disliked]
+        rows.append(tuple(table[d][user_levels[d]][levels[d]] for d in range(len(levels))))
+    return rows
+
+
+def catalog_distances(
+    user_vec: Tuple[float, ...],
+    dislikes: Set[str],
+    archetypes: Set[Archetype],
+    catalog=None,
+    indices: Optional[Iterable[int]] = None
+) -> array:
+    """
+    compute_distance_with_archetypes() distances for every catalog food (in
+    catalog order), or for the catalog `indices` given (in that order),
+    without building contribution dicts. Bit-identical to the per-food
+    function.
+
+    Returns a compact array('d') (8 bytes per food).
+    """
+    from .catalog import LEVELS, get_catalog
+    if catalog is None:
+        catalog = get_catalog()
+    tables = dimension_penalty_table(frozenset(archetypes))
+    user_levels = tuple(LEVELS[v] for v in user_vec)
+    food_levels = catalog.table("food_levels")
+    distances = array("d")
+    sqrt = math.sqrt
+    if indices is None:
+        foods = zip(catalog.food_ids, food_levels)
+    else:
+        foods = ((catalog.food_ids[i], food_levels[i]) for i in indices)
+    for food_id, levels in foods:
+        t = tables[food_id in dislikes]
+        distances.append(sqrt(
+            t[0][user_levels[0]][levels[0]]
+            + t[1][user_levels[1]][levels[1]]
+            + t[2][user_levels[2]][levels[2]]
+            + t[3][user_levels[3]][levels[3]]
+            + t[4][user_levels[4]][levels[4]]
+        ))
+    return distances
@@ -0,0 +1,310 @@
+"""
+Array-backed distance results for one ring assignment.
+Episode: perf_2026
+
+A DistanceTable holds an assignment's per-food results as parallel
+arrays instead of one FoodDistance object (and one contributions dict)
+per food:
+
+    indices        array('I')  catalog index of each row
+    distances      array('d')  adjusted distance (bit-identical to
+                               compute_distance_with_archetypes)
+    penalties      array('d')  n × 5 contribution matrix: each row's
+                               adjusted penalty per taste dimension
+                               (distance = sqrt of the row sum)
+    rings          array('b')  ring number, -1 until partitioned
+    ring_rows      the rows of each ring (unsorted), None until partitioned
+
+Distances and the penalty matrix come from the catalog penalty tables
+(distance.dimension_penalty_table), as distance.catalog_penalty_rows
+computes them. contributions=False skips the matrix. No contributions
+dict is built up front on either path. FoodDistanceView.dimension_contributions
+builds one when it is read, by copying a per-table template: the dict
+depends only on the food's grid cell and dislike flag, so a table computes
+at most 2 × 243 of them.
+
+Given thresholds up front (approximate mode, see approx_thresholds),
+compute_distance_table() classifies and buckets each row in the same
+pass that computes its distance, instead of a separate partition() pass.
+
+FoodDistanceView is a two-slot view on one row with FoodDistance's
+attributes (food_name, distance, ring, dimension_contributions) and
+ordering, so explanations.py, api.py and the rest keep working on ring
+lists unchanged.
+
+Rings are sorted by (distance, food_name) with two C-level key sorts over
+row numbers (by precomputed name rank, then stably by distance) instead of
+FoodDistance.__lt__ calls.
+"""
+
+import math
+from array import array
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from .archetypes import Archetype
+from .catalog import LEVELS, get_catalog, register_table
+from .distance import (
+    catalog_distances,
+    catalog_penalty_rows,
+    compute_distance_with_archetypes,
+    dimension_penalty_table,
+)
+from .food_data import DIMENSION_NAMES
+
+DIMENSIONS = len(DIMENSION_NAMES)
+
+
+def _name_rank(catalog) -> array:
+    """Position of each catalog food in food_id order (for tie-breaking)."""
+    rank = array("I", bytes(4 * len(catalog)))
+    for position, i in enumerate(sorted(range(len(catalog)), key=catalog.food_ids.__getitem__)):
+        rank[i] = position
+    return rank
+
+
+register_table("name_rank", _name_rank)
+
+
+class DistanceTable:
+    """Per-food distance results of one (profile, dislikes, archetypes) in parallel arrays."""
+
+    __slots__ = (
+        "catalog", "user_vec", "dislikes", "archetypes",
+        "indices", "distances", "penalties", "rings", "ring_rows", "_templates",
+    )
+
+    def __init__(
+        self,
+        catalog,
+        user_vec: Tuple[float, ...],
+        dislikes: Set[str],
+        archetypes: FrozenSet[Archetype],
+        indices: array,
+        distances: array,
+        penalties: Optional[array] = None,
+        rings: Optional[array] = None,
+        ring_rows: Optional[Tuple[List[int], List[int], List[int]]] = None
+    ):
+        self.catalog = catalog
+        self.user_vec = user_vec
+        self.dislikes = dislikes
+        self.archetypes = archetypes
+        self.indices = indices
+        self.distances = distances
+        self.rings = array("b", b"\xff" * len(indices)) if rings is None else rings
+        self.penalties = penalties
+        self.ring_rows = ring_rows
+        self._templates: Dict[int, Dict[str, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def food_name(self, row: int) -> str:
+        return self.catalog.food_ids[self.indices[row]]
+
+    def partition(self, threshold_0: float, threshold_1: float) -> Tuple[List[int], List[int], List[int]]:
+        """
+        Assign rings (I2: ring ordering, I3: partition completeness).
+        Returns the rows of each ring, unsorted.
+        """
+        rows: Tuple[List[int], List[int], List[int]] = ([], [], [])
+        rings = self.rings
+        for row, distance in enumerate(self.distances):
+            ring = 0 if distance <= threshold_0 else 1 if distance <= threshold_1 else 2
+            rings[row] = ring
+            rows[ring].append(row)
+        self.ring_rows = rows
+        return rows
+
+    def sort_rows(self, rows: List[int]) -> None:
+        """Sort rows in place by (distance, food_name)."""
+        rank = self.catalog.table("name_rank")
+        indices = self.indices
+        rows.sort(key=lambda row: rank[indices[row]])
+        rows.sort(key=self.distances.__getitem__)
+
+    def views(self, rows: Iterable[int]) -> List["FoodDistanceView"]:
+        return [FoodDistanceView(self, row) for row in rows]
+
+    def penalty_row(self, row: int) -> Tuple[float, ...]:
+        """The row's adjusted penalty per taste dimension (from the matrix, or looked up without one)."""
+        penalties = self.penalties
+        if penalties is not None:
+            start = row * DIMENSIONS
+            return tuple(penalties[start:start + DIMENSIONS])
+        i = self.indices[row]
+        return catalog_penalty_rows(
+            tuple(LEVELS[v] for v in self.user_vec),
+            (self.catalog.table("food_levels")[i],),
+            [self.catalog.food_ids[i] in self.dislikes],
+            self.archetypes,
+        )[0]
+
+    def contributions(self, row: int) -> Dict[str, float]:
+        """compute_distance_with_archetypes()'s contributions dict for a row, as a new dict."""
+        catalog = self.catalog
+        i = self.indices[row]
+        food_id = catalog.food_ids[i]
+        # Grid cell code, negated (minus one) for disliked foods
+        key = ~catalog.codes[i] if food_id in self.dislikes else catalog.codes[i]
+        template = self._templates.get(key)
+        if template is None:
+            _, template = compute_distance_with_archetypes(
+                self.user_vec, catalog.vectors[i], food_id, self.dislikes, self.archetypes
+            )
+            self._templates[key] = template
+        return dict(template)
+
+
+class FoodDistanceView:
+    """One DistanceTable row with the FoodDistance attribute API."""
+
+    __slots__ = ("table", "row")
+
+    def __init__(self, table: DistanceTable, row: int):
+        self.table = table
+        self.row = row
+
+    @property
+    def food_name(self) -> str:
+        table = self.table
+        return table.catalog.food_ids[table.indices[self.row]]
+
+    @property
+    def distance(self) -> float:
+        return self.table.distances[self.row]
+
+    @property
+    def ring(self) -> int:
+        return self.table.rings[self.row]
+
+    @ring.setter
+    def ring(self, value: int) -> None:
+        self.table.rings[self.row] = value
+
+    @property
+    def dimension_contributions(self) -> Dict[str, float]:
+        return self.table.contributions(self.row)
+
+    @property
+    def dimension_penalties(self) -> Tuple[float, ...]:
+        return self.table.penalty_row(self.row)
+
+    def __lt__(self, other):
+        """Sort by distance, then name for determinism (as FoodDistance)."""
+        if self.distance != other.distance:
+            return self.distance < other.distance
+        return self.food_name < other.food_name
+
+    def __repr__(self) -> str:
+        return f"FoodDistanceView(food_name={self.food_name!r}, distance={self.distance!r}, ring={self.ring!r})"
+
+
+def compute_distance_table(
+    user_vec: Tuple[float, ...],
+    dislikes: Set[str],
+    archetypes: Set[Archetype],
+    food_ids: Optional[Iterable[str]] = None,
+    catalog=None,
+    contributions: bool = True,
+    thresholds: Optional[Tuple[float, float]] = None
+) -> DistanceTable:
+    """
+    Distances to all catalog foods (or only `food_ids`, in the given order),
+    with the penalty matrix unless `contributions` is False.
+
+    With `thresholds`, every row is also classified as its distance is
+    computed: the table comes back partitioned (rings and ring_rows set).
+
+    Raises:
+        KeyError: If a food in `food_ids` is not in the catalog.
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    indices = selection_indices(catalog, food_ids)
+    archetype_key = frozenset(archetypes)
+    if not contributions and thresholds is None:
+        distances = catalog_distances(
+            user_vec, dislikes, archetypes, catalog, None if food_ids is None else indices
+        )
+        return DistanceTable(catalog, user_vec, dislikes, archetype_key, indices, distances)
+    return _scan_table(
+        user_vec, dislikes, archetype_key, indices, catalog, contributions, thresholds, food_ids is None
+    )
+
+
+def selection_indices(catalog, food_ids: Optional[Iterable[str]] = None) -> array:
+    """
+    Catalog indices of the selected foods (all of them by default).
+
+    Raises:
+        KeyError: If a food in `food_ids` is not in the catalog.
+    """
+    if food_ids is None:
+        return array("I", range(len(catalog)))
+    return array("I", [catalog.index[food_id] for food_id in food_ids])
+
+
+def _scan_table(
+    user_vec: Tuple[float, ...],
+    dislikes: Set[str],
+    archetypes: FrozenSet[Archetype],
+    indices: array,
+    catalog,
+    with_penalties: bool,
+    thresholds: Optional[Tuple[float, float]],
+    whole_catalog: bool
+) -> DistanceTable:
+    """
+    One pass over the rows: penalties (into the matrix if `with_penalties`),
+    distance, and with `thresholds` the ring and its bucket.
+    """
+    # Same table lookups, added in the same order, as distance.catalog_distances
+    # (bit-identical), with this user's rows of the penalty tables bound up front
+    user_levels = tuple(LEVELS[v] for v in user_vec)
+    user_penalties = [
+        tuple(table[d][user_levels[d]] for d in range(DIMENSIONS))
+        for table in dimension_penalty_table(archetypes)
+    ]
+    names = catalog.food_ids
+    food_levels = catalog.table("food_levels")
+    if whole_catalog:
+        foods = zip(names, food_levels)
+    else:
+        foods = ((names[i], food_levels[i]) for i in indices)
+    sqrt = math.sqrt
+    distances = array("d")
+    append_distance = distances.append
+    penalties = array("d") if with_penalties else None
+
+    if thresholds is None:
+        extend_penalties = penalties.extend
+        for food_id, (l0, l1, l2, l3, l4) in foods:
+            p0, p1, p2, p3, p4 = user_penalties[food_id in dislikes]
+            row = (p0[l0], p1[l1], p2[l2], p3[l3], p4[l4])
+            extend_penalties(row)
+            append_distance(sqrt(row[0] + row[1] + row[2] + row[3] + row[4]))
+        return DistanceTable(catalog, user_vec, dislikes, archetypes, indices, distances, penalties)
+
+    threshold_0, threshold_1 = thresholds
+    rings = array("b")
+    rows: Tuple[List[int], List[int], List[int]] = ([], [], [])
+    append_ring = rings.append
+    append_0, append_1, append_2 = (ring_rows.append for ring_rows in rows)
+    for row, (food_id, (l0, l1, l2, l3, l4)) in enumerate(foods):
+        p0, p1, p2, p3, p4 = user_penalties[food_id in dislikes]
+        a, b, c, d, e = p0[l0], p1[l1], p2[l2], p3[l3], p4[l4]
+        if penalties is not None:
+            penalties.extend((a, b, c, d, e))
+        distance = sqrt(a + b + c + d + e)
+        append_distance(distance)
+        if distance <= threshold_0:
+            append_ring(0)
+            append_0(row)
+        elif distance <= threshold_1:
+            append_ring(1)
+            append_1(row)
+        else:
+            append_ring(2)
+            append_2(row)
+    return DistanceTable(catalog, user_vec, dislikes, archetypes, indices, distances, penalties, rings, rows)
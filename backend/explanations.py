@@ -3,10 +3,226 @@ Personality determination and explanation generation.
 Episode: cursor_foodapp
 """
 
-from typing import List, Set
+import io
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set, TextIO, Tuple
 from .taste_vector import UserTasteVector, FoodDistance, PersonalityProfile, ComfortRingAssignment
 from .archetypes import Archetype
 from .food_data import FOODS, DIMENSION_NAMES
+from .catalog import code_vector, vector_code
+
+
+# Personality types and the taste-vector predicate each requires, in scoring order
+PERSONALITY_PREDICATES: Dict[str, Callable[[Tuple[float, ...]], bool]] = {
+    "Comfort Seeker": lambda vec: vec[2] <= 0.2 and vec[4] <= 0.2,
+    "Spice Lover": lambda vec: vec[0] >= 0.8,
+    "Texture Explorer": lambda vec: vec[1] >= 0.8,
+    "Adventurous Eater": lambda vec: vec[4] >= 0.8,
+    "Minimalist": lambda vec: vec[3] <= 0.2 and sum(vec) < 2.0,
+    "Balanced Eater": lambda vec: all(0.4 <= v <= 0.6 for v in vec),
+    "Rich Food Lover": lambda vec: vec[3] >= 0.8,
+    "Familiar First": lambda vec: vec[2] <= 0.2,
+    "Global Palate": lambda vec: vec[2] >= 0.5 and vec[4] >= 0.5,
+}
+
+# (personality, archetype, applies when the archetype is present?, bonus)
+ARCHETYPE_BONUSES: Tuple[Tuple[str, Archetype, bool, float], ...] = (
+    ("Texture Explorer", Archetype.TEXTURE_AVOIDER, False, 0.2),
+    ("Spice Lover", Archetype.HEAT_SEEKER, True, 0.3),
+    ("Comfort Seeker", Archetype.COMFORT_MAXIMALIST, True, 0.3),
+    ("Adventurous Eater", Archetype.FLAVOR_EXPLORER, True, 0.3),
+    ("Minimalist", Archetype.REFINED_MINIMALIST, True, 0.3),
+)
+
+# (personality, ring, other ring, bonus): applies when `ring` holds more foods than `other ring`
+RING_BONUSES: Tuple[Tuple[str, int, int, float], ...] = (
+    ("Comfort Seeker", 0, 2, 0.2),
+    ("Adventurous Eater", 2, 0, 0.2),
+)
+
+# Explanation renderers: one f-string function per personality over the
+# taste vector (spice, texture, familiarity, richness, distance) and the
+# ring 0 / ring 2 sizes, with its reasons joined by " | "
+ExplanationRenderer = Callable[[Tuple[float, ...], int, int], str]
+
+
+def _explain_comfort_seeker(vec: Tuple[float, ...], ring_0: int, ring_2: int) -> str:
+    return (
+        f"Your preparation familiarity preference is {vec[2]} (low) | "
+        f"Your psychological distance tolerance is {vec[4]} (low) | "
+        f"Ring 0 contains {ring_0} foods (comfort zone)"
+    )
+
+
+def _explain_spice_lover(vec: Tuple[float, ...], ring_0: int, ring_2: int) -> str:
+    return f"Your spice intensity preference is {vec[0]} (high)"
+
+
+def _explain_texture_explorer(vec: Tuple[float, ...], ring_0: int, ring_2: int) -> str:
+    return f"Your texture intensity preference is {vec[1]} (high)"
+
+
+def _explain_adventurous_eater(vec: Tuple[float, ...], ring_0: int, ring_2: int) -> str:
+    return (
+        f"Your psychological distance tolerance is {vec[4]} (high) | "
+        f"Ring 2 contains {ring_2} foods (experimental zone)"
+    )
+
+
+def _explain_minimalist(vec: Tuple[float, ...], ring_0: int, ring_2: int) -> str:
+    return (
+        f"Your richness preference is {vec[3]} (low) | "
+        f"Overall taste vector sum is {sum(vec):.2f} (restrained)"
+    )
+
+
+def _explain_balanced_eater(vec: Tuple[float, ...], ring_0: int, ring_2: int) -> str:
+    return "All dimensions fall in moderate range [0.4-0.6]"
+
+
+def _explain_rich_food_lover(vec: Tuple[float, ...], ring_0: int, ring_2: int) -> str:
+    return f"Your richness preference is {vec[3]} (high)"
+
+
+def _explain_familiar_first(vec: Tuple[float, ...], ring_0: int, ring_2: int) -> str:
+    return f"Your preparation familiarity preference is {vec[2]} (low, prefer familiar)"
+
+
+def _explain_global_palate(vec: Tuple[float, ...], ring_0: int, ring_2: int) -> str:
+    return (
+        f"Your preparation familiarity is {vec[2]} (high) | "
+        f"Your psychological distance tolerance is {vec[4]} (high)"
+    )
+
+
+EXPLANATION_RENDERERS: Dict[str, ExplanationRenderer] = {
+    "Comfort Seeker": _explain_comfort_seeker,
+    "Spice Lover": _explain_spice_lover,
+    "Texture Explorer": _explain_texture_explorer,
+    "Adventurous Eater": _explain_adventurous_eater,
+    "Minimalist": _explain_minimalist,
+    "Balanced Eater": _explain_balanced_eater,
+    "Rich Food Lover": _explain_rich_food_lover,
+    "Familiar First": _explain_familiar_first,
+    "Global Palate": _explain_global_palate,
+}
+
+_PERSONALITY_NAMES: Tuple[str, ...] = tuple(PERSONALITY_PREDICATES)
+_ARCHETYPE_BITS: Dict[Archetype, int] = {archetype: 1 << bit for bit, archetype in enumerate(Archetype)}
+
+# Ranking: (primary, secondary, confidence_primary, confidence_secondary)
+Ranking = Tuple[str, str, float, float]
+
+
+def _base_scores(vec: Tuple[float, ...], archetypes) -> Tuple[float, ...]:
+    """Predicate score plus archetype bonuses of each personality, in PERSONALITY_PREDICATES order."""
+    scores = []
+    for personality_name, predicate in PERSONALITY_PREDICATES.items():
+        score = 1.0 if predicate(vec) else 0.0
+        for name, archetype, present, bonus in ARCHETYPE_BONUSES:
+            if name == personality_name and (archetype in archetypes) == present:
+                score += bonus
+        scores.append(score)
+    return tuple(scores)
+
+
+def _rank(base_scores: Tuple[float, ...], ring_bits: int) -> Ranking:
+    """Apply the ring bonuses selected by `ring_bits`, then pick and normalize the top two."""
+    scores = dict(zip(_PERSONALITY_NAMES, base_scores))
+    for bit, (name, _, _, bonus) in enumerate(RING_BONUSES):
+        if ring_bits >> bit & 1:
+            scores[name] += bonus
+
+    sorted_personalities = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+    primary = sorted_personalities[0]
+    secondary = sorted_personalities[1] if len(sorted_personalities) > 1 else ("Unknown", 0.0)
+
+    # Normalize confidence
+    total_score = sum(s for _, s in sorted_personalities)
+    confidence_primary = primary[1] / total_score if total_score > 0 else 0.0
+    confidence_secondary = secondary[1] / total_score if total_score > 0 else 0.0
+    return primary[0], secondary[0], min(confidence_primary, 1.0), min(confidence_secondary, 1.0)
+
+
+@lru_cache(maxsize=None)
+def _grid_base_scores(code: int, mask: int) -> Tuple[float, ...]:
+    return _base_scores(code_vector(code), {a for a, bit in _ARCHETYPE_BITS.items() if mask & bit})
+
+
+@lru_cache(maxsize=None)
+def _grid_ranking(code: int, mask: int, ring_bits: int) -> Ranking:
+    """Ranking of a grid profile; at most 3^5 × 2^5 × 2^len(RING_BONUSES) entries."""
+    return _rank(_grid_base_scores(code, mask), ring_bits)
+
+
+def _ring_bits(ring_sizes: Tuple[int, int, int]) -> int:
+    """Bit i set when RING_BONUSES[i] applies."""
+    ring_bits = 0
+    for bit, (_, ring, other, _) in enumerate(RING_BONUSES):
+        if ring_sizes[ring] > ring_sizes[other]:
+            ring_bits |= 1 << bit
+    return ring_bits
+
+
+def score_personalities(vec: Tuple[float, ...], archetypes: Set[Archetype], ring_sizes: Tuple[int, int, int]) -> Ranking:
+    """personality_ranking() computed from the rule tables, without the lookup."""
+    return _rank(_base_scores(vec, archetypes), _ring_bits(ring_sizes))
+
+
+def personality_ranking(vec: Tuple[float, ...], archetypes: Set[Archetype], ring_sizes: Tuple[int, int, int]) -> Ranking:
+    """
+    (primary, secondary, confidence_primary, confidence_secondary) for a
+    taste vector, archetype set and ring sizes. Grid vectors are looked up
+    by (profile code, archetype mask, ring bonus bits); other vectors are
+    scored directly.
+    """
+    try:
+        code = vector_code(vec)
+    except KeyError:  # off-grid vector
+        return score_personalities(vec, archetypes, ring_sizes)
+    mask = 0
+    for archetype in archetypes:
+        mask |= _ARCHETYPE_BITS[archetype]
+    return _grid_ranking(code, mask, _ring_bits(ring_sizes))
+
+
+def render_personality_explanation(
+    personality: str,
+    vec: Tuple[float, ...],
+    archetypes: Iterable[Archetype],
+    ring_0_size: int,
+    ring_2_size: int
+) -> str:
+    """Explanation text for a personality, from its renderer."""
+    reasons = []
+    renderer = EXPLANATION_RENDERERS.get(personality)
+    if renderer is not None:
+        reasons.append(renderer(vec, ring_0_size, ring_2_size))
+    # Archetype influences
+    for archetype in archetypes:
+        reasons.append(f"Archetype: {archetype.value}")
+    return " | ".join(reasons)
+
+
+class LazyPersonalityProfile(PersonalityProfile):
+    """PersonalityProfile whose explanation is rendered on first access."""
+
+    def __init__(self, ranking: Ranking, vec: Tuple[float, ...], archetypes: Tuple[Archetype, ...], ring_sizes: Tuple[int, int, int]):
+        self._context = (vec, archetypes, ring_sizes)
+        super().__init__(*ranking, explanation=None)
+
+    @property
+    def explanation(self) -> str:
+        if self._explanation is None:
+            vec, archetypes, ring_sizes = self._context
+            self._explanation = render_personality_explanation(
+                self.primary_personality, vec, archetypes, ring_sizes[0], ring_sizes[2]
+            )
+        return self._explanation
+
+    @explanation.setter
+    def explanation(self, value: Optional[str]) -> None:
+        self._explanation = value
 
 
 def determine_personality(
@@ -21,70 +237,14 @@ def determine_personality(
     - User taste vector dominant dimensions
     - Archetypes
     - Ring distribution
+
+    The ranking comes from personality_ranking()'s lookup table; the
+    explanation is rendered only when the profile's explanation is read.
     """
     vec = user_vector.to_tuple()
-    
-    # Define personality types based on dominant dimensions
-    personalities = {
-        "Comfort Seeker": vec[2] <= 0.2 and vec[4] <= 0.2,
-        "Spice Lover": vec[0] >= 0.8,
-        "Texture Explorer": vec[1] >= 0.8,
-        "Adventurous Eater": vec[4] >= 0.8,
-        "Minimalist": vec[3] <= 0.2 and sum(vec) < 2.0,
-        "Balanced Eater": all(0.4 <= v <= 0.6 for v in vec),
-        "Rich Food Lover": vec[3] >= 0.8,
-        "Familiar First": vec[2] <= 0.2,
-        "Global Palate": vec[2] >= 0.5 and vec[4] >= 0.5,
-    }
-    
-    # Score personalities
-    scores = {}
-    for personality_name, matches in personalities.items():
-        score = 1.0 if matches else 0.0
-        
-        # Bonus from archetypes
-        if personality_name == "Texture Explorer" and Archetype.TEXTURE_AVOIDER not in archetypes:
-            score += 0.2
-        if personality_name == "Spice Lover" and Archetype.HEAT_SEEKER in archetypes:
-            score += 0.3
-        if personality_name == "Comfort Seeker" and Archetype.COMFORT_MAXIMALIST in archetypes:
-            score += 0.3
-        if personality_name == "Adventurous Eater" and Archetype.FLAVOR_EXPLORER in archetypes:
-            score += 0.3
-        if personality_name == "Minimalist" and Archetype.REFINED_MINIMALIST in archetypes:
-            score += 0.3
-        
-        # Bonus from ring distribution
-        if personality_name == "Comfort Seeker" and len(ring_0) > len(ring_2):
-            score += 0.2
-        if personality_name == "Adventurous Eater" and len(ring_2) > len(ring_0):
-            score += 0.2
-        
-        scores[personality_name] = score
-    
-    # Get top 2
-    sorted_personalities = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
-    
-    primary = sorted_personalities[0]
-    secondary = sorted_personalities[1] if len(sorted_personalities) > 1 else ("Unknown", 0.0)
-    
-    # Normalize confidence
-    total_score = sum(s for _, s in sorted_personalities)
-    confidence_primary = primary[1] / total_score if total_score > 0 else 0.0
-    confidence_secondary = secondary[1] / total_score if total_score > 0 else 0.0
-    
-    # Generate explanation
-    explanation = generate_personality_explanation(
-        primary[0], user_vector, archetypes, ring_0, ring_1, ring_2
-    )
-    
-    return PersonalityProfile(
-        primary_personality=primary[0],
-        secondary_personality=secondary[0],
-        confidence_primary=min(confidence_primary, 1.0),
-        confidence_secondary=min(confidence_secondary, 1.0),
-        explanation=explanation
-    )
+    ring_sizes = (len(ring_0), len(ring_1), len(ring_2))
+    # tuple() keeps the set's iteration order for the explanation's archetype reasons
+    return LazyPersonalityProfile(personality_ranking(vec, archetypes, ring_sizes), vec, tuple(archetypes), ring_sizes)
 
 
 def generate_personality_explanation(
@@ -96,110 +256,117 @@ def generate_personality_explanation(
     ring_2: List[FoodDistance]
 ) -> str:
     """Generate truthful explanation for personality assignment."""
-    vec = user_vector.to_tuple()
-    
-    reasons = []
-    
-    # Dimension-based reasons
-    if personality == "Comfort Seeker":
-        reasons.append(f"Your preparation familiarity preference is {vec[2]} (low)")
-        reasons.append(f"Your psychological distance tolerance is {vec[4]} (low)")
-        reasons.append(f"Ring 0 contains {len(ring_0)} foods (comfort zone)")
-    
-    elif personality == "Spice Lover":
-        reasons.append(f"Your spice intensity preference is {vec[0]} (high)")
-    
-    elif personality == "Texture Explorer":
-        reasons.append(f"Your texture intensity preference is {vec[1]} (high)")
-    
-    elif personality == "Adventurous Eater":
-        reasons.append(f"Your psychological distance tolerance is {vec[4]} (high)")
-        reasons.append(f"Ring 2 contains {len(ring_2)} foods (experimental zone)")
-    
-    elif personality == "Minimalist":
-        reasons.append(f"Your richness preference is {vec[3]} (low)")
-        reasons.append(f"Overall taste vector sum is {sum(vec):.2f} (restrained)")
-    
-    elif personality == "Balanced Eater":
-        reasons.append("All dimensions fall in moderate range [0.4-0.6]")
-    
-    elif personality == "Rich Food Lover":
-        reasons.append(f"Your richness preference is {vec[3]} (high)")
-    
-    elif personality == "Familiar First":
-        reasons.append(f"Your preparation familiarity preference is {vec[2]} (low, prefer familiar)")
-    
-    elif personality == "Global Palate":
-        reasons.append(f"Your preparation familiarity is {vec[2]} (high)")
-        reasons.append(f"Your psychological distance tolerance is {vec[4]} (high)")
-    
-    # Archetype influences
-    for archetype in archetypes:
-        reasons.append(f"Archetype: {archetype.value}")
-    
-    return " | ".join(reasons)
+    return render_personality_explanation(personality, user_vector.to_tuple(), archetypes, len(ring_0), len(ring_2))
 
+# Report templates: f-strings compiled with the module, each rendering one
+# or more whole lines of a report
+_RULE = "=" * 80
+_RING_NAMES = (
+    "RING 0 — Core Comfort",
+    "RING 1 — Adjacent / Safe Stretch",
+    "RING 2 — Far Edge / Experimental",
+)
+
+
+def _report_header(vec: UserTasteVector) -> str:
+    return (
+        f"{_RULE}\nFOOD PERSONALITY & COMFORT RING ASSIGNMENT\n{_RULE}\n\n"
+        f"USER TASTE VECTOR:\n"
+        f"  Spice Intensity: {vec.spice_intensity}\n"
+        f"  Texture Intensity: {vec.texture_intensity}\n"
+        f"  Preparation Familiarity: {vec.preparation_familiarity}\n"
+        f"  Richness: {vec.richness}\n"
+        f"  Psychological Distance: {vec.psychological_distance}\n\n"
+    )
+
+
+def _report_thresholds(t0: float, t1: float) -> str:
+    return (
+        f"RING THRESHOLDS:\n"
+        f"  Ring 0 (Core Comfort): distance ≤ {t0:.3f}\n"
+        f"  Ring 1 (Safe Stretch): {t0:.3f} < distance ≤ {t1:.3f}\n"
+        f"  Ring 2 (Experimental): distance > {t1:.3f}\n\n"
+    )
+
+
+def _report_personality(p: PersonalityProfile) -> str:
+    return (
+        f"FOOD PERSONALITY:\n"
+        f"  Primary: {p.primary_personality} (confidence: {p.confidence_primary:.2%})\n"
+        f"  Secondary: {p.secondary_personality} (confidence: {p.confidence_secondary:.2%})\n"
+        f"  Explanation: {p.explanation}\n"
+    )
+
+
+def _report_ring(ring_name: str, size: int) -> str:
+    return f"\n{_RULE}\n{ring_name} ({size} foods)\n{_RULE}\n"
+
+
+def _detail_header(food_name: str, fd: FoodDistance) -> str:
+    return (
+        f"{_RULE}\nDETAILED EXPLANATION: {food_name}\n{_RULE}\n\n"
+        f"Ring: {fd.ring}\nTotal Distance: {fd.distance:.3f}\n\n"
+    )
+
+
+def write_ring_assignment(assignment: ComfortRingAssignment, out: TextIO) -> None:
+    """Write the ring assignment report to `out`, a line group at a time."""
+    out.write(_report_header(assignment.user_vector))
 
-def explain_ring_assignment(assignment: ComfortRingAssignment) -> str:
-    """Generate human-readable explanation of ring assignments."""
-    lines = []
-    lines.append("=" * 80)
-    lines.append("FOOD PERSONALITY & COMFORT RING ASSIGNMENT")
-    lines.append("=" * 80)
-    lines.append("")
-    
-    # User vector
-    lines.append("USER TASTE VECTOR:")
-    vec = assignment.user_vector
-    lines.append(f"  Spice Intensity: {vec.spice_intensity}")
-    lines.append(f"  Texture Intensity: {vec.texture_intensity}")
-    lines.append(f"  Preparation Familiarity: {vec.preparation_familiarity}")
-    lines.append(f"  Richness: {vec.richness}")
-    lines.append(f"  Psychological Distance: {vec.psychological_distance}")
-    lines.append("")
-    
     # Dislikes
     if assignment.dislikes:
-        lines.append(f"DISLIKES: {', '.join(sorted(assignment.dislikes))}")
-        lines.append("")
-    
+        out.write(f"DISLIKES: {', '.join(sorted(assignment.dislikes))}\n\n")
+
     # Archetypes
     if assignment.archetypes:
-        lines.append("ARCHETYPES:")
-        for archetype in sorted(assignment.archetypes, key=lambda a: a.value):
-            lines.append(f"  - {archetype.value}")
-        lines.append("")
-    
-    # Ring thresholds
-    t0, t1 = assignment.ring_thresholds
-    lines.append("RING THRESHOLDS:")
-    lines.append(f"  Ring 0 (Core Comfort): distance ≤ {t0:.3f}")
-    lines.append(f"  Ring 1 (Safe Stretch): {t0:.3f} < distance ≤ {t1:.3f}")
-    lines.append(f"  Ring 2 (Experimental): distance > {t1:.3f}")
-    lines.append("")
-    
-    # Personality
-    p = assignment.personality
-    lines.append("FOOD PERSONALITY:")
-    lines.append(f"  Primary: {p.primary_personality} (confidence: {p.confidence_primary:.2%})")
-    lines.append(f"  Secondary: {p.secondary_personality} (confidence: {p.confidence_secondary:.2%})")
-    lines.append(f"  Explanation: {p.explanation}")
-    lines.append("")
-    
+        out.write("ARCHETYPES:\n")
+        out.writelines([f"  - {archetype.value}\n" for archetype in sorted(assignment.archetypes, key=lambda a: a.value)])
+        out.write("\n")
+
+    out.write(_report_thresholds(*assignment.ring_thresholds))
+    out.write(_report_personality(assignment.personality))
+
     # Rings
-    for ring_num, ring_foods, ring_name in [
-        (0, assignment.ring_0, "RING 0 — Core Comfort"),
-        (1, assignment.ring_1, "RING 1 — Adjacent / Safe Stretch"),
-        (2, assignment.ring_2, "RING 2 — Far Edge / Experimental")
-    ]:
-        lines.append("=" * 80)
-        lines.append(f"{ring_name} ({len(ring_foods)} foods)")
-        lines.append("=" * 80)
-        for fd in ring_foods:
-            lines.append(f"  {fd.food_name:<30} distance: {fd.distance:.3f}")
-        lines.append("")
-    
-    return "\n".join(lines)
+    for ring_name, ring_foods in zip(_RING_NAMES, (assignment.ring_0, assignment.ring_1, assignment.ring_2)):
+        out.write(_report_ring(ring_name, len(ring_foods)))
+        out.writelines(f"  {fd.food_name:<30} distance: {fd.distance:.3f}\n" for fd in ring_foods)
+
+
+def write_food_distance(food_name: str, assignment: ComfortRingAssignment, out: TextIO) -> None:
+    """
+    Write the detailed explanation of one food's ring to `out`.
+
+    Raises:
+        KeyError: If the food is not in the assignment.
+    """
+    food_dist = assignment.find_food(food_name)
+    if food_dist is None:
+        raise KeyError(food_name)
+
+    out.write(_detail_header(food_name, food_dist))
+
+    out.write("DIMENSION CONTRIBUTIONS:\n")
+    out.writelines([
+        f"  {dim:<30} {contrib:.4f}\n"
+        for dim, contrib in sorted(food_dist.dimension_contributions.items())
+    ])
+    out.write("\n")
+
+    # Show food vector vs user vector
+    food_vec = FOODS[food_name]
+    user_vec = assignment.user_vector.to_tuple()
+    out.write("DIMENSION-BY-DIMENSION COMPARISON:\n")
+    out.writelines([
+        f"  {dim_name:<30} User: {user:.1f}  Food: {food:.1f}  Diff: {abs(user - food):.1f}\n"
+        for dim_name, user, food in zip(DIMENSION_NAMES, user_vec, food_vec)
+    ])
+
+
+def explain_ring_assignment(assignment: ComfortRingAssignment) -> str:
+    """Generate human-readable explanation of ring assignments."""
+    out = io.StringIO()
+    write_ring_assignment(assignment, out)
+    return out.getvalue()
 
 
 def explain_food_distance(
@@ -207,38 +374,9 @@ def explain_food_distance(
     assignment: ComfortRingAssignment
 ) -> str:
     """Generate detailed explanation for why a specific food is in its ring."""
-    # Find food
-    all_foods = assignment.ring_0 + assignment.ring_1 + assignment.ring_2
-    food_dist = None
-    for fd in all_foods:
-        if fd.food_name == food_name:
-            food_dist = fd
-            break
-    
-    if not food_dist:
+    out = io.StringIO()
+    try:
+        write_food_distance(food_name, assignment, out)
+    except KeyError:
         return f"Food '{food_name}' not found."
-    
-    lines = []
-    lines.append("=" * 80)
-    lines.append(f"DETAILED EXPLANATION: {food_name}")
-    lines.append("=" * 80)
-    lines.append("")
-    
-    lines.append(f"Ring: {food_dist.ring}")
-    lines.append(f"Total Distance: {food_dist.distance:.3f}")
-    lines.append("")
-    
-    lines.append("DIMENSION CONTRIBUTIONS:")
-    for dim, contrib in sorted(food_dist.dimension_contributions.items()):
-        lines.append(f"  {dim:<30} {contrib:.4f}")
-    lines.append("")
-    
-    # Show food vector vs user vector
-    food_vec = FOODS[food_name]
-    user_vec = assignment.user_vector.to_tuple()
-    lines.append("DIMENSION-BY-DIMENSION COMPARISON:")
-    for i, dim_name in enumerate(DIMENSION_NAMES):
-        lines.append(f"  {dim_name:<30} User: {user_vec[i]:.1f}  Food: {food_vec[i]:.1f}  Diff: {abs(user_vec[i] - food_vec[i]):.1f}")
-    lines.append("")
-    
-    return "\n".join(lines)
+    return out.getvalue()
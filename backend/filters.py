@@ -0,0 +1,184 @@
+"""
+Catalog filters resolved through inverted indexes.
+Episode: perf_2026
+
+Regional deployments compute rings over a subset of the catalog (e.g. only
+Mexican dishes, or everything except Japan). The filter index, built once
+per catalog, maps
+- origin / region word tokens            → bitmap of catalog indices
+- (taste dimension, value band)          → bitmap of catalog indices
+where a bitmap is a Python int with bit i set for catalog index i. A filter
+expression resolves to a single bitmap by OR/AND/AND-NOT of those bitmaps,
+before any distance is computed.
+
+Expression syntax: clauses separated by ";" are ANDed. Each clause is
+`field=v1|v2` (any of the values) or `field!=v1|v2` (none of them):
+
+    origin=Mexico|Japan; spice_intensity!=high
+
+Fields are `origin`, `region` and the taste dimensions. Origin and region
+values match on words, case-insensitively ("united states" matches
+"Italy/United States"). Dimension values are `low`, `medium`, `high` or
+0.2 / 0.5 / 0.8.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .catalog import get_catalog, register_table
+from .food_data import DIMENSION_NAMES, VALID_VALUES
+
+TEXT_FIELDS = ("origin", "region")
+BAND_NAMES = ("low", "medium", "high")  # one per VALID_VALUES level
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of an origin/region string."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+@dataclass
+class FilterIndex:
+    """Inverted indexes of a catalog, as bitmaps over catalog indices."""
+    all: int
+    tokens: Dict[str, Dict[str, int]]  # text field -> token -> bitmap
+    bands: Dict[str, Tuple[int, ...]]  # dimension -> bitmap per level
+
+
+def build_filter_index(catalog) -> FilterIndex:
+    tokens: Dict[str, Dict[str, int]] = {name: {} for name in TEXT_FIELDS}
+    for name in TEXT_FIELDS:
+        postings = tokens[name]
+        for i, text in enumerate(catalog.columns[name]):
+            for token in set(tokenize(text)):
+                postings[token] = postings.get(token, 0) | (1 << i)
+
+    bands = {}
+    food_levels = catalog.table("food_levels")
+    for d, dim in enumerate(DIMENSION_NAMES):
+        bitmaps = [0] * len(VALID_VALUES)
+        for i, levels in enumerate(food_levels):
+            bitmaps[levels[d]] |= 1 << i
+        bands[dim] = tuple(bitmaps)
+
+    return FilterIndex(all=(1 << len(catalog)) - 1, tokens=tokens, bands=bands)
+
+
+register_table("filter_index", build_filter_index)
+
+
+Clause = Tuple[str, bool, Tuple[str, ...]]  # (field, negated, values)
+
+
+def parse_filter(expression: str) -> List[Clause]:
+    """
+    Parse a filter expression into clauses.
+
+    Raises:
+        ValueError: On syntax errors or unknown fields.
+    """
+    clauses = []
+    for part in expression.split(";"):
+        part = part.strip()
+        if not part:
+            continue
+        match = re.fullmatch(r"([a-z_]+)\s*(!?=)\s*(.+)", part)
+        if match is None:
+            raise ValueError(f"Invalid filter clause: '{part}' (expected field=value or field!=value)")
+        field_name, op, raw_values = match.groups()
+        if field_name not in TEXT_FIELDS and field_name not in DIMENSION_NAMES:
+            raise ValueError(
+                f"Unknown filter field '{field_name}'. Valid: {list(TEXT_FIELDS) + list(DIMENSION_NAMES)}"
+            )
+        values = tuple(v.strip() for v in raw_values.split("|") if v.strip())
+        if not values:
+            raise ValueError(f"Filter clause '{part}' has no values")
+        clauses.append((field_name, op == "!=", values))
+    return clauses
+
+
+def _band_level(value: str) -> int:
+    if value.lower() in BAND_NAMES:
+        return BAND_NAMES.index(value.lower())
+    try:
+        return VALID_VALUES.index(float(value))
+    except ValueError:
+        raise ValueError(f"Invalid band '{value}'. Valid: {list(BAND_NAMES)} or {VALID_VALUES}")
+
+
+def _value_bitmap(index: FilterIndex, field_name: str, value: str) -> int:
+    if field_name in index.bands:
+        return index.bands[field_name][_band_level(value)]
+    postings = index.tokens[field_name]
+    bitmap = index.all
+    words = tokenize(value)
+    if not words:
+        raise ValueError(f"Empty {field_name} value in filter")
+    for word in words:
+        bitmap &= postings.get(word, 0)
+    return bitmap
+
+
+def resolve_filter(expression: Optional[str], catalog=None) -> Optional[int]:
+    """
+    Bitmap of the catalog indices matching `expression`, or None when there
+    is no filter (the whole catalog).
+
+    Raises:
+        ValueError: On invalid expressions or when no food matches.
+    """
+    if expression is None or not expression.strip():
+        return None
+    if catalog is None:
+        catalog = get_catalog()
+    index: FilterIndex = catalog.table("filter_index")
+
+    bitmap = index.all
+    for field_name, negated, values in parse_filter(expression):
+        matched = 0
+        for value in values:
+            matched |= _value_bitmap(index, field_name, value)
+        bitmap = bitmap & ~matched if negated else bitmap & matched
+    if not bitmap:
+        raise ValueError(f"Filter matches no foods: '{expression}'")
+    return bitmap
+
+
+# Bit positions set in each byte value, for decoding bitmaps a byte at a time
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+
+def bitmap_indices(bitmap: int) -> List[int]:
+    """
+    Catalog indices set in a bitmap, ascending (i.e. in catalog order).
+
+    Decoded from the bitmap's bytes: one C-level to_bytes() copy, then
+    O(N/8 + k) table lookups. Clearing bits one by one would copy the
+    whole N-bit int once per set bit.
+    """
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    return [base + bit for base, byte in zip(range(0, len(data) << 3, 8), data) if byte for bit in _BYTE_BITS[byte]]
+
+
+def iter_bitmap_indices(bitmap: int, start: int = 0) -> Iterator[int]:
+    """Catalog indices >= `start` set in a bitmap, ascending, decoded lazily as bitmap_indices() does."""
+    bitmap = bitmap >> start << start
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for offset in range(start >> 3, len(data)):
+        byte = data[offset]
+        if byte:
+            base = offset << 3
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+
+def subset_food_ids(bitmap: Optional[int], catalog=None) -> Optional[Tuple[str, ...]]:
+    """Food IDs selected by a resolved filter (None → no restriction)."""
+    if bitmap is None:
+        return None
+    if catalog is None:
+        catalog = get_catalog()
+    return tuple(catalog.food_ids[i] for i in bitmap_indices(bitmap))
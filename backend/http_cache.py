@@ -0,0 +1,165 @@
+"""
+Pre-rendered, precompressed catalog responses with HTTP cache validators.
+Episode: perf_2026
+
+GET /foods and GET /foods/{food_id} only change when the catalog does, so
+their bodies are rendered once per catalog version (catalog table
+"http_bodies", also shipped in the startup snapshot). Each body is stored
+as identity, gzip and, when the optional `brotli` package is installed,
+br bytes, plus a strong ETag over the identity body.
+
+Responses carry ETag, Cache-Control and Vary: Accept-Encoding; a matching
+If-None-Match is answered with 304 and no body. Each content coding is a
+different representation and gets its own strong ETag (RFC 9110 §8.8.3):
+the identity tag, or the identity tag with a "-gzip" / "-br" suffix.
+If-None-Match matches any variant's tag, since all variants of a body
+change together.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .catalog import register_table
+from .food_data import DIMENSION_NAMES
+
+try:
+    import brotli
+except ImportError:  # optional: br variants are skipped
+    brotli = None
+
+CATALOG_MAX_AGE = int(os.environ.get("FOOD_API_CATALOG_MAX_AGE", "300"))
+CACHE_CONTROL = f"public, max-age={CATALOG_MAX_AGE}"
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 256
+
+
+@dataclass(frozen=True)
+class RenderedBody:
+    etag: str
+    identity: bytes
+    gzip: Optional[bytes]
+    br: Optional[bytes]
+
+
+def render_json(payload) -> RenderedBody:
+    """Encode a JSON payload once, with its compressed variants and ETag."""
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:24] + '"'
+    if len(body) < MIN_COMPRESS_BYTES:
+        return RenderedBody(etag=etag, identity=body, gzip=None, br=None)
+    return RenderedBody(
+        etag=etag,
+        identity=body,
+        gzip=gzip.compress(body, compresslevel=9, mtime=0),
+        br=brotli.compress(body, quality=11) if brotli is not None else None,
+    )
+
+
+def food_metadata_payload(catalog, i: int) -> dict:
+    """Same document as food_registry.get_food_metadata(), from the column store."""
+    columns = catalog.columns
+    return {
+        "food_id": catalog.food_ids[i],
+        "display_name": columns["display_name"][i],
+        "description": columns["description"][i],
+        "origin": columns["origin"][i],
+        "region": columns["region"][i],
+        "image_url": columns["image_url"][i],
+        "taste_profile": dict(zip(DIMENSION_NAMES, catalog.vectors[i])),
+    }
+
+
+def _http_bodies(catalog) -> Dict[str, RenderedBody]:
+    """Rendered bodies keyed by request path."""
+    bodies = {"/foods": render_json({"foods": list(catalog.food_ids), "count": len(catalog)})}
+    for i, food_id in enumerate(catalog.food_ids):
+        bodies[f"/foods/{food_id}"] = render_json(food_metadata_payload(catalog, i))
+    return bodies
+
+
+register_table("http_bodies", _http_bodies)
+
+
+def _accepted_codings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    codings = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[name.strip().lower()] = q
+    return codings
+
+
+def choose_encoding(rendered: RenderedBody, accept_encoding: Optional[str]) -> str:
+    """Best available content coding: br, then gzip, else identity."""
+    codings = _accepted_codings(accept_encoding)
+    wildcard = codings.get("*", 0.0)
+    for name in ("br", "gzip"):
+        if getattr(rendered, name) is not None and codings.get(name, wildcard) > 0:
+            return name
+    return "identity"
+
+
+# Content codings with a variant ETag
+CODINGS = ("gzip", "br")
+
+
+def variant_etag(etag: str, encoding: str) -> str:
+    """Strong ETag of the `encoding` variant of a body whose identity ETag is `etag`."""
+    if encoding == "identity":
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _identity_tag(tag: str) -> str:
+    """Opaque tag of the identity variant (weak prefix and coding suffix removed)."""
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    for encoding in CODINGS:
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)] + '"'
+    return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison, as If-None-Match requires (RFC 9110 §13.1.2), against
+    `etag` or any of its content-coding variants.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = _identity_tag(etag)
+    return any(_identity_tag(candidate.strip()) == opaque for candidate in if_none_match.split(","))
+
+
+def conditional_parts(rendered: RenderedBody, if_none_match: Optional[str], accept_encoding: Optional[str]):
+    """
+    (status, body, headers) for a pre-rendered resource: 304 with no body
+    when the client's copy is current, else 200 with the best encoding.
+    """
+    encoding = choose_encoding(rendered, accept_encoding)
+    headers = {
+        "ETag": variant_etag(rendered.etag, encoding),
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(if_none_match, rendered.etag):
+        return 304, b"", headers
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return 200, getattr(rendered, encoding), headers
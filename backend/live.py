@@ -0,0 +1,91 @@
+"""
+Per-connection state for the live-slider WebSocket.
+Episode: perf_2026
+
+A LiveSession holds one client's current inputs and last result. Each
+incoming message is an incremental change (slider moves, dislike and
+archetype edits); the session merges it, recomputes, and produces a delta
+containing only the foods whose ring or distance changed.
+
+Message format (all keys optional):
+    {
+      "spice_intensity": 0.8, ...          # any taste dimension
+      "dislikes": [...],                   # replace the dislike list
+      "dislikes_add": [...], "dislikes_remove": [...],
+      "archetypes": [...],                 # replace the archetype list
+      "archetypes_add": [...], "archetypes_remove": [...]
+    }
+"""
+
+from typing import Callable, Optional
+
+from .deltas import diff_ring_responses
+from .food_data import DIMENSION_NAMES
+
+
+class LiveSession:
+    """
+    Args:
+        compute: state dict -> formatted /assign_to_rings response. Raises
+            ValueError on invalid input.
+    """
+
+    def __init__(self, compute: Callable[[dict], dict]):
+        self.compute = compute
+        self.state: dict = {"dislikes": [], "archetypes": []}
+        self.last_response: Optional[dict] = None
+        self.seq = 0
+
+    def merge(self, message: dict) -> dict:
+        """New state with `message` applied (current state is not modified)."""
+        if not isinstance(message, dict):
+            raise ValueError("Message must be a JSON object")
+        unknown = set(message) - set(DIMENSION_NAMES) - {
+            "type", "dislikes", "dislikes_add", "dislikes_remove",
+            "archetypes", "archetypes_add", "archetypes_remove",
+        }
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}")
+
+        state = dict(self.state)
+        for dim in DIMENSION_NAMES:
+            if dim in message:
+                state[dim] = message[dim]
+
+        for field in ("dislikes", "archetypes"):
+            for key in (field, f"{field}_add", f"{field}_remove"):
+                if key in message and not (
+                    isinstance(message[key], list) and all(isinstance(v, str) for v in message[key])
+                ):
+                    raise ValueError(f"'{key}' must be a list of strings")
+            values = list(message[field]) if field in message else list(state[field])
+            for value in message.get(f"{field}_add", []):
+                if value not in values:
+                    values.append(value)
+            removed = set(message.get(f"{field}_remove", []))
+            state[field] = [v for v in values if v not in removed]
+
+        missing = [dim for dim in DIMENSION_NAMES if dim not in state]
+        if missing:
+            raise ValueError(f"Missing taste dimensions: {missing}")
+        return state
+
+    def apply(self, message: dict) -> dict:
+        """
+        Apply one client message and return the frame to send back: a full
+        "snapshot" the first time, a "delta" afterwards.
+
+        Raises:
+            ValueError: on invalid input (session state is left unchanged).
+        """
+        state = self.merge(message)
+        response = self.compute(state)
+
+        previous = self.last_response
+        self.state = state
+        self.last_response = response
+        self.seq += 1
+
+        if previous is None:
+            return {"type": "snapshot", "seq": self.seq, **response}
+        return {"type": "delta", "seq": self.seq, **diff_ring_responses(previous, response)}
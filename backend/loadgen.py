@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Load generator for the Food Personality API.
+Episode: perf_2026
+
+Drives backend/api.py either in-process (ASGI transport, no network) or
+against a running server (--url http://localhost:8000), replaying a
+seeded, realistic traffic mix:
+- POST /assign_to_rings with quiz vectors drawn from a skewed per-dimension
+  distribution, a dislike-count distribution and archetype combos
+- GET /foods and GET /foods/{food_id}
+
+Modes:
+- closed: N concurrent clients, each sends its next request when the
+  previous one completes (measures capacity)
+- open: fixed arrival rate regardless of completions; latency is measured
+  from the *intended* send time, so queueing shows up (no coordinated
+  omission)
+
+Results (throughput + p50/p90/p99/p999 from an HDR-style log-linear
+histogram) are printed and optionally written as JSON tagged with the git
+commit, so runs are comparable across commits.
+
+Usage:
+    python backend/loadgen.py --mode closed --concurrency 16 --requests 5000
+    python backend/loadgen.py --mode open --rate 500 --duration 20 --url http://localhost:8000
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from backend import Archetype, DIMENSION_NAMES, VALID_VALUES, list_all_foods
+
+# === Traffic mix ===
+
+# Probability of each VALID_VALUES level (low, medium, high) per quiz dimension.
+# Quiz answers skew towards familiar/mild.
+QUIZ_LEVEL_WEIGHTS: Dict[str, Tuple[float, float, float]] = {
+    "spice_intensity": (0.45, 0.35, 0.20),
+    "texture_intensity": (0.30, 0.50, 0.20),
+    "preparation_familiarity": (0.50, 0.35, 0.15),
+    "richness": (0.20, 0.40, 0.40),
+    "psychological_distance": (0.50, 0.30, 0.20),
+}
+
+# Number of disliked foods per request
+DISLIKE_COUNT_WEIGHTS: Dict[int, float] = {0: 0.50, 1: 0.25, 2: 0.15, 3: 0.10}
+
+# Number of archetypes per request
+ARCHETYPE_COUNT_WEIGHTS: Dict[int, float] = {0: 0.40, 1: 0.45, 2: 0.15}
+
+# Endpoint mix
+ENDPOINT_WEIGHTS: Dict[str, float] = {
+    "assign_to_rings": 0.80,
+    "foods": 0.05,
+    "food": 0.15,
+}
+
+
+@dataclass
+class PlannedRequest:
+    """One request of the replayed mix."""
+    kind: str
+    method: str
+    path: str
+    body: Optional[dict] = None
+
+
+def _weighted(rng: random.Random, weights: Dict) -> object:
+    keys = list(weights)
+    return rng.choices(keys, weights=[weights[k] for k in keys])[0]
+
+
+def plan_requests(count: int, seed: int = 0) -> List[PlannedRequest]:
+    """Build a deterministic request sequence for the given seed."""
+    rng = random.Random(seed)
+    foods = list_all_foods()
+    archetypes = [arch.value for arch in Archetype]
+    plan = []
+
+    for _ in range(count):
+        kind = _weighted(rng, ENDPOINT_WEIGHTS)
+        if kind == "foods":
+            plan.append(PlannedRequest(kind, "GET", "/foods"))
+        elif kind == "food":
+            plan.append(PlannedRequest(kind, "GET", f"/foods/{rng.choice(foods)}"))
+        else:
+            body = {
+                dim: rng.choices(VALID_VALUES, weights=QUIZ_LEVEL_WEIGHTS[dim])[0]
+                for dim in DIMENSION_NAMES
+            }
+            body["dislikes"] = rng.sample(foods, _weighted(rng, DISLIKE_COUNT_WEIGHTS))
+            body["archetypes"] = rng.sample(archetypes, _weighted(rng, ARCHETYPE_COUNT_WEIGHTS))
+            plan.append(PlannedRequest(kind, "POST", "/assign_to_rings", body))
+
+    return plan
+
+
+# === HDR-style latency histogram ===
+
+class LatencyHistogram:
+    """
+    Log-linear histogram over integer microseconds (HdrHistogram layout).
+
+    Values below 2**SUB_BUCKET_BITS are recorded exactly; above that each
+    power-of-two range is split into 2**(SUB_BUCKET_BITS - 1) linear
+    sub-buckets, bounding relative error to ~1/2**(SUB_BUCKET_BITS - 1).
+    """
+    SUB_BUCKET_BITS = 8
+
+    def __init__(self):
+        self.counts: Dict[Tuple[int, int], int] = {}
+        self.total = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def record(self, seconds: float) -> None:
+        value = max(1, int(seconds * 1_000_000))
+        shift = max(0, value.bit_length() - self.SUB_BUCKET_BITS)
+        key = (shift, value >> shift)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.total += 1
+        self.max_us = max(self.max_us, value)
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.total += other.total
+        self.max_us = max(self.max_us, other.max_us)
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+
+    def value_at_percentile(self, percentile: float) -> float:
+        """Upper edge of the bucket holding the given percentile, in ms."""
+        if not self.total:
+            return 0.0
+        target = max(1, math.ceil(self.total * percentile / 100.0))
+        seen = 0
+        for (shift, sub) in sorted(self.counts, key=lambda k: k[1] << k[0]):
+            seen += self.counts[(shift, sub)]
+            if seen >= target:
+                upper = ((sub + 1) << shift) - 1
+                return min(upper, self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    def summary(self) -> dict:
+        return {
+            "count": self.total,
+            "min_ms": (self.min_us or 0) / 1000.0,
+            "p50_ms": self.value_at_percentile(50),
+            "p90_ms": self.value_at_percentile(90),
+            "p99_ms": self.value_at_percentile(99),
+            "p999_ms": self.value_at_percentile(99.9),
+            "max_ms": self.max_us / 1000.0,
+        }
+
+
+@dataclass
+class LoadResult:
+    """Aggregated outcome of a load run."""
+    elapsed: float = 0.0
+    completed: int = 0
+    errors: int = 0
+    dropped: int = 0
+    status_counts: Dict[int, int] = field(default_factory=dict)
+    overall: LatencyHistogram = field(default_factory=LatencyHistogram)
+    by_kind: Dict[str, LatencyHistogram] = field(default_factory=dict)
+
+    def record(self, kind: str, status: int, seconds: float) -> None:
+        self.completed += 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if status >= 400:
+            self.errors += 1
+        self.overall.record(seconds)
+        self.by_kind.setdefault(kind, LatencyHistogram()).record(seconds)
+
+    def to_dict(self) -> dict:
+        return {
+            "elapsed_s": round(self.elapsed, 4),
+            "completed": self.completed,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "throughput_rps": round(self.completed / self.elapsed, 2) if self.elapsed else 0.0,
+            "status_counts": {str(k): v for k, v in sorted(self.status_counts.items())},
+            "latency": self.overall.summary(),
+            "latency_by_endpoint": {k: h.summary() for k, h in sorted(self.by_kind.items())},
+        }
+
+
+# === Drivers ===
+
+def make_client(url: Optional[str], timeout: float = 30.0) -> httpx.AsyncClient:
+    """HTTP client for a live server, or an in-process ASGI client."""
+    if url:
+        limits = httpx.Limits(max_connections=1000, max_keepalive_connections=1000)
+        return httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits)
+    from backend.api import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadgen", timeout=timeout)
+
+
+async def _send(client: httpx.AsyncClient, req: PlannedRequest) -> int:
+    try:
+        response = await client.request(req.method, req.path, json=req.body)
+        return response.status_code
+    except httpx.HTTPError:
+        return 599
+
+
+async def run_closed_loop(
+    client: httpx.AsyncClient,
+    plan: List[PlannedRequest],
+    concurrency: int,
+) -> LoadResult:
+    """`concurrency` clients issue the planned requests back-to-back."""
+    result = LoadResult()
+    position = 0
+
+    async def worker():
+        nonlocal position
+        while position < len(plan):
+            req = plan[position]
+            position += 1
+            started = time.perf_counter()
+            status = await _send(client, req)
+            result.record(req.kind, status, time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def run_open_loop(
+    client: httpx.AsyncClient,
+    plan: List[PlannedRequest],
+    rate: float,
+    max_inflight: int = 10_000,
+) -> LoadResult:
+    """
+    Issue plan[i] at intended time i / rate. Latency counts from the
+    intended send time. Arrivals beyond `max_inflight` outstanding
+    requests are dropped (and counted) rather than queued client-side.
+    """
+    result = LoadResult()
+    inflight = set()
+
+    async def fire(req: PlannedRequest, intended: float):
+        status = await _send(client, req)
+        result.record(req.kind, status, time.perf_counter() - intended)
+
+    started = time.perf_counter()
+    for i, req in enumerate(plan):
+        intended = started + i / rate
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(inflight) >= max_inflight:
+            result.dropped += 1
+            continue
+        task = asyncio.create_task(fire(req, intended))
+        inflight.add(task)
+        task.add_done_callback(inflight.discard)
+
+    if inflight:
+        await asyncio.gather(*inflight)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def git_revision() -> Optional[str]:
+    """Current commit (with -dirty suffix), or None outside a git checkout."""
+    try:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        rev = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=root, capture_output=True, text=True, timeout=5,
+        )
+        return rev.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+async def run_load(
+    mode: str = "closed",
+    requests: int = 1000,
+    concurrency: int = 8,
+    rate: float = 200.0,
+    duration: Optional[float] = None,
+    seed: int = 0,
+    url: Optional[str] = None,
+    warmup: int = 50,
+) -> dict:
+    """Run a load test and return the JSON-serializable report."""
+    if mode == "open" and duration is not None:
+        requests = int(rate * duration)
+    plan = plan_requests(requests, seed)
+
+    async with make_client(url) as client:
+        if warmup:
+            await run_closed_loop(client, plan_requests(warmup, seed + 1), min(concurrency, warmup))
+        if mode == "closed":
+            result = await run_closed_loop(client, plan, concurrency)
+        elif mode == "open":
+            result = await run_open_loop(client, plan, rate)
+        else:
+            raise ValueError(f"Unknown mode '{mode}' (expected 'closed' or 'open')")
+
+    return {
+        "config": {
+            "mode": mode,
+            "requests": requests,
+            "concurrency": concurrency if mode == "closed" else None,
+            "rate_rps": rate if mode == "open" else None,
+            "seed": seed,
+            "target": url or "in-process",
+            "git_revision": git_revision(),
+        },
+        "results": result.to_dict(),
+    }
+
+
+def format_report(report: dict) -> str:
+    """Human-readable summary of a run_load() report."""
+    config, results = report["config"], report["results"]
+    lines = []
+    lines.append("=" * 80)
+    lines.append(f"LOAD TEST ({config['mode']}-loop, target={config['target']}, rev={config['git_revision']})")
+    lines.append("=" * 80)
+    lines.append(f"  Completed: {results['completed']}  Errors: {results['errors']}  Dropped: {results['dropped']}")
+    lines.append(f"  Elapsed: {results['elapsed_s']:.2f}s  Throughput: {results['throughput_rps']:.1f} req/s")
+    lines.append("")
+    lines.append(f"  {'endpoint':<18}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'p999':>10}{'max':>10}  (ms)")
+    rows = [("ALL", results["latency"])] + list(results["latency_by_endpoint"].items())
+    for name, s in rows:
+        lines.append(
+            f"  {name:<18}{s['count']:>8}{s['p50_ms']:>10.2f}{s['p90_ms']:>10.2f}"
+            f"{s['p99_ms']:>10.2f}{s['p999_ms']:>10.2f}{s['max_ms']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Food Personality API load generator")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--requests", type=int, default=1000, help="requests to send (closed loop / open loop without --duration)")
+    parser.add_argument("--concurrency", type=int, default=8, help="closed loop: concurrent clients")
+    parser.add_argument("--rate", type=float, default=200.0, help="open loop: arrivals per second")
+    parser.add_argument("--duration", type=float, default=None, help="open loop: seconds (overrides --requests)")
+    parser.add_argument("--seed", type=int, default=0, help="traffic mix seed (keep fixed to compare commits)")
+    parser.add_argument("--url", default=None, help="target server; omit to drive the app in-process")
+    parser.add_argument("--warmup", type=int, default=50, help="warmup requests excluded from results")
+    parser.add_argument("--json", dest="json_path", default=None, help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_load(
+        mode=args.mode,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration=args.duration,
+        seed=args.seed,
+        url=args.url,
+        warmup=args.warmup,
+    ))
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,8 +17,8 @@ from backend import (
     UserTasteVector,
     Archetype,
     assign_to_rings,
-    explain_ring_assignment,
-    explain_food_distance
+    write_ring_assignment,
+    write_food_distance
 )
 
 
@@ -40,8 +40,8 @@ if __name__ == "__main__":
         dislikes=set(),
         archetypes={Archetype.COMFORT_MAXIMALIST}
     )
-    print(explain_ring_assignment(assignment1))
-    print("\n")
+    write_ring_assignment(assignment1, sys.stdout)
+    print("\n\n")
     
     # Example 2: Adventurous Eater
     print("EXAMPLE 2: Adventurous Eater")
@@ -58,9 +58,9 @@ if __name__ == "__main__":
         dislikes={"Cheeseburger"},
         archetypes={Archetype.FLAVOR_EXPLORER, Archetype.HEAT_SEEKER}
     )
-    print(explain_ring_assignment(assignment2))
-    print("\n")
+    write_ring_assignment(assignment2, sys.stdout)
+    print("\n\n")
     
     # Detailed food explanation
     print("DETAILED FOOD EXPLANATION:")
-    print(explain_food_distance("Steak tartare", assignment2))
+    write_food_distance("Steak tartare", assignment2, sys.stdout)
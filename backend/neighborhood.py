@@ -0,0 +1,126 @@
+"""
+Neighborhood preview: ring changes for every one-step slider move.
+Episode: perf_2026
+
+Answers "if you moved spice up, these dishes would move in" for all ±1
+steps on all 5 dimensions in one pass, instead of up to 10 extra
+assign_to_rings calls.
+
+The adjusted distance is separable per dimension (see
+distance.dimension_penalty), so each food's penalty row and its prefix
+sums are computed once for the base profile. A neighbor that changes
+dimension d only looks up the new penalty for d and re-adds the
+remaining suffix terms in the original order, keeping distances
+bit-identical to assign_to_rings.
+"""
+
+import math
+from typing import List, Set
+
+from .approx_thresholds import error_field
+from .archetypes import Archetype
+from .catalog import LEVELS, get_catalog
+from .distance import catalog_penalty_rows, dimension_penalty_table
+from .food_data import DIMENSION_NAMES, VALID_VALUES
+from .ring_assignment import estimate_ring_thresholds
+from .taste_vector import UserTasteVector
+
+
+def _classify(distances: List[float], threshold_0: float, threshold_1: float) -> List[int]:
+    return [0 if d <= threshold_0 else 1 if d <= threshold_1 else 2 for d in distances]
+
+
+def neighborhood_preview(
+    user_vector: UserTasteVector,
+    dislikes: Set[str],
+    archetypes: Set[Archetype],
+    catalog=None,
+    threshold_error: float = 0.0
+) -> dict:
+    """
+    Base ring assignment summary plus, for each adjacent profile (one grid
+    step up or down on one dimension), the foods whose ring would change.
+    threshold_error is as in assign_to_rings(); every profile is assigned
+    over the same foods, so one bound covers them all.
+
+    Returns:
+        {
+          "base": {"ring_thresholds": [t0, t1], "ring_sizes": [n0, n1, n2]},
+          "neighbors": [
+            {"dimension", "step", "value", "ring_thresholds", "ring_sizes",
+             "changes": [{"food_name", "from_ring", "to_ring", "distance"}, ...]},
+            ...
+          ],
+          "threshold_error": {"quantile", "confidence"}  (approximate thresholds only)
+        }
+    """
+    user_vector.validate()
+    if catalog is None:
+        catalog = get_catalog()
+    archetype_key = frozenset(archetypes)
+    tables = dimension_penalty_table(archetype_key)
+    user_levels = tuple(LEVELS[v] for v in user_vector.to_tuple())
+    food_levels = catalog.table("food_levels")
+    disliked = [food_id in dislikes for food_id in catalog.food_ids]
+    dims = len(DIMENSION_NAMES)
+
+    # Shared per-food work: penalty rows and left-to-right prefix sums
+    rows = catalog_penalty_rows(user_levels, food_levels, disliked, archetype_key)
+    prefixes = []
+    for row in rows:
+        partial = [0]
+        for value in row:
+            partial.append(partial[-1] + value)
+        prefixes.append(partial)
+
+    base_distances = [math.sqrt(p[dims]) for p in prefixes]
+    (base_t0, base_t1), error_bound = estimate_ring_thresholds(base_distances, archetypes, threshold_error)
+    base_rings = _classify(base_distances, base_t0, base_t1)
+
+    neighbors = []
+    for d, dim_name in enumerate(DIMENSION_NAMES):
+        for step in (-1, 1):
+            level = user_levels[d] + step
+            if not 0 <= level < len(VALID_VALUES):
+                continue
+
+            distances = []
+            for row, prefix, levels, is_disliked in zip(rows, prefixes, food_levels, disliked):
+                total = prefix[d] + tables[is_disliked][d][level][levels[d]]
+                for k in range(d + 1, dims):
+                    total += row[k]
+                distances.append(math.sqrt(total))
+
+            (t0, t1), _ = estimate_ring_thresholds(distances, archetypes, threshold_error)
+            rings = _classify(distances, t0, t1)
+            changes = [
+                {
+                    "food_name": catalog.food_ids[i],
+                    "from_ring": base_rings[i],
+                    "to_ring": rings[i],
+                    "distance": distances[i],
+                }
+                for i in range(len(rings))
+                if rings[i] != base_rings[i]
+            ]
+            changes.sort(key=lambda c: (c["to_ring"], c["distance"], c["food_name"]))
+
+            neighbors.append({
+                "dimension": dim_name,
+                "step": step,
+                "value": VALID_VALUES[level],
+                "ring_thresholds": [t0, t1],
+                "ring_sizes": [rings.count(0), rings.count(1), rings.count(2)],
+                "changes": changes,
+            })
+
+    result = {
+        "base": {
+            "ring_thresholds": [base_t0, base_t1],
+            "ring_sizes": [base_rings.count(0), base_rings.count(1), base_rings.count(2)],
+        },
+        "neighbors": neighbors,
+    }
+    if error_bound:
+        result["threshold_error"] = error_field(error_bound)
+    return result
@@ -0,0 +1,224 @@
+"""
+Live-process diagnostics: sampling profiler and allocation tracking.
+Episode: perf_2026
+
+Backs the opt-in /debug endpoints in api.py. Nothing runs until an
+endpoint is called:
+- The sampling profiler starts a sampler thread for the requested
+  duration only, and a lock ensures a single profile at a time.
+- tracemalloc is only started on request and can be stopped again.
+
+Profiles are written in collapsed-stack format ("frame;frame;frame count"),
+ready for flamegraph.pl / speedscope / inferno.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+DEBUG_ENDPOINTS_ENABLED = os.environ.get("FOOD_API_DEBUG", "0").strip().lower() in ("1", "true", "on", "yes")
+ADMIN_TOKEN = os.environ.get("FOOD_API_ADMIN_TOKEN") or None
+PROFILE_DIR = os.environ.get("FOOD_API_PROFILE_DIR", tempfile.gettempdir())
+
+MAX_PROFILE_SECONDS = 60.0
+MIN_SAMPLE_INTERVAL = 0.001
+MAX_SNAPSHOT_LIMIT = 1000
+MAX_TRACEBACK_FRAMES = 65535
+
+# Leaf frames in these stdlib modules mean the thread is parked, not working
+_IDLE_MODULES = ("threading.py", "selectors.py", "queue.py", "base_events.py")
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+@dataclass
+class ProfileResult:
+    """Outcome of a sampling profile run."""
+    path: str
+    duration: float
+    interval: float
+    samples: int
+    stacks: Dict[str, int]
+
+    def top(self, n: int = 20) -> List[Tuple[str, int]]:
+        return Counter(self.stacks).most_common(n)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _collapse(frame, include_idle: bool = False) -> Optional[str]:
+    """Collapse a thread's stack root-first; None if the thread is idle."""
+    if not include_idle and os.path.basename(frame.f_code.co_filename) in _IDLE_MODULES:
+        return None
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+_profile_lock = threading.Lock()
+
+
+def run_sampling_profile(
+    seconds: float,
+    interval: float = 0.005,
+    include_idle: bool = False,
+    output_dir: str = PROFILE_DIR,
+) -> ProfileResult:
+    """
+    Sample every thread's stack for `seconds` and aggregate collapsed stacks.
+
+    Blocks the calling thread for the duration; sampling happens on a
+    dedicated thread so the caller's own frames don't dominate.
+
+    Raises:
+        ProfilerBusyError: if another profile is already running.
+        ValueError: on out-of-range duration/interval.
+    """
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        raise ValueError(f"seconds must be in (0, {MAX_PROFILE_SECONDS}]")
+    if not MIN_SAMPLE_INTERVAL <= interval <= seconds:
+        raise ValueError(f"interval must be in [{MIN_SAMPLE_INTERVAL}, seconds]")
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+
+    try:
+        stacks: Counter = Counter()
+        samples = 0
+        excluded = {threading.get_ident()}
+
+        def sampler():
+            nonlocal samples
+            excluded.add(threading.get_ident())
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id in excluded:
+                        continue
+                    collapsed = _collapse(frame, include_idle)
+                    if collapsed:
+                        stacks[collapsed] += 1
+                samples += 1
+                # Never sleep past the deadline: the profile lock is held until we return
+                time.sleep(max(0.0, min(interval, deadline - time.perf_counter())))
+
+        thread = threading.Thread(target=sampler, name="food-api-profiler", daemon=True)
+        thread.start()
+        thread.join()
+
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.collapsed")
+        with open(path, "w") as f:
+            for stack, count in sorted(stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+        return ProfileResult(path=path, duration=seconds, interval=interval, samples=samples, stacks=dict(stacks))
+    finally:
+        _profile_lock.release()
+
+
+# === Allocation tracking ===
+
+_memory_lock = threading.Lock()
+_last_snapshot: Optional[tracemalloc.Snapshot] = None
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+def start_allocation_tracking(frames: int = 25) -> dict:
+    """
+    Start tracemalloc (no-op if already tracing).
+
+    Raises:
+        ValueError: if frames is not in [1, MAX_TRACEBACK_FRAMES].
+    """
+    global _last_snapshot
+    if not 1 <= frames <= MAX_TRACEBACK_FRAMES:
+        raise ValueError(f"frames must be in [1, {MAX_TRACEBACK_FRAMES}]")
+    with _memory_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            _last_snapshot = None
+        return allocation_status()
+
+
+def stop_allocation_tracking() -> dict:
+    """Stop tracemalloc and drop the stored baseline snapshot."""
+    global _last_snapshot
+    with _memory_lock:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        _last_snapshot = None
+        return allocation_status()
+
+
+def allocation_status() -> dict:
+    tracing = tracemalloc.is_tracing()
+    current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+    return {
+        "tracing": tracing,
+        "traceback_frames": tracemalloc.get_traceback_limit() if tracing else 0,
+        "traced_current_bytes": current,
+        "traced_peak_bytes": peak,
+    }
+
+
+def _format_stat(stat) -> dict:
+    frame = stat.traceback[0]
+    return {
+        "location": f"{frame.filename}:{frame.lineno}",
+        "size_bytes": stat.size,
+        "count": stat.count,
+    }
+
+
+def _format_diff(stat) -> dict:
+    entry = _format_stat(stat)
+    entry["size_diff_bytes"] = stat.size_diff
+    entry["count_diff"] = stat.count_diff
+    return entry
+
+
+def take_allocation_snapshot(limit: int = 20, key_type: str = "lineno") -> dict:
+    """
+    Snapshot current allocations; report the top sites and the diff
+    against the previous snapshot (if any). The new snapshot becomes the
+    baseline for the next call.
+
+    Raises:
+        ValueError: if limit is not in [1, MAX_SNAPSHOT_LIMIT].
+        RuntimeError: if tracking has not been started.
+    """
+    global _last_snapshot
+    if not 1 <= limit <= MAX_SNAPSHOT_LIMIT:
+        raise ValueError(f"limit must be in [1, {MAX_SNAPSHOT_LIMIT}]")
+    with _memory_lock:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("Allocation tracking is not running; start it first")
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        result = allocation_status()
+        result["top"] = [_format_stat(s) for s in snapshot.statistics(key_type)[:limit]]
+        if _last_snapshot is not None:
+            diff = snapshot.compare_to(_last_snapshot, key_type)
+            result["diff"] = [_format_diff(s) for s in diff[:limit]]
+        else:
+            result["diff"] = None
+        _last_snapshot = snapshot
+        return result
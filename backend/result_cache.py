@@ -0,0 +1,89 @@
+"""
+In-process cache of formatted /assign_to_rings results.
+Episode: perf_2026
+
+Results depend only on the taste vector, dislikes, archetypes, the
+catalog and the food subset (a resolved filter bitmap, see filters.py),
+so they are keyed on a canonical form of those inputs. The
+catalog version is part of the key: refreshing the catalog implicitly
+invalidates every cached result.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Hashable, Iterable, Optional, Tuple
+
+from .archetypes import Archetype
+from .metrics import REGISTRY
+
+DEFAULT_CACHE_SIZE = int(os.environ.get("FOOD_API_RESULT_CACHE_SIZE", "8192"))
+
+CACHE_REQUESTS = REGISTRY.counter(
+    "food_api_result_cache_requests_total",
+    "Result cache lookups by tier and outcome.",
+    ("tier", "result"),
+)
+
+ResultKey = Tuple[Tuple[float, ...], Tuple[str, ...], Tuple[str, ...], str, Optional[int]]
+
+
+def result_key(
+    user_vec: Tuple[float, ...],
+    dislikes: Iterable[str],
+    archetypes: Iterable[Archetype],
+    catalog_version: str,
+    subset: Optional[int] = None,
+) -> ResultKey:
+    """
+    Canonical cache key: order-insensitive in dislikes and archetypes.
+    Filters that select the same foods share the same `subset` bitmap.
+    """
+    return (
+        tuple(user_vec),
+        tuple(sorted(set(dislikes))),
+        tuple(sorted({arch.value for arch in archetypes})),
+        catalog_version,
+        subset,
+    )
+
+
+class ResultCache:
+    """Thread-safe LRU cache."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, tier: str = "local"):
+        self.maxsize = maxsize
+        self.tier = tier
+        self._data: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[object]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+        CACHE_REQUESTS.inc(tier=self.tier, result="hit" if value is not None else "miss")
+        return value
+
+    def put(self, key: Hashable, value: object) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+RESULT_CACHE = ResultCache()
@@ -3,16 +3,28 @@ Ring assignment logic.
 Episode: cursor_foodapp
 """
 
-from typing import List, Set, Tuple
-from .taste_vector import UserTasteVector, FoodDistance, ComfortRingAssignment
+from typing import Iterable, Optional, Sequence, Set, Tuple
+from .taste_vector import UserTasteVector, ComfortRingAssignment
 from .archetypes import Archetype
-from .food_data import FOODS
-from .distance import compute_distance_with_archetypes
+from .approx_thresholds import THRESHOLD_CONFIDENCE, sample_rows, threshold_sample
+from .catalog import get_catalog
+from .distance import catalog_distances
+from .distance_table import DistanceTable, compute_distance_table, selection_indices
 from .explanations import determine_personality
+from .timing import stage
+
+# Base ring thresholds: percentiles of the distance distribution
+RING_0_PERCENTILE = 0.33
+RING_1_PERCENTILE = 0.66
+
+# Archetype threshold adjustments
+COMFORT_MAXIMALIST_THRESHOLD_FACTOR = 0.8  # compresses Ring 0
+FLAVOR_EXPLORER_THRESHOLD_FACTOR = 1.2  # expands Ring 1
+THRESHOLD_MIN_GAP = 0.01  # enforced gap when threshold_0 >= threshold_1
 
 
 def compute_ring_thresholds(
-    distances: List[float],
+    distances: Sequence[float],
     archetypes: Set[Archetype]
 ) -> Tuple[float, float]:
     """
@@ -32,24 +44,115 @@ def compute_ring_thresholds(
     n = len(sorted_distances)
     
     # Base thresholds: 33rd and 66th percentiles
-    idx_33 = int(n * 0.33)
-    idx_66 = int(n * 0.66)
+    idx_33, idx_66 = percentile_indices(n)
     
     threshold_0 = sorted_distances[idx_33] if idx_33 < n else sorted_distances[-1]
     threshold_1 = sorted_distances[idx_66] if idx_66 < n else sorted_distances[-1]
     
+    return adjust_thresholds(threshold_0, threshold_1, archetypes)
+
+
+def estimate_ring_thresholds(
+    distances: Sequence[float],
+    archetypes: Set[Archetype],
+    threshold_error: float = 0.0,
+    confidence: float = THRESHOLD_CONFIDENCE
+) -> Tuple[Tuple[float, float], float]:
+    """
+    compute_ring_thresholds(), or with threshold_error > 0 its estimate
+    from a stratified sample of the distances (see approx_thresholds).
+
+    Returns ((threshold_0, threshold_1), error bound): the bound is 0.0
+    when the thresholds are exact, including when there are too few
+    distances for sampling to pay off.
+    """
+    if threshold_error > 0:
+        sample = threshold_sample(distances, threshold_error, confidence)
+        if sample is not None:
+            return compute_ring_thresholds(sample, archetypes), threshold_error
+    return compute_ring_thresholds(distances, archetypes), 0.0
+
+
+def partitioned_distance_table(
+    user_vec: Tuple[float, ...],
+    dislikes: Set[str],
+    archetypes: Set[Archetype],
+    food_ids: Optional[Iterable[str]] = None,
+    catalog=None,
+    contributions: bool = True,
+    threshold_error: float = 0.0
+) -> Tuple[DistanceTable, Tuple[float, float], float]:
+    """
+    Distance table of the selection, partitioned into rings (ring_rows set).
+    Returns (table, (threshold_0, threshold_1), error bound).
+
+    Exact thresholds need every distance first: compute, select, then
+    partition. With threshold_error > 0 and a large enough selection, only
+    the sampled foods' distances are computed up front; the thresholds are
+    estimated from them and every food is then computed and classified in
+    a single pass.
+
+    Raises:
+        ValueError: If the selection is empty.
+        KeyError: If a food in `food_ids` is not in the catalog.
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    rows = None
+    if threshold_error > 0:
+        if food_ids is None:
+            indices = None  # the whole catalog: rows are catalog indices
+            rows = sample_rows(len(catalog), threshold_error)
+        else:
+            food_ids = tuple(food_ids)  # read twice: for the sample and for the table
+            indices = selection_indices(catalog, food_ids)
+            rows = sample_rows(len(indices), threshold_error)
+
+    if rows is None:
+        with stage("distances"):
+            table = compute_distance_table(user_vec, dislikes, archetypes, food_ids, catalog, contributions)
+        if not len(table):
+            raise ValueError("Cannot assign rings over an empty set of foods")
+        with stage("thresholds"):
+            thresholds = compute_ring_thresholds(table.distances, archetypes)
+        table.partition(*thresholds)
+        return table, thresholds, 0.0
+
+    with stage("thresholds"):
+        sample = catalog_distances(
+            user_vec, dislikes, archetypes, catalog, rows if indices is None else [indices[row] for row in rows]
+        )
+        thresholds = compute_ring_thresholds(sample, archetypes)
+    with stage("distances"):
+        table = compute_distance_table(
+            user_vec, dislikes, archetypes, food_ids, catalog, contributions, thresholds=thresholds
+        )
+    return table, thresholds, threshold_error
+
+
+def percentile_indices(n: int) -> Tuple[int, int]:
+    """Positions in the sorted distances of the base Ring 0 / Ring 1 thresholds."""
+    return int(n * RING_0_PERCENTILE), int(n * RING_1_PERCENTILE)
+
+
+def adjust_thresholds(
+    threshold_0: float,
+    threshold_1: float,
+    archetypes: Set[Archetype]
+) -> Tuple[float, float]:
+    """Apply archetype adjustments and monotonicity to base percentile thresholds."""
     # Archetype adjustments
     if Archetype.COMFORT_MAXIMALIST in archetypes:
         # Compress Ring 0 (make it smaller, stricter)
-        threshold_0 *= 0.8
+        threshold_0 *= COMFORT_MAXIMALIST_THRESHOLD_FACTOR
     
     if Archetype.FLAVOR_EXPLORER in archetypes:
         # Expand Ring 1 (make it larger)
-        threshold_1 *= 1.2
+        threshold_1 *= FLAVOR_EXPLORER_THRESHOLD_FACTOR
     
     # Ensure monotonicity: threshold_0 < threshold_1
     if threshold_0 >= threshold_1:
-        threshold_1 = threshold_0 + 0.01
+        threshold_1 = threshold_0 + THRESHOLD_MIN_GAP
     
     return (threshold_0, threshold_1)
 
@@ -57,10 +160,24 @@ def compute_ring_thresholds(
 def assign_to_rings(
     user_vector: UserTasteVector,
     dislikes: Set[str],
-    archetypes: Set[Archetype]
+    archetypes: Set[Archetype],
+    food_ids: Optional[Iterable[str]] = None,
+    contributions: bool = True,
+    catalog=None,
+    threshold_error: float = 0.0
 ) -> ComfortRingAssignment:
     """
-    Main function: assign all foods to rings.
+    Main function: assign all foods (or the `food_ids` subset) to rings,
+    on `catalog` (default: the installed catalog).
+
+    Per-food dimension_contributions dicts are only built for foods whose
+    contributions are read; contributions=False also skips the penalty
+    matrix (see distance_table).
+
+    With threshold_error > 0, large selections get thresholds estimated
+    within that quantile rank error from a sample, and foods are classified
+    in one pass (partitioned_distance_table); the bound applied is recorded
+    in the assignment's threshold_error.
     
     Process:
     1. Validate user vector
@@ -68,52 +185,25 @@ def assign_to_rings(
     3. Determine ring thresholds
     4. Assign foods to rings (ensuring partition completeness I3)
     5. Determine personality
+    (with approximate thresholds: 3, then 2 and 4 in one pass)
     """
     user_vector.validate()
-    user_vec = user_vector.to_tuple()
-    
-    # Compute distances
-    food_distances = []
-    all_distances = []
-    
-    for food_name, food_vec in FOODS.items():
-        distance, dim_contrib = compute_distance_with_archetypes(
-            user_vec, food_vec, food_name, dislikes, archetypes
-        )
-        food_distances.append(FoodDistance(
-            food_name=food_name,
-            distance=distance,
-            ring=-1,  # assigned later
-            dimension_contributions=dim_contrib
-        ))
-        all_distances.append(distance)
     
-    # Compute ring thresholds
-    threshold_0, threshold_1 = compute_ring_thresholds(all_distances, archetypes)
-    
-    # Assign rings (I2: ring ordering, I3: partition completeness)
-    ring_0 = []
-    ring_1 = []
-    ring_2 = []
-    
-    for fd in food_distances:
-        if fd.distance <= threshold_0:
-            fd.ring = 0
-            ring_0.append(fd)
-        elif fd.distance <= threshold_1:
-            fd.ring = 1
-            ring_1.append(fd)
-        else:
-            fd.ring = 2
-            ring_2.append(fd)
+    # Distances, thresholds and ring partition
+    table, (threshold_0, threshold_1), error_bound = partitioned_distance_table(
+        user_vector.to_tuple(), dislikes, archetypes, food_ids, catalog, contributions, threshold_error
+    )
+    rows = table.ring_rows
     
     # Sort within rings by distance (monotonicity I2)
-    ring_0.sort()
-    ring_1.sort()
-    ring_2.sort()
+    with stage("sort"):
+        for ring_rows in rows:
+            table.sort_rows(ring_rows)
+    ring_0, ring_1, ring_2 = (table.views(ring_rows) for ring_rows in rows)
     
     # Determine personality
-    personality = determine_personality(user_vector, archetypes, ring_0, ring_1, ring_2)
+    with stage("personality"):
+        personality = determine_personality(user_vector, archetypes, ring_0, ring_1, ring_2)
     
     return ComfortRingAssignment(
         user_vector=user_vector,
@@ -123,5 +213,6 @@ def assign_to_rings(
         ring_1=ring_1,
         ring_2=ring_2,
         personality=personality,
-        ring_thresholds=(threshold_0, threshold_1)
+        ring_thresholds=(threshold_0, threshold_1),
+        threshold_error=error_bound
     )
@@ -0,0 +1,116 @@
+"""
+Full-text food search over a prebuilt inverted index.
+Episode: perf_2026
+
+The index (catalog table "search_index", built once per catalog version and
+shipped in the snapshot) covers the display_name, description, origin and
+region columns:
+- terms: sorted unique word tokens, so every term starting with a prefix
+  is one contiguous bisect range (typeahead)
+- per term, parallel compact arrays of catalog indices and weights
+
+A term's weight in a food is the sum of FIELD_WEIGHTS over the fields it
+appears in, times its idf. A query matches foods containing every query
+token. The last token also matches as a prefix, unless `prefix=False`.
+Prefix-only matches count PREFIX_MATCH_FACTOR of an exact match. Results
+are ranked by score, then by catalog order.
+"""
+
+import bisect
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from .catalog import get_catalog, register_table
+from .filters import tokenize
+
+FIELD_WEIGHTS = {
+    "display_name": 3.0,
+    "origin": 1.5,
+    "region": 1.0,
+    "description": 0.5,
+}
+PREFIX_MATCH_FACTOR = 0.5
+MAX_SEARCH_LIMIT = 50
+
+
+@dataclass
+class SearchIndex:
+    terms: Tuple[str, ...]
+    docs: Tuple[array, ...]  # per term: catalog indices ('I')
+    weights: Tuple[array, ...]  # per term: idf-scaled field weights ('d')
+
+    def term_range(self, prefix: str) -> Tuple[int, int]:
+        """[start, end) of the terms starting with `prefix`."""
+        start = bisect.bisect_left(self.terms, prefix)
+        end = bisect.bisect_left(self.terms, prefix + "\uffff", start)
+        return start, end
+
+
+def build_search_index(catalog) -> SearchIndex:
+    raw: Dict[str, Dict[int, float]] = {}
+    for field_name, weight in FIELD_WEIGHTS.items():
+        for i, text in enumerate(catalog.columns[field_name]):
+            for token in set(tokenize(text)):
+                entry = raw.setdefault(token, {})
+                entry[i] = entry.get(i, 0.0) + weight
+
+    n = len(catalog)
+    terms = tuple(sorted(raw))
+    docs, weights = [], []
+    for term in terms:
+        entry = raw[term]
+        idf = math.log(1 + n / len(entry))
+        indices = sorted(entry)
+        docs.append(array("I", indices))
+        weights.append(array("d", (entry[i] * idf for i in indices)))
+    return SearchIndex(terms=terms, docs=tuple(docs), weights=tuple(weights))
+
+
+register_table("search_index", build_search_index)
+
+
+def search_foods(query: str, limit: int = 10, prefix: bool = True, catalog=None) -> List[dict]:
+    """
+    Ranked foods matching `query`, as {"food_id", "display_name", "score"}.
+
+    Raises:
+        ValueError: If limit is outside [1, MAX_SEARCH_LIMIT].
+    """
+    if not 1 <= limit <= MAX_SEARCH_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_SEARCH_LIMIT}")
+    if catalog is None:
+        catalog = get_catalog()
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+    index: SearchIndex = catalog.table("search_index")
+
+    scores = None
+    for position, token in enumerate(tokens):
+        matches: Dict[int, float] = {}
+        start, end = index.term_range(token)
+        if not (prefix and position == len(tokens) - 1):
+            end = start + 1 if start < end and index.terms[start] == token else start
+        for t in range(start, end):
+            exact = index.terms[t] == token
+            factor = 1.0 if exact else PREFIX_MATCH_FACTOR
+            for doc, weight in zip(index.docs[t], index.weights[t]):
+                score = weight * factor
+                if score > matches.get(doc, 0.0):
+                    matches[doc] = score
+
+        if scores is None:
+            scores = matches
+        else:
+            scores = {doc: total + matches[doc] for doc, total in scores.items() if doc in matches}
+        if not scores:
+            return []
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    display_names = catalog.columns["display_name"]
+    return [
+        {"food_id": catalog.food_ids[doc], "display_name": display_names[doc], "score": round(score, 6)}
+        for doc, score in ranked
+    ]
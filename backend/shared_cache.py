@@ -0,0 +1,266 @@
+"""
+Shared result cache tier, visible to every uvicorn worker on a host.
+Episode: perf_2026
+
+Each worker keeps its in-process LRU (result_cache.RESULT_CACHE). A
+shared tier sits behind it, so a result computed (or warmed) by one worker
+is a cheap read for the others:
+
+    local LRU  →  shared tier  →  compute
+
+Backends, selected with FOOD_API_SHARED_CACHE:
+- "sqlite:///path/to/cache.db": a SQLite file in WAL mode on local disk.
+  Size-bounded (FOOD_API_SHARED_CACHE_SIZE entries), oldest-written
+  entries evicted in batches. Reads never write, so hits from every
+  worker proceed concurrently instead of queueing on SQLite's single
+  writer lock; the local LRU in front already keeps hot entries close.
+- "redis://host:port/db": any server speaking the Redis protocol (RESP),
+  via the minimal client below; entries expire after
+  FOOD_API_SHARED_CACHE_TTL seconds and the server's maxmemory policy
+  bounds size.
+- unset / "off": no shared tier.
+
+Keys are the SHA-256 of the canonical result_key (profile, dislikes,
+archetypes, catalog hash, filter subset); values are zlib-compressed JSON.
+Hits and misses are counted per tier in
+food_api_result_cache_requests_total. A failing shared tier is counted in
+food_api_shared_cache_errors_total and treated as a miss: it never fails
+a request.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Hashable, List, Optional
+from urllib.parse import urlparse
+
+from .metrics import REGISTRY
+from .result_cache import CACHE_REQUESTS, RESULT_CACHE, ResultCache
+
+SHARED_CACHE_URL = os.environ.get("FOOD_API_SHARED_CACHE", "")
+SHARED_CACHE_SIZE = int(os.environ.get("FOOD_API_SHARED_CACHE_SIZE", "100000"))
+SHARED_CACHE_TTL = int(os.environ.get("FOOD_API_SHARED_CACHE_TTL", "3600"))
+
+# Fraction of the SQLite tier evicted at once when it is full
+EVICT_FRACTION = 0.1
+
+SHARED_CACHE_ERRORS = REGISTRY.counter(
+    "food_api_shared_cache_errors_total",
+    "Shared cache operations that failed and were treated as misses.",
+    ("tier",),
+)
+
+
+def shared_key(key: Hashable) -> bytes:
+    """Fixed-size digest of a canonical result key."""
+    encoded = json.dumps(list(key), separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).digest()
+
+
+def encode_value(response: dict) -> bytes:
+    return zlib.compress(json.dumps(response, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), 6)
+
+
+def decode_value(data: bytes) -> dict:
+    return json.loads(zlib.decompress(data))
+
+
+class SQLiteCache:
+    """Size-bounded key/value store in a SQLite WAL file (one connection per thread)."""
+
+    tier = "sqlite"
+
+    def __init__(self, path: str, maxsize: int = SHARED_CACHE_SIZE):
+        self.path = path
+        self.maxsize = maxsize
+        self._local = threading.local()
+        self._puts = 0
+        with self._connect() as conn:
+            # `accessed` holds the write time; eviction goes by rowid, which
+            # INSERT OR REPLACE renews, so it runs in insertion order
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key BLOB PRIMARY KEY, value BLOB NOT NULL, accessed REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        conn = self._connect()
+        row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, key: bytes, value: bytes) -> None:
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO results (key, value, accessed) VALUES (?, ?, ?)",
+            (key, value, time.time()),
+        )
+        self._puts += 1
+        # Counting rows on every put would dominate; check periodically
+        if self._puts % 64 == 0 or self.maxsize < 64:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop the oldest-written entries once the table exceeds maxsize."""
+        conn = self._connect()
+        (count,) = conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        if count <= self.maxsize:
+            return
+        excess = count - self.maxsize + int(self.maxsize * EVICT_FRACTION)
+        conn.execute(
+            "DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY rowid LIMIT ?)",
+            (excess,),
+        )
+
+    def __len__(self) -> int:
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM results").fetchone()
+        return count
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM results")
+
+
+class RespError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+class RedisCache:
+    """Minimal Redis-protocol (RESP2) client: GET and SET with expiry."""
+
+    tier = "redis"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, db: int = 0,
+                 ttl: int = SHARED_CACHE_TTL, timeout: float = 0.5):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.ttl = ttl
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            conn = (sock, sock.makefile("rb"))
+            self._local.conn = conn
+            if self.db:
+                self._command(b"SELECT", str(self.db).encode())
+        return conn
+
+    def _close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            conn[1].close()
+            conn[0].close()
+
+    def _command(self, *args: bytes):
+        sock, reader = self._connection()
+        parts: List[bytes] = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        try:
+            sock.sendall(b"".join(parts))
+            return self._read_reply(reader)
+        except (OSError, ValueError):
+            self._close()  # the stream may be out of sync: reconnect next time
+            raise
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload
+        if kind == b"-":
+            raise RespError(payload.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            size = int(payload)
+            if size < 0:
+                return None
+            data = reader.read(size + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            return None if count < 0 else [self._read_reply(reader) for _ in range(count)]
+        raise ValueError(f"Unexpected RESP reply: {line!r}")
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self._command(b"GET", key)
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self._command(b"SET", key, value, b"EX", str(self.ttl).encode())
+
+    def clear(self) -> None:
+        self._command(b"FLUSHDB")
+
+
+def open_shared_cache(url: str = SHARED_CACHE_URL):
+    """Shared backend for a FOOD_API_SHARED_CACHE URL, or None when disabled."""
+    if not url or url == "off":
+        return None
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        return SQLiteCache(parsed.path)
+    if parsed.scheme == "redis":
+        db = int(parsed.path.lstrip("/") or 0)
+        return RedisCache(parsed.hostname or "127.0.0.1", parsed.port or 6379, db)
+    raise ValueError(f"Unsupported FOOD_API_SHARED_CACHE scheme: '{parsed.scheme}' (use sqlite:// or redis://)")
+
+
+class TieredResultCache:
+    """
+    The local LRU in front of an optional shared tier, with ResultCache's
+    get/put interface. Shared hits are promoted to the local tier.
+    """
+
+    def __init__(self, local: ResultCache, shared=None):
+        self.local = local
+        self.shared = shared
+
+    def get(self, key: Hashable) -> Optional[dict]:
+        value = self.local.get(key)
+        if value is not None or self.shared is None:
+            return value
+        tier = self.shared.tier
+        try:
+            data = self.shared.get(shared_key(key))
+            # A corrupt or foreign entry is a failure of the tier, not of the request
+            value = None if data is None else decode_value(data)
+        except Exception:
+            SHARED_CACHE_ERRORS.inc(tier=tier)
+            return None
+        CACHE_REQUESTS.inc(tier=tier, result="hit" if value is not None else "miss")
+        if value is None:
+            return None
+        self.local.put(key, value)
+        return value
+
+    def put(self, key: Hashable, value: dict) -> None:
+        self.local.put(key, value)
+        if self.shared is None:
+            return
+        try:
+            self.shared.put(shared_key(key), encode_value(value))
+        except Exception:
+            SHARED_CACHE_ERRORS.inc(tier=self.shared.tier)
+
+
+RESULT_STORE = TieredResultCache(RESULT_CACHE, open_shared_cache())
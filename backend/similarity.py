@@ -0,0 +1,204 @@
+"""
+Precomputed food-to-food similarity ("you might also like").
+Episode: perf_2026
+
+Similarity is the euclidean_distance between two foods' taste vectors;
+a food's similar dishes are the other foods ordered by (distance,
+food_id). The structure is built once per catalog (at startup, or shipped
+in the snapshot) so a lookup is a slice instead of an O(N) scan:
+
+- "exact" (catalogs up to EXACT_SIMILARITY_MAX_FOODS): each food stores
+  its SIMILAR_MAX_K nearest neighbors.
+- "grouped" (larger catalogs): foods are grouped by taste-grid cell, since
+  every food in a cell shares one vector. Each occupied cell stores the
+  other occupied cells ordered by distance, so memory is bounded by the
+  243 cells rather than N^2.
+
+Both modes return identical results. When FOOD_REGISTRY changes,
+refresh_catalog() updates the index incrementally (see update_similarity)
+instead of rebuilding it.
+"""
+
+import bisect
+import copy
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .catalog import register_table, vector_code
+from .distance import euclidean_distance
+
+EXACT_SIMILARITY_MAX_FOODS = 2000
+SIMILAR_MAX_K = 50
+
+Neighbor = Tuple[str, float]
+
+
+def _order(neighbor: Neighbor) -> Tuple[float, str]:
+    return neighbor[1], neighbor[0]
+
+
+@dataclass
+class SimilarityIndex:
+    """Food-to-food nearest neighbors, in "exact" or "grouped" mode."""
+    mode: str
+    vectors: Dict[str, Tuple[float, ...]] = field(default_factory=dict)
+    # exact: food_id -> up to SIMILAR_MAX_K nearest (food_id, distance)
+    neighbors: Dict[str, Tuple[Neighbor, ...]] = field(default_factory=dict)
+    # grouped: cell code -> sorted member food_ids
+    members: Dict[int, Tuple[str, ...]] = field(default_factory=dict)
+    # grouped: cell code -> other occupied cells as (distance, code), nearest first
+    cell_order: Dict[int, Tuple[Tuple[float, int], ...]] = field(default_factory=dict)
+
+    def __contains__(self, food_id: str) -> bool:
+        return food_id in self.vectors
+
+    def similar(self, food_id: str, k: int) -> List[Neighbor]:
+        """
+        The k foods most similar to `food_id`, as (food_id, distance).
+
+        Raises:
+            KeyError: If the food is not indexed.
+            ValueError: If k is outside [0, SIMILAR_MAX_K].
+        """
+        if food_id not in self.vectors:
+            raise KeyError(f"Food '{food_id}' not found in registry")
+        if not 0 <= k <= SIMILAR_MAX_K:
+            raise ValueError(f"k must be between 0 and {SIMILAR_MAX_K}")
+        if self.mode == "exact":
+            return list(self.neighbors[food_id][:k])
+
+        code = vector_code(self.vectors[food_id])
+        found = [(other, 0.0) for other in self.members[code] if other != food_id]
+        cutoff = 0.0 if len(found) >= k else None
+        for distance, other_code in self.cell_order[code]:
+            if cutoff is not None and distance > cutoff:
+                break
+            found.extend((other, distance) for other in self.members[other_code])
+            if cutoff is None and len(found) >= k:
+                cutoff = distance  # finish cells tied at this distance
+        found.sort(key=_order)
+        return found[:k]
+
+    # -- incremental maintenance (mutates in place; see update_similarity) --
+
+    def add(self, food_id: str, vector: Tuple[float, ...]) -> None:
+        if food_id in self.vectors:
+            self.remove(food_id)
+        self.vectors[food_id] = vector
+        if self.mode == "exact":
+            self._add_exact(food_id, vector)
+        else:
+            self._add_grouped(food_id, vector)
+
+    def remove(self, food_id: str) -> None:
+        vector = self.vectors.pop(food_id)
+        if self.mode == "exact":
+            self._remove_exact(food_id)
+        else:
+            self._remove_grouped(food_id, vector)
+
+    def _scan(self, food_id: str) -> Tuple[Neighbor, ...]:
+        vector = self.vectors[food_id]
+        candidates = [
+            (other, euclidean_distance(vector, other_vector))
+            for other, other_vector in self.vectors.items()
+            if other != food_id
+        ]
+        candidates.sort(key=_order)
+        return tuple(candidates[:SIMILAR_MAX_K])
+
+    def _add_exact(self, food_id: str, vector: Tuple[float, ...]) -> None:
+        for other, current in self.neighbors.items():
+            entry = (food_id, euclidean_distance(self.vectors[other], vector))
+            if len(current) < SIMILAR_MAX_K or _order(entry) < _order(current[-1]):
+                updated = list(current)
+                bisect.insort(updated, entry, key=_order)
+                self.neighbors[other] = tuple(updated[:SIMILAR_MAX_K])
+        self.neighbors[food_id] = self._scan(food_id)
+
+    def _remove_exact(self, food_id: str) -> None:
+        del self.neighbors[food_id]
+        for other, current in self.neighbors.items():
+            if any(name == food_id for name, _ in current):
+                if len(current) == SIMILAR_MAX_K:
+                    # A truncated list needs its next-nearest food back
+                    self.neighbors[other] = self._scan(other)
+                else:
+                    self.neighbors[other] = tuple(n for n in current if n[0] != food_id)
+
+    def _add_grouped(self, food_id: str, vector: Tuple[float, ...]) -> None:
+        code = vector_code(vector)
+        if code in self.members:
+            self.members[code] = tuple(sorted(self.members[code] + (food_id,)))
+            return
+        order = []
+        for other_code, other_members in self.members.items():
+            distance = euclidean_distance(self.vectors[other_members[0]], vector)
+            order.append((distance, other_code))
+            updated = list(self.cell_order[other_code])
+            bisect.insort(updated, (distance, code))
+            self.cell_order[other_code] = tuple(updated)
+        self.members[code] = (food_id,)
+        self.cell_order[code] = tuple(sorted(order))
+
+    def _remove_grouped(self, food_id: str, vector: Tuple[float, ...]) -> None:
+        code = vector_code(vector)
+        remaining = tuple(name for name in self.members[code] if name != food_id)
+        if remaining:
+            self.members[code] = remaining
+            return
+        del self.members[code]
+        del self.cell_order[code]
+        for other_code, order in self.cell_order.items():
+            self.cell_order[other_code] = tuple(entry for entry in order if entry[1] != code)
+
+
+def build_similarity(catalog, mode: Optional[str] = None) -> SimilarityIndex:
+    """Similarity index for a catalog; exact mode for small catalogs unless `mode` is given."""
+    if mode is None:
+        mode = "exact" if len(catalog) <= EXACT_SIMILARITY_MAX_FOODS else "grouped"
+    elif mode not in ("exact", "grouped"):
+        raise ValueError("mode must be 'exact' or 'grouped'")
+    index = SimilarityIndex(mode=mode, vectors=dict(zip(catalog.food_ids, catalog.vectors)))
+
+    if mode == "exact":
+        for food_id in catalog.food_ids:
+            index.neighbors[food_id] = index._scan(food_id)
+        return index
+
+    for code, indices in catalog.cells.items():
+        index.members[code] = tuple(sorted(catalog.food_ids[i] for i in indices))
+    for code in index.members:
+        vector = index.vectors[index.members[code][0]]
+        index.cell_order[code] = tuple(sorted(
+            (euclidean_distance(vector, index.vectors[other_members[0]]), other_code)
+            for other_code, other_members in index.members.items()
+            if other_code != code
+        ))
+    return index
+
+
+def update_similarity(index: SimilarityIndex, old_catalog, new_catalog) -> SimilarityIndex:
+    """
+    Index for `new_catalog` derived from the one for `old_catalog`, touching
+    only added, removed and re-profiled foods. The old index is left intact
+    for requests still holding the previous catalog.
+    """
+    old = dict(zip(old_catalog.food_ids, old_catalog.vectors))
+    new = dict(zip(new_catalog.food_ids, new_catalog.vectors))
+    changed = [food_id for food_id, vector in new.items() if old.get(food_id) != vector]
+    removed = [food_id for food_id in old if food_id not in new]
+
+    updated = copy.copy(index)
+    updated.vectors = dict(index.vectors)
+    updated.neighbors = dict(index.neighbors)
+    updated.members = dict(index.members)
+    updated.cell_order = dict(index.cell_order)
+    for food_id in removed:
+        updated.remove(food_id)
+    for food_id in changed:
+        updated.add(food_id, new[food_id])
+    return updated
+
+
+register_table("food_similarity", build_similarity, update_similarity)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Precompiled startup snapshot.
+Episode: perf_2026
+
+A build-time artifact holding the validated catalog, its derived indexes
+and every registered precomputed table. On startup the API loads it
+directly; if its content hash matches the live FOOD_REGISTRY and it was
+built by the same code, the catalog is installed as-is and
+validate_food_registry() is skipped.
+
+The pickled tables (rendered HTTP bodies, the bundle, similarity
+indexes, ...) depend on the code that built them as much as on the
+data, so the snapshot also records code_fingerprint(): a hash of the
+backend package sources. Any deploy that changes them invalidates it.
+
+Build:
+    python backend/snapshot.py [--out PATH]
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import hashlib
+import pickle
+from typing import Optional
+
+from backend.catalog import Catalog, build_catalog, catalog_hash
+from backend.food_registry import FOOD_REGISTRY, validate_food_registry
+
+SNAPSHOT_FORMAT = 2
+DEFAULT_SNAPSHOT_PATH = os.environ.get(
+    "FOOD_API_SNAPSHOT",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.snapshot"),
+)
+
+
+def code_fingerprint(package_dir: str = os.path.dirname(os.path.abspath(__file__))) -> str:
+    """Hash of the package's Python sources (file names and contents)."""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith(".py"):
+            digest.update(name.encode("utf-8") + b"\0")
+            with open(os.path.join(package_dir, name), "rb") as f:
+                digest.update(f.read())
+            digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def build_snapshot(path: str = DEFAULT_SNAPSHOT_PATH) -> Catalog:
+    """
+    Validate the registry, compile the catalog with all registered tables
+    and write it to `path`.
+
+    Raises:
+        ValueError: If the registry fails validation.
+    """
+    validate_food_registry()
+    catalog = build_catalog(validated=True)
+    catalog.build_tables()
+
+    payload = {
+        "format": SNAPSHOT_FORMAT,
+        "source_hash": catalog.version,
+        "code": code_fingerprint(),
+        "catalog": catalog,
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return catalog
+
+
+def load_snapshot(
+    path: str = DEFAULT_SNAPSHOT_PATH,
+    expected_hash: Optional[str] = None,
+    expected_code: Optional[str] = None
+) -> Optional[Catalog]:
+    """
+    Load a snapshot if it exists and is current.
+
+    Returns None (caller falls back to validate + compile) when the file is
+    missing, unreadable, of another format, built from different catalog
+    content than `expected_hash` (defaults to the live FOOD_REGISTRY hash)
+    or by different code than `expected_code` (defaults to
+    code_fingerprint()).
+    """
+    try:
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+    if not isinstance(payload, dict) or payload.get("format") != SNAPSHOT_FORMAT:
+        return None
+    if expected_hash is None:
+        expected_hash = catalog_hash(FOOD_REGISTRY)
+    if payload.get("source_hash") != expected_hash:
+        return None
+    if expected_code is None:
+        expected_code = code_fingerprint()
+    if payload.get("code") != expected_code:
+        return None
+
+    catalog = payload["catalog"]
+    if not isinstance(catalog, Catalog) or catalog.version != expected_hash or not catalog.validated:
+        return None
+    return catalog
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the catalog startup snapshot")
+    parser.add_argument("--out", default=DEFAULT_SNAPSHOT_PATH, help="snapshot path")
+    args = parser.parse_args(argv)
+
+    # Import the API so every module registers its precomputed tables
+    import backend.api  # noqa: F401
+
+    catalog = build_snapshot(args.out)
+    print(f"✅ Snapshot written to {args.out}")
+    print(f"   catalog version {catalog.version}: {len(catalog)} foods, tables: {sorted(catalog.tables) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Spatial index over the discrete 3^5 taste grid.
+Episode: perf_2026
+
+Every food vector lies on one of 243 grid cells, so foods are indexed by
+cell (catalog.cells) instead of being scanned one by one. A query:
+1. computes one distance per occupied cell (5 table lookups, see
+   distance.dimension_penalty_table)
+2. visits cells in increasing order of that distance
+3. stops as soon as the next cell cannot contain an answer
+
+The cell distance is exact for every food in the cell that is not
+disliked, and a lower bound for disliked ones (the dislike penalty only
+ever increases a dimension's term), so pruning never drops an answer.
+
+Two metrics are supported:
+- "euclidean": distance.euclidean_distance
+- "archetype": distance.compute_distance_with_archetypes (asymmetric
+  tolerances, dislikes and archetype adjustments)
+Distances are bit-identical to those functions.
+"""
+
+import heapq
+import math
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .archetypes import Archetype
+from .catalog import LEVELS, get_catalog, register_table
+from .distance import PenaltyTable, dimension_penalty_table
+from .food_data import DIMENSION_NAMES, VALID_VALUES
+
+METRICS = ("euclidean", "archetype")
+
+Neighbor = Tuple[str, float]
+
+
+def _grid_cells(catalog) -> Tuple[Tuple[Tuple[int, ...], Tuple[int, ...]], ...]:
+    """(cell levels, catalog indices) for every occupied grid cell."""
+    food_levels = catalog.table("food_levels")
+    return tuple(
+        (food_levels[indices[0]], indices)
+        for _, indices in sorted(catalog.cells.items())
+    )
+
+
+register_table("grid_cells", _grid_cells)
+
+
+@lru_cache(maxsize=None)
+def euclidean_penalty_table() -> PenaltyTable:
+    """Squared per-dimension differences, indexed [dim][user_level][food_level]."""
+    return tuple(
+        tuple(tuple((u - f) ** 2 for f in VALID_VALUES) for u in VALID_VALUES)
+        for _ in DIMENSION_NAMES
+    )
+
+
+def metric_tables(metric: str, archetypes: FrozenSet[Archetype]) -> Tuple[PenaltyTable, PenaltyTable]:
+    """(not_disliked, disliked) penalty tables for a metric."""
+    if metric == "euclidean":
+        table = euclidean_penalty_table()
+        return table, table
+    if metric == "archetype":
+        return dimension_penalty_table(archetypes)
+    raise ValueError(f"metric must be one of {list(METRICS)}")
+
+
+def _distance(table: PenaltyTable, user_levels: Tuple[int, ...], levels: Tuple[int, ...]) -> float:
+    return math.sqrt(
+        table[0][user_levels[0]][levels[0]]
+        + table[1][user_levels[1]][levels[1]]
+        + table[2][user_levels[2]][levels[2]]
+        + table[3][user_levels[3]][levels[3]]
+        + table[4][user_levels[4]][levels[4]]
+    )
+
+
+def _cells_by_bound(
+    vector: Tuple[float, ...],
+    metric: str,
+    dislikes: Set[str],
+    archetypes: Set[Archetype],
+    catalog,
+) -> Iterator[Tuple[float, Tuple[Tuple[str, float], ...]]]:
+    """
+    Yield (lower bound, ((food_id, distance), ...)) per occupied cell in
+    increasing bound order. Member distances are only computed for cells
+    that are actually visited.
+    """
+    try:
+        user_levels = tuple(LEVELS[v] for v in vector)
+    except KeyError:
+        raise ValueError(f"Vector values must be one of {VALID_VALUES}")
+    if len(user_levels) != len(DIMENSION_NAMES):
+        raise ValueError(f"Vector must have {len(DIMENSION_NAMES)} dimensions")
+
+    clean, disliked = metric_tables(metric, frozenset(archetypes))
+    bounds = [
+        (_distance(clean, user_levels, levels), n, levels, indices)
+        for n, (levels, indices) in enumerate(catalog.table("grid_cells"))
+    ]
+    heapq.heapify(bounds)
+
+    food_ids = catalog.food_ids
+    while bounds:
+        bound, _, levels, indices = heapq.heappop(bounds)
+        members = []
+        disliked_distance = None
+        for i in indices:
+            food_id = food_ids[i]
+            if food_id in dislikes:
+                if disliked_distance is None:
+                    disliked_distance = _distance(disliked, user_levels, levels)
+                members.append((food_id, disliked_distance))
+            else:
+                members.append((food_id, bound))
+        yield bound, tuple(members)
+
+
+def foods_within(
+    vector: Tuple[float, ...],
+    radius: float,
+    metric: str = "euclidean",
+    dislikes: Optional[Set[str]] = None,
+    archetypes: Optional[Set[Archetype]] = None,
+    exclude: Iterable[str] = (),
+    catalog=None,
+) -> List[Neighbor]:
+    """
+    All foods within `radius` (inclusive) of `vector`, as (food_id, distance)
+    sorted by distance then food_id.
+    """
+    if radius < 0:
+        raise ValueError("radius must be non-negative")
+    if catalog is None:
+        catalog = get_catalog()
+    exclude = set(exclude)
+
+    results = []
+    for bound, members in _cells_by_bound(vector, metric, dislikes or set(), archetypes or set(), catalog):
+        if bound > radius:
+            break
+        results.extend(m for m in members if m[1] <= radius and m[0] not in exclude)
+    results.sort(key=lambda m: (m[1], m[0]))
+    return results
+
+
+def nearest_foods(
+    vector: Tuple[float, ...],
+    k: int,
+    metric: str = "euclidean",
+    dislikes: Optional[Set[str]] = None,
+    archetypes: Optional[Set[Archetype]] = None,
+    exclude: Iterable[str] = (),
+    catalog=None,
+) -> List[Neighbor]:
+    """
+    The k foods nearest to `vector`, as (food_id, distance) sorted by
+    distance then food_id (ties are broken by food_id, so the result is
+    deterministic).
+
+    For "nearest dishes to this dish", pass the dish's vector and exclude
+    the dish itself.
+    """
+    if k < 0:
+        raise ValueError("k must be non-negative")
+    if catalog is None:
+        catalog = get_catalog()
+    exclude = set(exclude)
+    if k == 0:
+        return []
+
+    best: List[Neighbor] = []  # sorted candidates, at most k
+    for bound, members in _cells_by_bound(vector, metric, dislikes or set(), archetypes or set(), catalog):
+        # Equal bounds may still displace a tie with a larger food_id
+        if len(best) == k and bound > best[-1][1]:
+            break
+        best.extend(m for m in members if m[0] not in exclude)
+        best.sort(key=lambda m: (m[1], m[0]))
+        del best[k:]
+    return best
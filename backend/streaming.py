@@ -0,0 +1,112 @@
+"""
+Progressive ring assignment: emit Ring 0 before the outer rings.
+Episode: perf_2026
+
+`ring_events()` yields the assignment as a sequence of events so clients
+can render "Core Comfort" above the fold while the rest is still being
+produced:
+
+    thresholds → ring_0 → ring_1 → ring_2 → personality → done
+
+Each ring is sorted only when its turn comes. Personality goes last: it
+needs only the ring sizes, which are known after partitioning. With
+approximate thresholds the thresholds event carries "threshold_error",
+as the full response does.
+
+Events are encoded as server-sent events (`text/event-stream`) or
+newline-delimited JSON (`application/x-ndjson`).
+"""
+
+import json
+from typing import Callable, Iterable, Iterator, Optional, Set, Tuple
+
+from .archetypes import Archetype
+from .explanations import determine_personality
+from .approx_thresholds import error_field
+from .ring_assignment import partitioned_distance_table
+from .taste_vector import FoodDistance, UserTasteVector
+
+SSE_MEDIA_TYPE = "text/event-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+RingEvent = Tuple[str, dict]
+
+
+def _thresholds_payload(ring_thresholds: list, ring_sizes: list, threshold_error: Optional[dict]) -> dict:
+    payload = {"ring_thresholds": ring_thresholds, "ring_sizes": ring_sizes}
+    if threshold_error is not None:
+        payload["threshold_error"] = threshold_error
+    return payload
+
+
+def ring_events(
+    user_vector: UserTasteVector,
+    dislikes: Set[str],
+    archetypes: Set[Archetype],
+    format_food: Callable[[FoodDistance], dict],
+    food_ids: Optional[Iterable[str]] = None,
+    threshold_error: float = 0.0,
+) -> Iterator[RingEvent]:
+    """
+    Compute an assignment lazily, yielding (event, payload) pairs.
+    threshold_error is as in assign_to_rings().
+    """
+    user_vector.validate()
+    table, (threshold_0, threshold_1), error_bound = partitioned_distance_table(
+        user_vector.to_tuple(), dislikes, archetypes, food_ids, threshold_error=threshold_error
+    )
+    rings = table.ring_rows
+
+    yield "thresholds", _thresholds_payload(
+        [threshold_0, threshold_1], [len(ring) for ring in rings], error_field(error_bound)
+    )
+
+    for ring_num, ring in enumerate(rings):
+        table.sort_rows(ring)
+        yield f"ring_{ring_num}", {"ring": ring_num, "foods": [format_food(fd) for fd in table.views(ring)]}
+
+    personality = determine_personality(user_vector, archetypes, *rings)
+    yield "personality", {
+        "primary_personality": personality.primary_personality,
+        "secondary_personality": personality.secondary_personality,
+        "confidence_primary": personality.confidence_primary,
+        "confidence_secondary": personality.confidence_secondary,
+        "explanation": personality.explanation,
+    }
+    yield "done", {}
+
+
+def cached_ring_events(response: dict) -> Iterator[RingEvent]:
+    """The same event sequence replayed from a full (cached) response body."""
+    yield "thresholds", _thresholds_payload(
+        response["ring_thresholds"],
+        [len(response[f"ring_{i}"]) for i in range(3)],
+        response.get("threshold_error"),
+    )
+    for ring_num in range(3):
+        yield f"ring_{ring_num}", {"ring": ring_num, "foods": response[f"ring_{ring_num}"]}
+    yield "personality", response["personality"]
+    yield "done", {}
+
+
+def encode_sse(events: Iterator[RingEvent]) -> Iterator[str]:
+    for event, payload in events:
+        yield f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+
+def encode_ndjson(events: Iterator[RingEvent]) -> Iterator[str]:
+    for event, payload in events:
+        yield json.dumps({"event": event, "data": payload}, separators=(",", ":")) + "\n"
+
+
+def choose_stream_format(accept: Optional[str], requested: Optional[str] = None) -> str:
+    """Media type from an explicit ?format= (sse/ndjson) or the Accept header; SSE by default."""
+    if requested:
+        if requested == "sse":
+            return SSE_MEDIA_TYPE
+        if requested == "ndjson":
+            return NDJSON_MEDIA_TYPE
+        raise ValueError("format must be 'sse' or 'ndjson'")
+    if accept and NDJSON_MEDIA_TYPE in accept and SSE_MEDIA_TYPE not in accept:
+        return NDJSON_MEDIA_TYPE
+    return SSE_MEDIA_TYPE
@@ -3,8 +3,8 @@ Taste vector data structures.
 Episode: cursor_foodapp
 """
 
-from typing import Dict, List, Tuple, Set
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Set
+from dataclasses import dataclass, field
 from .food_data import VALID_VALUES
 from .archetypes import Archetype
 
@@ -37,6 +37,7 @@ class UserTasteVector:
 @dataclass
 class FoodDistance:
     """Distance calculation result for a food."""
+    __slots__ = ("food_name", "distance", "ring", "dimension_contributions")
     food_name: str
     distance: float
     ring: int
@@ -70,3 +71,23 @@ class ComfortRingAssignment:
     ring_2: List[FoodDistance]  # Far Edge / Experimental
     personality: PersonalityProfile
     ring_thresholds: Tuple[float, float]  # (threshold_0, threshold_1)
+    threshold_error: float = 0.0  # quantile rank error bound of approximate thresholds, 0.0 if exact
+    _food_index: Optional[Dict[str, Tuple[int, int]]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def food_index(self) -> Dict[str, Tuple[int, int]]:
+        """food_name -> (ring, position in ring), built on first use."""
+        if self._food_index is None:
+            self._food_index = {
+                fd.food_name: (ring, position)
+                for ring, foods in enumerate((self.ring_0, self.ring_1, self.ring_2))
+                for position, fd in enumerate(foods)
+            }
+        return self._food_index
+    
+    def find_food(self, food_name: str) -> Optional[FoodDistance]:
+        """The FoodDistance of a food, or None if it is not in the assignment."""
+        found = self.food_index().get(food_name)
+        if found is None:
+            return None
+        ring, position = found
+        return (self.ring_0, self.ring_1, self.ring_2)[ring][position]
@@ -0,0 +1,132 @@
+"""
+Per-stage request timing.
+Episode: perf_2026
+
+Stages of a request (validation, distance loop, thresholds, sorting,
+personality, response formatting) are timed with `stage(name)` blocks,
+reported back to the client in a `Server-Timing` header and aggregated
+into latency histograms exported on /metrics.
+
+Set FOOD_API_TIMING=0 to disable: the middleware is not installed and
+`stage()` returns a shared no-op context manager.
+"""
+
+import os
+from contextlib import nullcontext
+from contextvars import ContextVar
+from time import perf_counter
+from typing import List, Optional, Tuple
+
+from .metrics import REGISTRY
+
+TIMING_ENABLED = os.environ.get("FOOD_API_TIMING", "1").strip().lower() not in ("0", "false", "off", "no")
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "food_api_stage_duration_seconds",
+    "Time spent in each request stage.",
+    ("stage",),
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "food_api_request_duration_seconds",
+    "Total request latency measured by the timing middleware.",
+    ("route",),
+)
+
+_NULL_STAGE = nullcontext()
+_current_timings: ContextVar[Optional["StageTimings"]] = ContextVar("food_api_stage_timings", default=None)
+
+
+class StageTimings:
+    """Stage durations collected for a single request."""
+    __slots__ = ("started", "stages")
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.stages: List[Tuple[str, float]] = []
+
+    def record(self, name: str, seconds: float) -> None:
+        self.stages.append((name, seconds))
+
+    def mark(self, name: str) -> None:
+        """Record time elapsed since the request started as stage `name`."""
+        self.stages.append((name, perf_counter() - self.started))
+
+    def server_timing(self, total: float) -> str:
+        """Format as a Server-Timing header value (durations in ms)."""
+        entries = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.stages]
+        entries.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(entries)
+
+
+class _Stage:
+    __slots__ = ("timings", "name", "started")
+
+    def __init__(self, timings: StageTimings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timings.record(self.name, perf_counter() - self.started)
+        return False
+
+
+def stage(name: str):
+    """
+    Context manager timing one stage of the current request.
+
+    No-op when timing is disabled or when called outside a timed request
+    (e.g. from backend/main.py or the test suite).
+    """
+    if not TIMING_ENABLED:
+        return _NULL_STAGE
+    timings = _current_timings.get()
+    if timings is None:
+        return _NULL_STAGE
+    return _Stage(timings, name)
+
+
+def mark(name: str) -> None:
+    """Record time since request start as stage `name` (e.g. validation)."""
+    if TIMING_ENABLED:
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.mark(name)
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware: starts a StageTimings for every HTTP request,
+    adds the Server-Timing header and feeds the histograms.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = StageTimings()
+        token = _current_timings.set(timings)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total = perf_counter() - timings.started
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.server_timing(total).encode("latin-1")))
+                message = {**message, "headers": headers}
+                route = getattr(scope.get("route"), "path", "unmatched")
+                REQUEST_SECONDS.observe(total, route=route)
+                for name, seconds in timings.stages:
+                    STAGE_SECONDS.observe(seconds, stage=name)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timings.reset(token)
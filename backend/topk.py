@@ -0,0 +1,161 @@
+"""
+Top-K stretch recommendations via partial selection.
+Episode: perf_2026
+
+For the recommendation carousel only the K closest Ring 1 ("Safe Stretch")
+and Ring 2 dishes are needed. Instead of materializing, sorting and
+formatting every food like assign_to_rings does, this:
+1. computes all distances into a compact array (distance.catalog_distances)
+2. finds the percentile thresholds by quickselect (expected O(N)), or
+   with threshold_error > 0 estimates them from a sample as
+   assign_to_rings does
+3. keeps the K nearest per ring in bounded heaps
+
+FoodDistance objects (with contribution dicts) are only built for the
+foods that are returned; memory beyond the distance array and the one
+scratch copy quickselect reorders is O(K).
+"""
+
+import heapq
+import random
+from array import array
+from dataclasses import dataclass
+from typing import List, Set, Tuple
+
+from .approx_thresholds import threshold_sample
+from .archetypes import Archetype
+from .catalog import get_catalog
+from .distance import catalog_distances, compute_distance_with_archetypes
+from .ring_assignment import adjust_thresholds, compute_ring_thresholds, percentile_indices
+from .taste_vector import FoodDistance, UserTasteVector
+
+_pivot_rng = random.Random(0)
+
+
+def select_kth(values: array, k: int) -> float:
+    """
+    k-th smallest value (0-based), by in-place 3-way quickselect.
+
+    Reorders `values`. Three-way partitioning keeps it linear on the
+    heavily tied distance distributions a discrete taste grid produces.
+    """
+    lo, hi = 0, len(values) - 1
+    while True:
+        if lo == hi:
+            return values[lo]
+        pivot = values[_pivot_rng.randint(lo, hi)]
+        # Dutch national flag: [lo, lt) < pivot, [lt, i) == pivot, (gt, hi] > pivot
+        lt, i, gt = lo, lo, hi
+        while i <= gt:
+            v = values[i]
+            if v < pivot:
+                values[lt], values[i] = v, values[lt]
+                lt += 1
+                i += 1
+            elif v > pivot:
+                values[gt], values[i] = v, values[gt]
+                gt -= 1
+            else:
+                i += 1
+        if k < lt:
+            hi = lt - 1
+        elif k > gt:
+            lo = gt + 1
+        else:
+            return pivot
+
+
+def select_thresholds(work: array, archetypes: Set[Archetype]) -> Tuple[float, float]:
+    """
+    Same result as ring_assignment.compute_ring_thresholds, without a full sort.
+
+    Selects in place: reorders the caller's `work` buffer and allocates
+    nothing. Pass a copy to keep the original order.
+    """
+    n = len(work)
+    if n == 0:
+        raise ValueError("Cannot compute ring thresholds over an empty catalog")
+    idx_33, idx_66 = percentile_indices(n)
+    idx_33, idx_66 = min(idx_33, n - 1), min(idx_66, n - 1)
+    threshold_1 = select_kth(work, idx_66)
+    # Quickselect leaves the idx_66 smallest values in work[:idx_66], so the
+    # lower percentile can be selected within that prefix
+    if idx_33 < idx_66:
+        threshold_0 = select_kth(memoryview(work)[:idx_66], idx_33)
+    else:
+        threshold_0 = threshold_1
+    return adjust_thresholds(threshold_0, threshold_1, archetypes)
+
+
+@dataclass
+class StretchRecommendations:
+    """K nearest foods of Ring 1 and Ring 2, plus the full-catalog ring stats."""
+    ring_thresholds: Tuple[float, float]
+    ring_sizes: Tuple[int, int, int]
+    ring_1: List[FoodDistance]
+    ring_2: List[FoodDistance]
+    threshold_error: float = 0.0  # as ComfortRingAssignment.threshold_error
+
+
+def top_k_stretch(
+    user_vector: UserTasteVector,
+    dislikes: Set[str],
+    archetypes: Set[Archetype],
+    k: int,
+    catalog=None,
+    threshold_error: float = 0.0
+) -> StretchRecommendations:
+    """
+    The K closest Ring 1 and K closest Ring 2 foods, ordered exactly like
+    the corresponding prefixes of assign_to_rings' rings (for the same
+    threshold_error).
+    """
+    if k < 0:
+        raise ValueError("k must be non-negative")
+    user_vector.validate()
+    if catalog is None:
+        catalog = get_catalog()
+
+    user_vec = user_vector.to_tuple()
+    distances = catalog_distances(user_vec, dislikes, archetypes, catalog)
+    sample = threshold_sample(distances, threshold_error) if threshold_error > 0 else None
+    if sample is None:
+        # One 8-byte-per-food copy: `distances` must stay in catalog order for the ring scans below
+        threshold_0, threshold_1 = select_thresholds(array("d", distances), archetypes)
+        error_bound = 0.0
+    else:
+        threshold_0, threshold_1 = compute_ring_thresholds(sample, archetypes)
+        error_bound = threshold_error
+
+    food_ids = catalog.food_ids
+    n = len(distances)
+    n_ring_0 = sum(1 for d in distances if d <= threshold_0)
+    n_ring_2 = sum(1 for d in distances if d > threshold_1)
+
+    def order(i):
+        return (distances[i], food_ids[i])
+
+    nearest_1 = heapq.nsmallest(k, (i for i in range(n) if threshold_0 < distances[i] <= threshold_1), key=order)
+    nearest_2 = heapq.nsmallest(k, (i for i in range(n) if distances[i] > threshold_1), key=order)
+
+    def materialize(indices: List[int], ring: int) -> List[FoodDistance]:
+        results = []
+        for i in indices:
+            distance, dim_contrib = compute_distance_with_archetypes(
+                user_vec, catalog.vectors[i], food_ids[i], dislikes, archetypes
+            )
+            results.append(FoodDistance(
+                food_name=food_ids[i],
+                distance=distance,
+                ring=ring,
+                dimension_contributions=dim_contrib
+            ))
+        return results
+
+    return StretchRecommendations(
+        ring_thresholds=(threshold_0, threshold_1),
+        ring_sizes=(n_ring_0, n - n_ring_0 - n_ring_2, n_ring_2),
+        ring_1=materialize(nearest_1, 1),
+        ring_2=materialize(nearest_2, 2),
+        threshold_error=error_bound,
+    )
@@ -0,0 +1,164 @@
+"""
+Background cache warmup.
+Episode: perf_2026
+
+After startup a WarmupScheduler precomputes results for common (or all)
+profile/archetype combinations on a background thread, throttled to a
+CPU budget so live requests keep priority. The API's /ready endpoint
+reports its progress and only turns ready once the warm set is done.
+
+An item that raises is retried after the first pass, up to
+FOOD_API_WARMUP_RETRIES more times with exponential backoff, so transient
+failures heal. Items that still fail are left cold: they are counted in
+progress()["errors"] and food_api_warmup_failures_total, and do not count
+as done, but they do not hold readiness back. A cold item is only a
+slower first request.
+
+Configuration:
+- FOOD_API_WARMUP: "common" (default; every taste vector with no or one
+  archetype), "all" (every vector × every archetype combination) or "off"
+- FOOD_API_WARMUP_CPU: fraction of one core to use, 0 < budget <= 1 (default 0.5)
+- FOOD_API_WARMUP_RETRIES: retry rounds for failed items (default 3), the
+  first after FOOD_API_WARMUP_BACKOFF seconds (default 1.0), doubling
+"""
+
+import itertools
+import os
+import threading
+import time
+from typing import Callable, FrozenSet, List, Optional, Tuple
+
+from .archetypes import Archetype
+from .food_data import DIMENSION_NAMES, VALID_VALUES
+from .metrics import REGISTRY
+
+WARMUP_MODE = os.environ.get("FOOD_API_WARMUP", "common").strip().lower()
+WARMUP_CPU_BUDGET = float(os.environ.get("FOOD_API_WARMUP_CPU", "0.5"))
+WARMUP_RETRIES = int(os.environ.get("FOOD_API_WARMUP_RETRIES", "3"))
+WARMUP_BACKOFF = float(os.environ.get("FOOD_API_WARMUP_BACKOFF", "1.0"))
+
+WARMUP_FAILURES = REGISTRY.counter(
+    "food_api_warmup_failures_total",
+    "Warm-set items left cold after every retry failed.",
+)
+
+WarmupItem = Tuple[Tuple[float, ...], FrozenSet[Archetype]]
+
+
+def warmup_plan(mode: str = WARMUP_MODE) -> List[WarmupItem]:
+    """
+    Profiles to precompute, most common first: archetype combinations are
+    ordered by size (none, singles, pairs, ...), then taste vectors in grid order.
+    """
+    if mode == "off":
+        return []
+    if mode not in ("common", "all"):
+        raise ValueError(f"Unknown warmup mode '{mode}' (expected common, all or off)")
+
+    max_archetypes = 1 if mode == "common" else len(Archetype)
+    archetype_sets = [
+        frozenset(combo)
+        for size in range(max_archetypes + 1)
+        for combo in itertools.combinations(list(Archetype), size)
+    ]
+    vectors = list(itertools.product(VALID_VALUES, repeat=len(DIMENSION_NAMES)))
+    return [(vec, archs) for archs in archetype_sets for vec in vectors]
+
+
+class WarmupScheduler:
+    """Runs `compute(vector, archetypes)` over a plan on a background thread."""
+
+    def __init__(
+        self,
+        compute: Callable[[Tuple[float, ...], FrozenSet[Archetype]], None],
+        plan: List[WarmupItem],
+        cpu_budget: float = WARMUP_CPU_BUDGET,
+        retries: int = WARMUP_RETRIES,
+        backoff: float = WARMUP_BACKOFF,
+    ):
+        if not 0 < cpu_budget <= 1:
+            raise ValueError("cpu_budget must be in (0, 1]")
+        if retries < 0 or backoff < 0:
+            raise ValueError("retries and backoff must be non-negative")
+        self.compute = compute
+        self.plan = plan
+        self.cpu_budget = cpu_budget
+        self.retries = retries
+        self.backoff = backoff
+        self.done = 0
+        self.errors = 0
+        self.retried = 0
+        self.state = "pending" if plan else "complete"
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "complete"
+
+    def start(self) -> None:
+        if self._thread is not None or not self.plan:
+            return
+        self.state = "running"
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="food-api-warmup", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready
+
+    def _run(self) -> None:
+        # Duty cycle: after `busy` seconds of work, sleep busy * (1 - b) / b
+        idle_ratio = (1.0 - self.cpu_budget) / self.cpu_budget
+        pending = self.plan
+        for attempt in range(self.retries + 1):
+            if attempt:
+                if self._stop.wait(self.backoff * 2 ** (attempt - 1)):
+                    self.state = "stopped"
+                    return
+                self.retried += len(pending)
+            failed = []
+            for item in pending:
+                if self._stop.is_set():
+                    self.state = "stopped"
+                    return
+                started = time.perf_counter()
+                try:
+                    self.compute(*item)
+                except Exception:
+                    failed.append(item)
+                else:
+                    self.done += 1
+                if idle_ratio:
+                    self._stop.wait((time.perf_counter() - started) * idle_ratio)
+            pending = failed
+            if not pending:
+                break
+        self.errors = len(pending)
+        if pending:
+            WARMUP_FAILURES.inc(len(pending))
+        self.finished_at = time.monotonic()
+        self.state = "complete"
+
+    def progress(self) -> dict:
+        total = len(self.plan)
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return {
+            "state": self.state,
+            "done": self.done,
+            "total": total,
+            "fraction": round(self.done / total, 4) if total else 1.0,
+            "errors": self.errors,
+            "retried": self.retried,
+            "elapsed_s": round(end - self.started_at, 3) if self.started_at is not None else 0.0,
+            "cpu_budget": self.cpu_budget,
+        }
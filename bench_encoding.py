@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON vs binary (application/x-food-rings) ring responses.
+
+For a spread of taste profiles, compares encode and decode time and payload
+size (raw and gzip) of the /assign_to_rings response body. The JSON body is
+the full response; the binary body omits display metadata, which clients
+fetch once from the cacheable catalog endpoints. The "json (no metadata)"
+row isolates the gain from the encoding itself.
+
+Usage:
+    python bench_encoding.py [--profiles 50] [--repeat 200]
+"""
+
+import argparse
+import gzip
+import itertools
+import json
+import statistics
+import time
+
+from backend import VALID_VALUES, Archetype, UserTasteVector
+from backend.api import compute_ring_response
+from backend.binary_format import decode_ring_response, encode_ring_response
+from backend.catalog import get_catalog
+from backend.deltas import RING_KEYS, compact_entry
+
+
+def _profiles(count: int):
+    archetype_sets = [set(), {Archetype.HEAT_SEEKER}, {Archetype.TEXTURE_AVOIDER, Archetype.REFINED_MINIMALIST}]
+    vectors = itertools.product(VALID_VALUES, repeat=5)
+    for vector, archetypes in zip(itertools.islice(vectors, count), itertools.cycle(archetype_sets)):
+        yield UserTasteVector(*vector), archetypes
+
+
+def _time_us(fn, arg, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ring response encoding benchmark")
+    parser.add_argument("--profiles", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    catalog = get_catalog()
+    responses = [compute_ring_response(vector, set(), archetypes) for vector, archetypes in _profiles(args.profiles)]
+
+    def lean(response):
+        body = {key: value for key, value in response.items() if key not in RING_KEYS}
+        for ring_key in RING_KEYS:
+            body[ring_key] = [compact_entry(entry) for entry in response[ring_key]]
+        return body
+
+    def json_encode(response):
+        return json.dumps(response).encode("utf-8")
+
+    # name -> (inputs, encode, decode)
+    encodings = {
+        "json": (responses, json_encode, json.loads),
+        "json (no metadata)": ([lean(r) for r in responses], json_encode, json.loads),
+        "binary": (responses, lambda r: encode_ring_response(r, catalog), lambda b: decode_ring_response(b, catalog)),
+    }
+
+    print("=" * 80)
+    print(f"ENCODING BENCHMARK ({len(responses)} profiles, {len(catalog)} foods, {args.repeat} reps)")
+    print("=" * 80)
+    print(f"  {'format':<20} {'encode µs':>10} {'decode µs':>10} {'bytes':>8} {'gzip bytes':>11}")
+    for name, (inputs, encode, decode) in encodings.items():
+        encode_us, decode_us, sizes, gzip_sizes = [], [], [], []
+        for response in inputs:
+            payload = encode(response)
+            encode_us.append(_time_us(encode, response, args.repeat))
+            decode_us.append(_time_us(decode, payload, args.repeat))
+            sizes.append(len(payload))
+            gzip_sizes.append(len(gzip.compress(payload)))
+        print(
+            f"  {name:<20} {statistics.median(encode_us):10.1f} {statistics.median(decode_us):10.1f}"
+            f" {statistics.median(sizes):8.0f} {statistics.median(gzip_sizes):11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
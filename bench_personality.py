@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: personality determination on bulk runs.
+
+For every grid taste profile × archetype set × a spread of ring sizes,
+compares:
+- "rules + explanation": every predicate and bonus evaluated per call and
+  the explanation rendered eagerly (the pre-table behaviour);
+- "table": determine_personality(), a lookup by (profile code, archetype
+  mask, ring bonus bits), explanation never read;
+- "table + explanation": the same, reading each profile's explanation.
+
+Usage:
+    python bench_personality.py [--archetype-sets 8] [--repeat 3]
+"""
+
+import argparse
+import itertools
+import time
+
+from backend import VALID_VALUES, Archetype, UserTasteVector
+from backend.explanations import determine_personality, render_personality_explanation, score_personalities
+
+RING_SIZES = [(6, 6, 6), (10, 5, 3), (3, 5, 10), (18, 0, 0)]
+
+
+def _cases(archetype_sets: int):
+    archetypes = list(Archetype)
+    masks = [{archetypes[i] for i in range(len(archetypes)) if mask >> i & 1} for mask in range(2 ** len(archetypes))]
+    for vector in itertools.product(VALID_VALUES, repeat=5):
+        user_vector = UserTasteVector(*vector)
+        for archetype_set in masks[:archetype_sets]:
+            for sizes in RING_SIZES:
+                yield user_vector, archetype_set, tuple([None] * size for size in sizes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Personality engine benchmark")
+    parser.add_argument("--archetype-sets", type=int, default=8, help="archetype sets per profile (max 32)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    cases = list(_cases(args.archetype_sets))
+
+    def rules(user_vector, archetypes, rings):
+        vec = user_vector.to_tuple()
+        ranking = score_personalities(vec, archetypes, tuple(len(ring) for ring in rings))
+        render_personality_explanation(ranking[0], vec, archetypes, len(rings[0]), len(rings[2]))
+
+    def table(user_vector, archetypes, rings):
+        determine_personality(user_vector, archetypes, *rings)
+
+    def table_explained(user_vector, archetypes, rings):
+        determine_personality(user_vector, archetypes, *rings).explanation
+
+    table(*cases[0])  # import-time work out of the timings
+    variants = {
+        "rules + explanation": rules,
+        "table": table,
+        "table + explanation": table_explained,
+    }
+
+    print("=" * 80)
+    print(f"PERSONALITY BENCHMARK ({len(cases)} calls per run, best of {args.repeat})")
+    print("=" * 80)
+    print(f"  {'variant':<22} {'µs/call':>10} {'calls/s':>12}")
+    for name, fn in variants.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for case in cases:
+                fn(*case)
+            best = min(best, time.perf_counter() - start)
+        print(f"  {name:<22} {best / len(cases) * 1e6:10.2f} {len(cases) / best:12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: import time and API cold start.
+
+Each measurement runs in a fresh interpreter so module caches don't leak
+between runs:
+- import backend            (package import only; submodules are lazy)
+- import backend.api        (everything the server imports)
+- startup hook, validating  (no snapshot: validate + compile catalog)
+- startup hook, snapshot    (load precompiled snapshot, skip validation)
+
+Usage:
+    python bench_startup.py [--runs 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_TIMED = """
+import sys, time
+sys.path.insert(0, {root!r})
+{setup}
+t0 = time.perf_counter()
+{body}
+print(time.perf_counter() - t0)
+"""
+
+_IMPORT_API = "import asyncio, contextlib, io; import backend.api as api"
+_STARTUP = """
+with contextlib.redirect_stdout(io.StringIO()):
+    asyncio.run(api.startup_validation())
+"""
+
+
+def _run(body: str, env: dict, setup: str = "") -> float:
+    code = _TIMED.format(root=ROOT, setup=setup, body=body)
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _report(name: str, samples) -> None:
+    samples_ms = [s * 1000 for s in samples]
+    print(
+        f"  {name:<32} median {statistics.median(samples_ms):8.2f} ms"
+        f"   min {min(samples_ms):8.2f} ms   max {max(samples_ms):8.2f} ms"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time / startup-time benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = os.path.join(tmp, "catalog.snapshot")
+        missing_path = os.path.join(tmp, "missing.snapshot")
+        env = dict(os.environ, PYTHONDONTWRITEBYTECODE="0")
+
+        # Build the snapshot once
+        subprocess.run(
+            [sys.executable, os.path.join(ROOT, "backend", "snapshot.py"), "--out", snapshot_path],
+            env=env, capture_output=True, check=True,
+        )
+
+        no_snapshot_env = dict(env, FOOD_API_SNAPSHOT=missing_path)
+        snapshot_env = dict(env, FOOD_API_SNAPSHOT=snapshot_path)
+
+        # Warm the bytecode cache so we measure imports, not compilation
+        _run("import backend.api", no_snapshot_env)
+
+        print("=" * 80)
+        print(f"STARTUP BENCHMARK ({args.runs} runs each, fresh interpreter per run)")
+        print("=" * 80)
+        _report("import backend", [_run("import backend", env) for _ in range(args.runs)])
+        _report("import backend.api", [_run("import backend.api", env) for _ in range(args.runs)])
+        _report("startup hook (validate)", [_run(_STARTUP, no_snapshot_env, _IMPORT_API) for _ in range(args.runs)])
+        _report("startup hook (snapshot)", [_run(_STARTUP, snapshot_env, _IMPORT_API) for _ in range(args.runs)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,793 @@
+#!/usr/bin/env python3
+"""
+Test Suite for Food Personality API
+Episode: perf_2026
+
+Exercises the FastAPI endpoints in backend/api.py in-process.
+"""
+
+import json
+import sys
+import os
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+from backend.api import app, warmup_scheduler, RESULT_HISTORY
+from backend import profiling
+from backend import loadgen
+from backend.result_cache import CACHE_REQUESTS
+from backend.warmup import WARMUP_FAILURES, WarmupScheduler, warmup_plan
+
+client = TestClient(app)
+
+COMFORT_PROFILE = {
+    "spice_intensity": 0.2,
+    "texture_intensity": 0.5,
+    "preparation_familiarity": 0.2,
+    "richness": 0.8,
+    "psychological_distance": 0.2,
+}
+
+
+def test_server_timing_and_metrics():
+    """Stage timings are reported in Server-Timing and aggregated on /metrics."""
+    print("Testing Server-Timing & /metrics...")
+
+    response = client.post("/assign_to_rings", json=COMFORT_PROFILE)
+    assert response.status_code == 200, "Failed: assign_to_rings request"
+
+    header = response.headers.get("server-timing", "")
+    stages = [entry.split(";")[0].strip() for entry in header.split(",")]
+    for expected in ("validate", "distances", "thresholds", "sort", "personality", "format", "total"):
+        assert expected in stages, f"Failed: stage '{expected}' missing from Server-Timing"
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200, "Failed: /metrics request"
+    assert metrics.headers["content-type"].startswith("text/plain"), "Failed: metrics content type"
+    assert 'food_api_stage_duration_seconds_count{stage="distances"}' in metrics.text, \
+        "Failed: stage histogram not exported"
+    assert 'food_api_request_duration_seconds_bucket{route="/assign_to_rings",le="+Inf"}' in metrics.text, \
+        "Failed: request histogram not exported"
+
+    print("  ✓ Stage timings reported")
+
+
+def test_debug_endpoints():
+    """Profiler and tracemalloc endpoints are hidden by default and work when enabled."""
+    print("Testing /debug endpoints...")
+
+    assert client.post("/debug/profile?seconds=0.1").status_code == 404, \
+        "Failed: debug endpoints should be hidden by default"
+
+    profiling.DEBUG_ENDPOINTS_ENABLED = True
+    try:
+        response = client.post("/debug/profile?seconds=0.1&interval_ms=2&include_idle=true")
+        assert response.status_code == 200, f"Failed: profile request ({response.status_code})"
+        body = response.json()
+        assert body["samples"] > 0, "Failed: no samples taken"
+        assert os.path.exists(body["path"]), "Failed: collapsed stack file not written"
+        os.remove(body["path"])
+        assert client.post("/debug/profile?seconds=0.05&interval_ms=20000").status_code == 400, \
+            "Failed: interval longer than the profile should be rejected"
+
+        assert client.post("/debug/memory/snapshot").status_code == 409, \
+            "Failed: snapshot without tracking should be rejected"
+        for frames in (0, 100000):
+            assert client.post(f"/debug/memory/start?frames={frames}").status_code == 400, \
+                f"Failed: frames={frames} should be rejected"
+        assert client.post("/debug/memory/start").json()["tracing"], "Failed: tracemalloc not started"
+        first = client.post("/debug/memory/snapshot").json()
+        assert first["diff"] is None, "Failed: first snapshot has no baseline"
+        second = client.post("/debug/memory/snapshot").json()
+        assert isinstance(second["diff"], list), "Failed: second snapshot should diff against first"
+        for limit in (0, -1, 1001):
+            assert client.post(f"/debug/memory/snapshot?limit={limit}").status_code == 400, \
+                f"Failed: snapshot limit {limit} should be rejected"
+        assert not client.post("/debug/memory/stop").json()["tracing"], "Failed: tracemalloc not stopped"
+    finally:
+        profiling.DEBUG_ENDPOINTS_ENABLED = False
+
+    print("  ✓ Debug endpoints gated and functional")
+
+
+def test_loadgen_harness():
+    """Load generator replays a deterministic mix and reports percentiles."""
+    print("Testing load generator...")
+
+    plan_a = loadgen.plan_requests(200, seed=7)
+    plan_b = loadgen.plan_requests(200, seed=7)
+    assert [(r.path, r.body) for r in plan_a] == [(r.path, r.body) for r in plan_b], \
+        "Failed: traffic mix not deterministic for a fixed seed"
+    assert {r.kind for r in plan_a} == {"assign_to_rings", "foods", "food"}, "Failed: mix missing endpoints"
+
+    histogram = loadgen.LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000.0)
+    assert abs(histogram.value_at_percentile(50) - 500) / 500 < 0.01, "Failed: p50 outside HDR precision"
+    assert abs(histogram.value_at_percentile(99) - 990) / 990 < 0.01, "Failed: p99 outside HDR precision"
+
+    report = loadgen.asyncio.run(loadgen.run_load(mode="closed", requests=40, concurrency=4, warmup=0))
+    assert report["results"]["completed"] == 40, "Failed: not all requests completed"
+    assert report["results"]["errors"] == 0, "Failed: load run produced errors"
+
+    print("  ✓ Load generator working")
+
+
+def test_result_cache_and_readiness():
+    """Repeated requests hit the result cache; /ready gates on warmup progress."""
+    print("Testing result cache & readiness...")
+
+    request = dict(COMFORT_PROFILE, dislikes=["Haggis", "Fufu"], archetypes=["heat_seeker"])
+    reordered = dict(COMFORT_PROFILE, dislikes=["Fufu", "Haggis"], archetypes=["heat_seeker"])
+    hits_before = CACHE_REQUESTS.value(tier="local", result="hit")
+    first = client.post("/assign_to_rings", json=request).json()
+    second = client.post("/assign_to_rings", json=reordered).json()
+    assert first == second, "Failed: cached response differs"
+    assert CACHE_REQUESTS.value(tier="local", result="hit") > hits_before, "Failed: canonical key should hit"
+
+    # Warmup never started (no lifespan in this client) -> not ready
+    if not warmup_scheduler.ready:
+        assert client.get("/ready").status_code == 503, "Failed: /ready should be 503 before warmup"
+    assert client.get("/").status_code == 200, "Failed: health check should not depend on warmup"
+
+    assert len(warmup_plan("common")) == 243 * 6, "Failed: common plan size"
+    assert len(warmup_plan("all")) == 243 * 32, "Failed: full plan size"
+    assert warmup_plan("off") == [], "Failed: warmup off"
+
+    computed = []
+    scheduler = WarmupScheduler(lambda vec, archs: computed.append(vec), warmup_plan("common")[:20], cpu_budget=1.0)
+    scheduler.start()
+    assert scheduler.wait(timeout=10), "Failed: warmup did not complete"
+    assert len(computed) == 20 and scheduler.progress()["fraction"] == 1.0, "Failed: warmup progress"
+
+    attempts = {}
+
+    def flaky(vec, archs):
+        # Item 3 fails once and then heals; item 7 never succeeds
+        index = plan.index((vec, archs))
+        attempts[index] = attempts.get(index, 0) + 1
+        if index == 7 or (index == 3 and attempts[index] == 1):
+            raise RuntimeError("warmup item failed")
+
+    plan = warmup_plan("common")[:10]
+    failures_before = WARMUP_FAILURES.value()
+    failing = WarmupScheduler(flaky, plan, cpu_budget=1.0, retries=2, backoff=0.01)
+    failing.start()
+    assert failing.wait(timeout=10), "Failed: failed items must not hold readiness back"
+    progress = failing.progress()
+    assert progress["state"] == "complete" and progress["done"] == 9 and progress["errors"] == 1, \
+        "Failed: a transient failure should heal on retry, a persistent one stay an error"
+    assert attempts[3] == 2 and attempts[7] == 3 and progress["retried"] == 3, "Failed: retry rounds"
+    assert WARMUP_FAILURES.value() == failures_before + 1, "Failed: warmup failures metric"
+
+    print("  ✓ Result cache & readiness working")
+
+
+def test_live_websocket_deltas():
+    """WebSocket sessions send a snapshot, then only the foods that moved."""
+    print("Testing live-slider WebSocket...")
+
+    with client.websocket_connect("/ws/rings") as ws:
+        ws.send_json(COMFORT_PROFILE)
+        snapshot = ws.receive_json()
+        assert snapshot["type"] == "snapshot", "Failed: first frame should be a snapshot"
+        placements = {
+            e["food_name"]: (e["ring"], e["distance"])
+            for key in ("ring_0", "ring_1", "ring_2") for e in snapshot[key]
+        }
+
+        ws.send_json({"archetypes_add": ["refined_minimalist"]})
+        delta = ws.receive_json()
+        assert delta["type"] == "delta", "Failed: later frames should be deltas"
+        assert 0 < len(delta["changed"]) < len(placements), "Failed: delta should carry only moved foods"
+        for entry in delta["changed"]:
+            placements[entry["food_name"]] = (entry["ring"], entry["distance"])
+
+        full = client.post("/assign_to_rings", json=dict(COMFORT_PROFILE, archetypes=["refined_minimalist"])).json()
+        expected = {
+            e["food_name"]: (e["ring"], e["distance"])
+            for key in ("ring_0", "ring_1", "ring_2") for e in full[key]
+        }
+        assert placements == expected, "Failed: snapshot + delta should equal the full response"
+        assert delta["ring_thresholds"] == full["ring_thresholds"], "Failed: delta thresholds"
+        assert delta["personality"] == full["personality"], "Failed: delta personality"
+
+        ws.send_json({"spice_intensity": 0.9})
+        assert ws.receive_json()["type"] == "error", "Failed: invalid value should produce an error frame"
+        for malformed in ({"dislikes_add": 5}, {"archetypes_remove": [["x"]]}, {"dislikes": "Pho"}):
+            ws.send_json(malformed)
+            assert ws.receive_json()["type"] == "error", f"Failed: {malformed} should produce an error frame"
+        ws.send_json({"archetypes_remove": ["refined_minimalist"]})
+        assert ws.receive_json()["type"] == "delta", "Failed: session should survive an error"
+
+    print("  ✓ Live deltas consistent with full responses")
+
+
+def test_conditional_since_responses():
+    """`since` yields an unchanged marker, a patch, or a full fallback."""
+    print("Testing conditional `since` responses...")
+
+    base = client.post("/assign_to_rings", json=COMFORT_PROFILE).json()
+    base_hash = base["result_hash"]
+    assert client.post("/assign_to_rings", json=COMFORT_PROFILE).json()["result_hash"] == base_hash, \
+        "Failed: result hash not stable"
+
+    unchanged = client.post("/assign_to_rings", json=dict(COMFORT_PROFILE, since=base_hash)).json()
+    assert unchanged == {"unchanged": True, "result_hash": base_hash}, "Failed: unchanged marker"
+
+    moved = dict(COMFORT_PROFILE, psychological_distance=0.8)
+    full = client.post("/assign_to_rings", json=moved).json()
+    patched = client.post("/assign_to_rings", json=dict(moved, since=base_hash)).json()
+    assert patched["base_hash"] == base_hash and patched["result_hash"] == full["result_hash"], \
+        "Failed: patch hashes"
+    placements = {e["food_name"]: (e["ring"], e["distance"]) for k in ("ring_0", "ring_1", "ring_2") for e in base[k]}
+    for entry in patched["patch"]["changed"]:
+        placements[entry["food_name"]] = (entry["ring"], entry["distance"])
+    expected = {e["food_name"]: (e["ring"], e["distance"]) for k in ("ring_0", "ring_1", "ring_2") for e in full[k]}
+    assert placements == expected, "Failed: base + patch should equal the full result"
+
+    # Contribution-only changes are patched too: the rebuilt body hashes to result_hash
+    from backend.deltas import apply_ring_patch
+    avoider = dict(COMFORT_PROFILE, archetypes=["texture_avoider"])
+    target = client.post("/assign_to_rings", json=avoider).json()
+    patched = client.post("/assign_to_rings", json=dict(avoider, since=base_hash)).json()
+    rebuilt = apply_ring_patch(base, patched["patch"])
+    assert rebuilt["result_hash"] == patched["result_hash"] == target["result_hash"], \
+        "Failed: rebuilt body does not match result_hash"
+    assert rebuilt == target, "Failed: rebuilt body differs from the full result"
+
+    RESULT_HISTORY.clear()  # simulate eviction of the base
+    fallback = client.post("/assign_to_rings", json=dict(moved, since=base_hash)).json()
+    assert "ring_0" in fallback and fallback["result_hash"] == full["result_hash"], \
+        "Failed: evicted base should fall back to a full response"
+
+    print("  ✓ Conditional responses working")
+
+
+def test_streaming_rings():
+    """Streamed events arrive Ring 0 first and reassemble to the full response."""
+    print("Testing progressive streaming...")
+
+    profile = dict(COMFORT_PROFILE, texture_intensity=0.8, archetypes=["flavor_explorer"], dislikes=["Pho"])
+    response = client.post("/assign_to_rings/stream?format=ndjson", json=profile)
+    assert response.headers["content-type"].startswith("application/x-ndjson"), "Failed: ndjson media type"
+    events = [json.loads(line) for line in response.text.splitlines()]
+    names = [e["event"] for e in events]
+    assert names == ["thresholds", "ring_0", "ring_1", "ring_2", "personality", "done"], \
+        f"Failed: unexpected event order {names}"
+
+    full = client.post("/assign_to_rings", json=profile).json()
+    data = {e["event"]: e["data"] for e in events}
+    assert data["thresholds"]["ring_thresholds"] == full["ring_thresholds"], "Failed: streamed thresholds"
+    for i in range(3):
+        assert data[f"ring_{i}"]["foods"] == full[f"ring_{i}"], f"Failed: streamed ring {i}"
+    assert data["personality"] == full["personality"], "Failed: streamed personality"
+
+    # Cached replay (full result now cached) uses SSE by default
+    sse = client.post("/assign_to_rings/stream", json=profile)
+    assert sse.headers["content-type"].startswith("text/event-stream"), "Failed: SSE media type"
+    assert sse.text.startswith("event: thresholds\n"), "Failed: SSE should start with thresholds"
+
+    bad = client.post("/assign_to_rings/stream?format=xml", json=profile)
+    assert bad.status_code == 400, "Failed: unknown stream format should be rejected"
+
+    print("  ✓ Streaming rings working")
+
+
+def test_catalog_filters():
+    """Filter expressions restrict /assign_to_rings and /foods to a catalog subset."""
+    print("Testing catalog filters...")
+
+    from backend import FOOD_REGISTRY, UserTasteVector, assign_to_rings
+
+    expected = [
+        name for name, p in FOOD_REGISTRY.items()
+        if ("mexico" in p.origin.lower() or "japan" in p.origin.lower()) and p.spice_intensity != 0.8
+    ]
+    expression = "origin=Mexico|japan; spice_intensity!=high"
+    listed = client.get("/foods", params={"filter": expression}).json()
+    assert listed["foods"] == expected and listed["count"] == len(expected), "Failed: /foods filter"
+    assert client.get("/foods").json()["count"] == len(FOOD_REGISTRY), "Failed: unfiltered /foods"
+    for blank in ("", " "):
+        resp = client.get("/foods", params={"filter": blank})
+        assert resp.status_code == 200 and resp.json()["count"] == len(FOOD_REGISTRY), "Failed: blank filter lists all foods"
+
+    body = client.post("/assign_to_rings", json=dict(COMFORT_PROFILE, filter=expression)).json()
+    returned = {e["food_name"] for k in ("ring_0", "ring_1", "ring_2") for e in body[k]}
+    assert returned == set(expected), "Failed: rings should only contain filtered foods"
+    direct = assign_to_rings(UserTasteVector(**COMFORT_PROFILE), set(), set(), food_ids=expected)
+    assert body["ring_thresholds"] == list(direct.ring_thresholds), "Failed: subset thresholds"
+
+    unfiltered = client.post("/assign_to_rings", json=COMFORT_PROFILE).json()
+    assert unfiltered["result_hash"] != body["result_hash"], "Failed: filter must be part of the cache key"
+
+    for bad in ("origin=Atlantis", "flavor=high", "spice_intensity=extreme", "origin"):
+        assert client.post("/assign_to_rings", json=dict(COMFORT_PROFILE, filter=bad)).status_code == 400, \
+            f"Failed: expected 400 for {bad!r}"
+    assert client.post("/assign_to_rings/neighbors", json=dict(COMFORT_PROFILE, filter=expression)).status_code == 400, \
+        "Failed: unsupported filter should be rejected"
+
+    # Byte-wise bitmap decoding, also from a start index inside a byte
+    import random
+    from backend.filters import bitmap_indices, iter_bitmap_indices
+    rng = random.Random(5)
+    positions = sorted(rng.sample(range(5000), 700))
+    bitmap = sum(1 << i for i in positions)
+    assert bitmap_indices(bitmap) == positions and bitmap_indices(0) == [], "Failed: bitmap decoding"
+    assert list(iter_bitmap_indices(bitmap, 1237)) == [i for i in positions if i >= 1237], \
+        "Failed: bitmap decoding from a start index"
+
+    print("  ✓ Catalog filters working")
+
+
+def test_food_search():
+    """Search matches names, descriptions, origins and regions, with typeahead prefixes."""
+    print("Testing food search...")
+
+    results = client.get("/foods/search", params={"q": "taco"}).json()["results"]
+    assert {r["food_id"] for r in results} == {"Tacos al pastor", "Beef tongue tacos"}, "Failed: prefix match"
+    assert client.get("/foods/search", params={"q": "taco", "prefix": "false"}).json()["count"] == 0, \
+        "Failed: prefix=false should require whole words"
+
+    ranked = client.get("/foods/search", params={"q": "pizza"}).json()["results"]
+    assert ranked[0]["food_id"] == "Pepperoni pizza", "Failed: name matches should rank first"
+    scores = [r["score"] for r in ranked]
+    assert scores == sorted(scores, reverse=True), "Failed: results not ranked"
+
+    both = client.get("/foods/search", params={"q": "tacos mexico"}).json()["results"]
+    assert {r["food_id"] for r in both} == {"Tacos al pastor", "Beef tongue tacos"}, \
+        "Failed: all query words must match"
+    assert client.get("/foods/search", params={"q": "tacos japan"}).json()["count"] == 0, \
+        "Failed: words are ANDed"
+    assert client.get("/foods/search", params={"q": "zzzz"}).json()["count"] == 0, "Failed: no match"
+    assert client.get("/foods/search", params={"q": "a", "limit": 0}).status_code == 400, "Failed: limit check"
+    assert client.get("/foods/Sushi").status_code == 200, "Failed: /foods/{food_id} still routed"
+
+    print("  ✓ Food search working")
+
+
+def test_foods_pagination():
+    """Cursor pages cover the catalog once, in order; fields= projects columns."""
+    print("Testing /foods pagination...")
+
+    from backend import FOOD_REGISTRY
+
+    legacy = client.get("/foods").json()
+    assert legacy == {"foods": list(FOOD_REGISTRY), "count": len(FOOD_REGISTRY)}, "Failed: default response changed"
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 5, "fields": "display_name,origin,taste_profile"}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/foods", params=params).json()
+        assert page["total"] == len(FOOD_REGISTRY) and page["count"] <= 5, "Failed: page size"
+        for item in page["foods"]:
+            profile = FOOD_REGISTRY[item["food_id"]]
+            assert set(item) == {"food_id", "display_name", "origin", "taste_profile"}, "Failed: projection"
+            assert item["origin"] == profile.origin, "Failed: projected value"
+            assert item["taste_profile"]["richness"] == profile.richness, "Failed: taste profile"
+        seen += [item["food_id"] for item in page["foods"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == list(FOOD_REGISTRY), "Failed: pages should cover the catalog in order"
+
+    filtered = client.get("/foods", params={"filter": "origin=Mexico|Japan", "limit": 2}).json()
+    rest = client.get("/foods", params={"filter": "origin=Mexico|Japan", "cursor": filtered["next_cursor"]}).json()
+    assert filtered["foods"] + rest["foods"] == client.get("/foods", params={"filter": "origin=Mexico|Japan"}).json()["foods"], \
+        "Failed: filtered pagination"
+
+    for params in ({"limit": 0}, {"cursor": "garbage"}, {"fields": "calories"}):
+        assert client.get("/foods", params=params).status_code == 400, f"Failed: expected 400 for {params}"
+
+    print("  ✓ Pagination and projection working")
+
+
+def test_catalog_http_caching():
+    """Catalog bodies carry ETags, honor If-None-Match, and are served compressed."""
+    print("Testing catalog HTTP caching...")
+
+    from backend import get_food_metadata
+
+    for path, expected in (("/foods", None), ("/foods/Sushi", get_food_metadata("Sushi"))):
+        first = client.get(path, headers={"Accept-Encoding": "gzip"})
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and "max-age" in first.headers["cache-control"], "Failed: cache headers"
+        assert "Accept-Encoding" in first.headers["vary"], "Failed: Vary header"
+        if expected is not None:
+            assert first.json() == expected, "Failed: pre-rendered body differs from get_food_metadata"
+
+        again = client.get(path, headers={"If-None-Match": etag})
+        assert again.status_code == 304 and again.content == b"", "Failed: expected 304"
+        assert client.get(path, headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304, \
+            "Failed: weak / list If-None-Match"
+        assert client.get(path, headers={"If-None-Match": '"stale"'}).status_code == 200, "Failed: stale ETag"
+
+    identity = client.get("/foods/Sushi", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers, "Failed: identity requested"
+    compressed = client.get("/foods/Sushi", headers={"Accept-Encoding": "gzip;q=1, br;q=0"})
+    assert compressed.headers.get("content-encoding") == "gzip", "Failed: expected gzip body"
+    assert compressed.json() == identity.json(), "Failed: encodings must decode to the same document"
+    assert compressed.headers["etag"] != identity.headers["etag"], "Failed: each content coding needs its own ETag"
+    assert compressed.headers["etag"].endswith('-gzip"'), "Failed: gzip variant ETag"
+    for held in (identity.headers["etag"], compressed.headers["etag"]):
+        assert client.get("/foods/Sushi", headers={"If-None-Match": held, "Accept-Encoding": "gzip"}).status_code == 304, \
+            "Failed: any variant's ETag should revalidate"
+    assert client.get("/foods/NotAFood").status_code == 404, "Failed: unknown food"
+
+    print("  ✓ Catalog HTTP caching working")
+
+
+def test_binary_ring_responses():
+    """Accept: application/x-food-rings returns the binary layout, decoding to the JSON result."""
+    print("Testing binary ring responses...")
+
+    from backend.binary_format import BINARY_MEDIA_TYPE, decode_ring_response
+    from backend.catalog import get_catalog
+
+    profile = dict(COMFORT_PROFILE, dislikes=["Sushi"], archetypes=["texture_avoider", "heat_seeker"])
+    full = client.post("/assign_to_rings", json=profile).json()
+    binary = client.post("/assign_to_rings", json=profile, headers={"Accept": BINARY_MEDIA_TYPE})
+    assert binary.headers["content-type"] == BINARY_MEDIA_TYPE, "Failed: binary media type"
+    assert len(binary.content) < len(json.dumps(full)) / 4, "Failed: binary body should be much smaller"
+
+    decoded = decode_ring_response(binary.content, get_catalog())
+    assert decoded["result_hash"] == full["result_hash"], "Failed: result hash"
+    assert decoded["personality"] == full["personality"], "Failed: personality"
+    assert decoded["ring_thresholds"] == full["ring_thresholds"], "Failed: thresholds"
+    for ring_key in ("ring_0", "ring_1", "ring_2"):
+        expected = [
+            {k: e[k] for k in ("food_name", "distance", "ring", "dimension_contributions")}
+            for e in full[ring_key]
+        ]
+        assert decoded[ring_key] == expected, f"Failed: {ring_key} round trip"
+
+    not_binary = client.post("/assign_to_rings", json=profile, headers={"Accept": f"{BINARY_MEDIA_TYPE};q=0"})
+    assert not_binary.json()["result_hash"] == full["result_hash"], "Failed: q=0 should get JSON"
+    since = client.post("/assign_to_rings", json=dict(profile, since=full["result_hash"]),
+                        headers={"Accept": BINARY_MEDIA_TYPE})
+    assert since.json() == {"unchanged": True, "result_hash": full["result_hash"]}, "Failed: since replies stay JSON"
+
+    print("  ✓ Binary responses working")
+
+
+def test_shared_result_cache():
+    """SQLite and Redis-protocol shared tiers serve results across local caches."""
+    print("Testing shared result cache tiers...")
+
+    import socket
+    import sqlite3
+    import tempfile
+    import threading
+    import time
+    from backend.result_cache import ResultCache
+    from backend.shared_cache import SHARED_CACHE_ERRORS, RedisCache, SQLiteCache, TieredResultCache, shared_key
+
+    response = client.post("/assign_to_rings", json=COMFORT_PROFILE).json()
+    key = ((0.2, 0.5, 0.2, 0.8, 0.2), (), (), "v1", None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.db")
+        worker_a = TieredResultCache(ResultCache(maxsize=8), SQLiteCache(path))
+        worker_b = TieredResultCache(ResultCache(maxsize=8), SQLiteCache(path))
+        hits_before = CACHE_REQUESTS.value(tier="sqlite", result="hit")
+
+        assert worker_b.get(key) is None, "Failed: expected a shared miss"
+        worker_a.put(key, response)
+        assert worker_b.get(key) == response, "Failed: other worker should read the shared entry"
+        assert key in worker_b.local, "Failed: shared hit should be promoted to the local tier"
+        assert CACHE_REQUESTS.value(tier="sqlite", result="hit") == hits_before + 1, "Failed: hit metric"
+
+        # A corrupt shared entry is an error and a miss, not an exception
+        corrupt_key = key[:3] + ("v2", None)
+        worker_a.shared.put(shared_key(corrupt_key), b"not zlib")
+        errors_before = SHARED_CACHE_ERRORS.value(tier="sqlite")
+        assert worker_b.get(corrupt_key) is None, "Failed: corrupt entry should read as a miss"
+        assert SHARED_CACHE_ERRORS.value(tier="sqlite") == errors_before + 1, "Failed: corrupt entry not counted"
+        assert corrupt_key not in worker_b.local, "Failed: corrupt entry promoted"
+
+        bounded = SQLiteCache(os.path.join(tmp, "bounded.db"), maxsize=10)
+        for i in range(25):
+            bounded.put(shared_key((i,)), b"x")
+        assert len(bounded) <= 10, "Failed: SQLite tier should stay bounded"
+        assert bounded.get(shared_key((24,))) == b"x", "Failed: most recent entry evicted"
+        assert bounded.get(shared_key((0,))) is None, "Failed: oldest entry should be evicted first"
+
+        # Hits are pure reads: they must not queue behind another worker's write lock
+        writer = sqlite3.connect(path, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            started = time.perf_counter()
+            assert worker_a.shared.get(shared_key(key)) is not None, "Failed: read during a write"
+            assert time.perf_counter() - started < 1.0, "Failed: shared hit waited on the writer lock"
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+
+    # Local stand-in for a Redis server: GET / SET ... EX over RESP
+    store = {}
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+
+    def serve():
+        conn, _ = server.accept()
+        reader = conn.makefile("rb")
+        while True:
+            header = reader.readline()
+            if not header:
+                break
+            args = []
+            for _ in range(int(header[1:])):
+                size = int(reader.readline()[1:])
+                args.append(reader.read(size + 2)[:-2])
+            if args[0] == b"SET":
+                store[args[1]] = args[2]
+                conn.sendall(b"+OK\r\n")
+            elif args[1] in store:
+                conn.sendall(b"$%d\r\n%s\r\n" % (len(store[args[1]]), store[args[1]]))
+            else:
+                conn.sendall(b"$-1\r\n")
+        conn.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    redis_tier = TieredResultCache(ResultCache(maxsize=8), RedisCache("127.0.0.1", server.getsockname()[1]))
+    assert redis_tier.get(key) is None, "Failed: expected a redis miss"
+    redis_tier.put(key, response)
+    redis_tier.local.clear()
+    assert redis_tier.get(key) == response, "Failed: redis round trip"
+    redis_tier.shared._close()
+    server.close()
+
+    print("  ✓ Shared cache tiers working")
+
+
+def test_assignment_store():
+    """user_id requests are persisted in batches and stale rows are re-scored."""
+    print("Testing assignment store...")
+
+    import tempfile
+    import backend.api as api
+    from backend.assignment_store import open_assignment_store
+
+    assert client.get("/users/u1/assignment").status_code == 404, "Failed: disabled store should 404"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = open_assignment_store(os.path.join(tmp, "assignments.db"))
+        store.start()
+        api.ASSIGNMENT_STORE = store
+        try:
+            profile = dict(COMFORT_PROFILE, dislikes=["Sushi"], archetypes=["heat_seeker"])
+            full = client.post("/assign_to_rings", json=dict(profile, user_id="u1")).json()
+            for i in range(20):
+                client.post("/assign_to_rings", json=dict(COMFORT_PROFILE, user_id=f"bulk{i}"))
+            store.flush()
+
+            stored = client.get("/users/u1/assignment").json()
+            assert not stored["rescored"] and stored["inputs"]["dislikes"] == ["Sushi"], "Failed: stored inputs"
+            assert stored["assignment"]["result_hash"] == full["result_hash"], "Failed: stored result"
+            assert [e["food_name"] for e in stored["assignment"]["ring_0"]] == \
+                [e["food_name"] for e in full["ring_0"]], "Failed: stored rings"
+            assert client.get("/users/nobody/assignment").status_code == 404, "Failed: unknown user"
+
+            # Simulate a catalog change: every row becomes stale
+            with store.pool.connection() as conn:
+                conn.execute("UPDATE assignments SET catalog_version = 'old', result = x''")
+            rescored = client.get("/users/u1/assignment").json()
+            assert rescored["rescored"] and rescored["assignment"]["result_hash"] == full["result_hash"], \
+                "Failed: lazy re-score on read"
+            store.flush()
+            assert store.rescore_stale(api.get_catalog(), api.rescore_inputs) == 20, "Failed: bulk re-score count"
+            assert not client.get("/users/bulk7/assignment").json()["rescored"], "Failed: bulk re-score persisted"
+
+            # A re-score never replaces an answer the user submitted after the row went stale
+            catalog = api.get_catalog()
+            with store.pool.connection() as conn:
+                conn.execute("UPDATE assignments SET catalog_version = 'old' WHERE user_id = 'u1'")
+            stale_inputs, _, _ = store.load("u1")
+            newer = dict(stale_inputs, spice_intensity=0.8)
+            store.record("u1", newer, api.rescore_inputs(newer), catalog)
+            store.record("u1", stale_inputs, api.rescore_inputs(stale_inputs), catalog, stale_version="old")
+            store.flush()
+            assert store.load("u1")[0]["spice_intensity"] == 0.8, "Failed: re-score overwrote newer inputs"
+
+            # Failing writes: the bulk job stops instead of re-selecting the same stale rows forever
+            with store.pool.connection() as conn:
+                conn.execute("UPDATE assignments SET catalog_version = 'old'")
+            store._write_batch = lambda batch: None
+            assert store.rescore_stale(catalog, api.rescore_inputs, chunk=5) == 5, "Failed: no-progress pass should stop"
+        finally:
+            api.ASSIGNMENT_STORE = None
+            store.close()
+
+    print("  ✓ Assignment store working")
+
+
+def test_admission_control():
+    """Requests beyond the concurrency limit queue, shed with 503 or degrade."""
+    print("Testing admission control...")
+
+    import asyncio
+    import backend.api as api
+    from backend.admission import SHED, AdmissionController, Shed
+    from backend.result_cache import RESULT_CACHE
+
+    async def scenario():
+        controller = AdmissionController(concurrency=1, queue_size=1, max_wait_ms=1000, degrade_depth=1)
+        assert await controller.acquire() is False, "Failed: idle admission should not degrade"
+        waiter = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.queue_depth == 1, "Failed: second request should queue"
+        try:
+            await controller.acquire()
+            assert False, "Failed: full queue should shed"
+        except Shed as shed:
+            assert shed.reason == "queue_full" and shed.retry_after >= 1, "Failed: queue_full shed"
+        controller.release(0.01)
+        assert await waiter is False and controller.in_flight == 1, "Failed: slot handed to the waiter"
+
+        try:
+            await controller.acquire(budget=0.02)
+            assert False, "Failed: waiter past its budget should shed"
+        except Shed as shed:
+            assert shed.reason == "timeout", "Failed: timeout shed"
+        controller.service_time = 5.0
+        try:
+            await controller.acquire()
+            assert False, "Failed: hopeless wait should shed at once"
+        except Shed as shed:
+            assert shed.reason == "deadline" and shed.retry_after >= 5, "Failed: deadline shed"
+        controller.release()
+        assert controller.in_flight == 0 and controller.queue_depth == 0, "Failed: slots leaked"
+
+    asyncio.run(scenario())
+
+    if api.ADMISSION is None:
+        print("  ✓ Admission controller working (middleware disabled)")
+        return
+    admission = api.ADMISSION
+    saved = (admission.in_flight, admission.queue_size, admission.degrade_depth)
+
+    # Saturated with no queue: immediate 503 + Retry-After
+    shed_before = SHED.value(reason="queue_full")
+    admission.in_flight, admission.queue_size = admission.concurrency, 0
+    try:
+        resp = client.post("/assign_to_rings", json=COMFORT_PROFILE)
+    finally:
+        admission.in_flight, admission.queue_size = saved[0], saved[1]
+    assert resp.status_code == 503 and int(resp.headers["Retry-After"]) >= 1, "Failed: overload should 503"
+    assert SHED.value(reason="queue_full") == shed_before + 1, "Failed: shed counter"
+    assert client.get("/").status_code == 200, "Failed: other endpoints are not admission-controlled"
+
+    # Degraded: nearest canonical cached profile, else a lean response
+    RESULT_CACHE.clear()
+    profile = dict(COMFORT_PROFILE, spice_intensity=0.8, richness=0.2)
+    canonical = client.post("/assign_to_rings", json=profile).json()
+    admission.degrade_depth = 0
+    try:
+        resp = client.post("/assign_to_rings", json=dict(profile, dislikes=["Sushi"]))
+        assert resp.headers.get("X-Degraded") == "canonical", "Failed: canonical fallback"
+        assert resp.json() == canonical, "Failed: canonical body"
+
+        # A filter is never dropped: the unfiltered canonical result must not answer it
+        resp = client.post("/assign_to_rings", json=dict(profile, filter="origin=Japan"))
+        assert resp.headers.get("X-Degraded") == "lean", "Failed: filtered request fell back to unfiltered result"
+        filtered = {e["food_name"] for key in ("ring_0", "ring_1", "ring_2") for e in resp.json()[key]}
+        assert filtered and len(filtered) < len({e["food_name"] for e in canonical["ring_0"] + canonical["ring_1"] + canonical["ring_2"]}), \
+            "Failed: degraded filtered response ignores the filter"
+
+        lean_profile = dict(profile, archetypes=["heat_seeker"], dislikes=["Sushi"])
+        RESULT_CACHE.clear()
+        resp = client.post("/assign_to_rings", json=lean_profile)
+        lean = resp.json()
+        assert resp.headers.get("X-Degraded") == "lean", "Failed: lean fallback"
+        assert "dimension_contributions" not in lean["ring_0"][0], "Failed: lean omits contributions"
+        assert "explanation" not in lean["personality"], "Failed: lean omits explanation"
+    finally:
+        admission.degrade_depth = saved[2]
+    full = client.post("/assign_to_rings", json=lean_profile)
+    assert "X-Degraded" not in full.headers, "Failed: normal load should not degrade"
+    for ring_key in ("ring_0", "ring_1", "ring_2"):
+        assert [(e["food_name"], e["distance"]) for e in lean[ring_key]] == \
+            [(e["food_name"], e["distance"]) for e in full.json()[ring_key]], "Failed: lean rings differ"
+
+    print("  ✓ Admission control working")
+
+
+def test_evaluation_bundle():
+    """The exported bundle reproduces /assign_to_rings on every conformance case."""
+    print("Testing evaluation bundle...")
+
+    from backend.bundle import check_conformance, evaluate_bundle
+
+    resp = client.get("/bundle")
+    assert resp.status_code == 200 and resp.headers.get("ETag"), "Failed: bundle should be pre-rendered"
+    bundle = resp.json()
+    assert bundle["format_version"] == 1 and bundle["foods"]["ids"] == client.get("/foods").json()["foods"], "Failed: bundle contents"
+    assert client.get("/bundle", headers={"If-None-Match": resp.headers["ETag"]}).status_code == 304, \
+        "Failed: bundle revalidation"
+
+    conformance = client.get("/bundle/conformance").json()
+    assert conformance["bundle_version"] == bundle["bundle_version"], "Failed: conformance set version"
+    assert len(conformance["cases"]) > 243, "Failed: conformance set should cover the whole grid"
+    assert check_conformance(bundle, conformance) == [], "Failed: reference evaluator disagrees with the server"
+
+    # The expected results are the API's own answers
+    case = conformance["cases"][-1]
+    inputs = case["input"]
+    profile = dict(zip(bundle["dimensions"], inputs["vector"]), dislikes=inputs["dislikes"], archetypes=inputs["archetypes"])
+    api_response = client.post("/assign_to_rings", json=profile).json()
+    local = evaluate_bundle(bundle, inputs["vector"], inputs["dislikes"], inputs["archetypes"])
+    for ring_num, ring in enumerate(local["rings"]):
+        assert [(bundle["foods"]["ids"][i], d) for i, d in ring] == \
+            [(e["food_name"], e["distance"]) for e in api_response[f"ring_{ring_num}"]], "Failed: ring mismatch"
+    assert local["ring_thresholds"] == api_response["ring_thresholds"], "Failed: threshold mismatch"
+    personality = {k: v for k, v in api_response["personality"].items() if k != "explanation"}
+    assert local["personality"] == personality, "Failed: personality mismatch"
+
+    # Approximate server thresholds: the exact-only bundle is refused
+    import backend.api as api
+    saved = api.THRESHOLD_ERROR
+    api.THRESHOLD_ERROR = 0.45  # samples 14 of the 18 foods
+    try:
+        assert client.get("/bundle").status_code == 409, "Failed: bundle should be refused"
+        assert client.get("/bundle/conformance").status_code == 409, "Failed: conformance should be refused"
+    finally:
+        api.THRESHOLD_ERROR = saved
+
+    print("  ✓ Evaluation bundle conformant")
+
+
+def run_all_tests():
+    """Run all test cases."""
+    print("\n" + "=" * 80)
+    print("FOOD PERSONALITY API - TEST SUITE")
+    print("=" * 80 + "\n")
+
+    tests = [
+        test_server_timing_and_metrics,
+        test_debug_endpoints,
+        test_loadgen_harness,
+        test_result_cache_and_readiness,
+        test_live_websocket_deltas,
+        test_conditional_since_responses,
+        test_streaming_rings,
+        test_catalog_filters,
+        test_food_search,
+        test_foods_pagination,
+        test_catalog_http_caching,
+        test_binary_ring_responses,
+        test_shared_result_cache,
+        test_assignment_store,
+        test_admission_control,
+        test_evaluation_bundle,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Unexpected error: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"TEST RESULTS: {passed} passed, {failed} failed")
+    print("=" * 80 + "\n")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
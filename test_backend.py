@@ -14,7 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend import (
     UserTasteVector, Archetype, assign_to_rings,
-    euclidean_distance, FOODS, VALID_VALUES
+    euclidean_distance, FOODS, VALID_VALUES, DIMENSION_NAMES
 )
 
 
@@ -253,6 +253,432 @@ def test_archetype_effects():
     print("  ✓ Archetype effects working correctly")
 
 
+def test_catalog_snapshot():
+    """Catalog compiles deterministically and round-trips through the startup snapshot."""
+    print("Testing Catalog & Snapshot...")
+
+    import tempfile
+    from backend.catalog import build_catalog, code_vector, vector_code
+    from backend.snapshot import build_snapshot, load_snapshot
+
+    catalog = build_catalog()
+    assert list(catalog.food_ids) == list(FOODS.keys()), "Failed: catalog order differs from registry"
+    assert catalog.version == build_catalog().version, "Failed: catalog hash not deterministic"
+    for i, food_id in enumerate(catalog.food_ids):
+        assert catalog.index[food_id] == i, "Failed: index map mismatch"
+        assert code_vector(vector_code(FOODS[food_id])) == FOODS[food_id], "Failed: grid code round trip"
+    assert sum(len(v) for v in catalog.cells.values()) == len(FOODS), "Failed: cell index incomplete"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.snapshot")
+        build_snapshot(path)
+        loaded = load_snapshot(path)
+        assert loaded is not None and loaded.validated, "Failed: current snapshot should load"
+        assert loaded.version == catalog.version, "Failed: snapshot version mismatch"
+        assert loaded.vectors == catalog.vectors, "Failed: snapshot vectors mismatch"
+        assert load_snapshot(path, expected_hash="stale") is None, "Failed: stale snapshot should be rejected"
+        assert load_snapshot(path, expected_code="stale") is None, "Failed: snapshot from other code should be rejected"
+        assert load_snapshot(os.path.join(tmp, "missing")) is None, "Failed: missing snapshot should be ignored"
+
+    print("  ✓ Catalog & snapshot consistent")
+
+
+def test_neighborhood_preview():
+    """Neighbor previews match full assign_to_rings runs for every one-step move."""
+    print("Testing Neighborhood Preview...")
+
+    from backend.distance import catalog_distances, compute_distance_with_archetypes
+    from backend.neighborhood import neighborhood_preview
+
+    user = UserTasteVector(0.5, 0.2, 0.8, 0.5, 0.5)
+    dislikes = {"Sushi"}
+    archetypes = {Archetype.TEXTURE_AVOIDER, Archetype.HEAT_SEEKER}
+
+    fast = catalog_distances(user.to_tuple(), dislikes, archetypes)
+    for i, (food_name, food_vec) in enumerate(FOODS.items()):
+        exact, _ = compute_distance_with_archetypes(user.to_tuple(), food_vec, food_name, dislikes, archetypes)
+        assert fast[i] == exact, f"Failed: table distance differs for {food_name}"
+
+    def rings_of(vector):
+        a = assign_to_rings(vector, dislikes, archetypes)
+        return a, {fd.food_name: fd.ring for fd in a.ring_0 + a.ring_1 + a.ring_2}
+
+    base, base_rings = rings_of(user)
+    preview = neighborhood_preview(user, dislikes, archetypes)
+    assert preview["base"]["ring_thresholds"] == list(base.ring_thresholds), "Failed: base thresholds"
+    assert len(preview["neighbors"]) == 8, "Failed: expected 8 in-range one-step moves"
+
+    for neighbor in preview["neighbors"]:
+        values = list(user.to_tuple())
+        values[list(DIMENSION_NAMES).index(neighbor["dimension"])] = neighbor["value"]
+        moved, moved_rings = rings_of(UserTasteVector(*values))
+        assert neighbor["ring_thresholds"] == list(moved.ring_thresholds), "Failed: neighbor thresholds"
+        expected = {name for name in FOODS if moved_rings[name] != base_rings[name]}
+        assert {c["food_name"] for c in neighbor["changes"]} == expected, \
+            f"Failed: ring changes for {neighbor['dimension']} {neighbor['step']:+d}"
+        for change in neighbor["changes"]:
+            assert change["to_ring"] == moved_rings[change["food_name"]], "Failed: target ring"
+
+    print("  ✓ Neighborhood preview consistent")
+
+
+def test_top_k_stretch():
+    """Top-K selection matches the prefixes of the fully sorted rings."""
+    print("Testing Top-K Stretch Selection...")
+
+    import random
+    from array import array
+    from backend.ring_assignment import compute_ring_thresholds
+    from backend.topk import select_thresholds, top_k_stretch
+
+    rng = random.Random(3)
+    for n in (1, 2, 5, 18, 257):
+        values = [rng.choice([0.3, 0.5, 0.9, rng.random()]) for _ in range(n)]
+        work = array("d", values)
+        assert select_thresholds(work, {Archetype.FLAVOR_EXPLORER}) == \
+            compute_ring_thresholds(values, {Archetype.FLAVOR_EXPLORER}), f"Failed: quickselect thresholds (n={n})"
+        assert sorted(work) == sorted(values), f"Failed: in-place selection should permute its buffer (n={n})"
+
+    for user, dislikes, archetypes in [
+        (UserTasteVector(0.2, 0.5, 0.2, 0.8, 0.2), set(), set()),
+        (UserTasteVector(0.8, 0.8, 0.8, 0.5, 0.8), {"Cheeseburger"}, {Archetype.FLAVOR_EXPLORER}),
+    ]:
+        full = assign_to_rings(user, dislikes, archetypes)
+        for k in (0, 1, 3, 50):
+            top = top_k_stretch(user, dislikes, archetypes, k)
+            assert top.ring_thresholds == full.ring_thresholds, "Failed: top-K thresholds"
+            assert top.ring_sizes == (len(full.ring_0), len(full.ring_1), len(full.ring_2)), "Failed: ring sizes"
+            assert [(fd.food_name, fd.distance) for fd in top.ring_1] == \
+                [(fd.food_name, fd.distance) for fd in full.ring_1[:k]], f"Failed: ring 1 top-{k}"
+            assert [(fd.food_name, fd.distance) for fd in top.ring_2] == \
+                [(fd.food_name, fd.distance) for fd in full.ring_2[:k]], f"Failed: ring 2 top-{k}"
+
+    print("  ✓ Top-K selection consistent")
+
+
+def test_spatial_index():
+    """Grid index radius and k-NN queries match brute-force scans."""
+    print("Testing Spatial Index...")
+
+    import random
+    from backend.distance import euclidean_distance, compute_distance_with_archetypes
+    from backend.spatial_index import foods_within, nearest_foods
+
+    rng = random.Random(7)
+    for _ in range(20):
+        vector = tuple(rng.choice(VALID_VALUES) for _ in DIMENSION_NAMES)
+        dislikes = set(rng.sample(sorted(FOODS), 3))
+        archetypes = set(rng.sample(list(Archetype), rng.randint(0, 2)))
+
+        for metric in ("euclidean", "archetype"):
+            if metric == "euclidean":
+                brute = [(name, euclidean_distance(vector, vec)) for name, vec in FOODS.items()]
+            else:
+                brute = [(name, compute_distance_with_archetypes(vector, vec, name, dislikes, archetypes)[0])
+                         for name, vec in FOODS.items()]
+            brute.sort(key=lambda m: (m[1], m[0]))
+
+            for k in (0, 1, 5, len(brute) + 1):
+                assert nearest_foods(vector, k, metric, dislikes, archetypes) == brute[:k], \
+                    f"Failed: {metric} k-NN (k={k})"
+            radius = rng.choice([0.0, 0.3, 0.6, 1.2])
+            assert foods_within(vector, radius, metric, dislikes, archetypes) == \
+                [m for m in brute if m[1] <= radius], f"Failed: {metric} radius {radius}"
+
+    dish = next(iter(FOODS))
+    similar = nearest_foods(FOODS[dish], 5, exclude={dish})
+    assert len(similar) == 5 and dish not in {name for name, _ in similar}, "Failed: dish neighbors"
+
+    print("  ✓ Spatial index matches linear scan")
+
+
+def test_food_similarity():
+    """Exact and grouped similarity indexes match a brute-force scan, before and after updates."""
+    print("Testing Food Similarity...")
+
+    import dataclasses
+    from backend.catalog import build_catalog
+    from backend.distance import euclidean_distance
+    from backend.food_registry import FOOD_REGISTRY
+    from backend.similarity import build_similarity, update_similarity
+
+    def brute(catalog, food_id, k):
+        vectors = dict(zip(catalog.food_ids, catalog.vectors))
+        ranked = sorted(
+            ((other, euclidean_distance(vectors[food_id], vec)) for other, vec in vectors.items() if other != food_id),
+            key=lambda m: (m[1], m[0])
+        )
+        return ranked[:k]
+
+    names = list(FOOD_REGISTRY)
+    old_catalog = build_catalog({name: FOOD_REGISTRY[name] for name in names[:-3]})
+    new_registry = {name: FOOD_REGISTRY[name] for name in names[2:]}
+    new_registry[names[4]] = dataclasses.replace(new_registry[names[4]], spice_intensity=0.8, richness=0.2)
+    new_catalog = build_catalog(new_registry)
+
+    for mode in ("exact", "grouped"):
+        index = build_similarity(old_catalog, mode)
+        for food_id in old_catalog.food_ids:
+            for k in (0, 1, 4, 20):
+                assert index.similar(food_id, k) == brute(old_catalog, food_id, k), f"Failed: {mode} similar({food_id}, {k})"
+
+        updated = update_similarity(index, old_catalog, new_catalog)
+        for food_id in new_catalog.food_ids:
+            assert updated.similar(food_id, 6) == brute(new_catalog, food_id, 6), f"Failed: {mode} update for {food_id}"
+        assert names[0] not in updated and names[0] in index, "Failed: update must not modify the old index"
+
+    print("  ✓ Similarity index consistent")
+
+
+def test_distance_table():
+    """Array-backed assignments match per-food FoodDistance results exactly."""
+    print("Testing Distance Table...")
+
+    import math
+    from backend.distance import compute_distance_with_archetypes
+    from backend.taste_vector import FoodDistance
+
+    user = UserTasteVector(0.8, 0.5, 0.2, 0.8, 0.5)
+    dislikes = {"Sushi", "Lamb curry"}
+    archetypes = {Archetype.REFINED_MINIMALIST, Archetype.TEXTURE_AVOIDER}
+    subset = list(FOODS)[::-2]  # reversed order, to exercise row vs catalog indices
+
+    for food_ids in (None, subset):
+        reference = []
+        for name in (FOODS if food_ids is None else food_ids):
+            distance, contrib = compute_distance_with_archetypes(
+                user.to_tuple(), FOODS[name], name, dislikes, archetypes
+            )
+            reference.append(FoodDistance(name, distance, -1, contrib))
+        reference.sort()
+
+        for contributions in (True, False):
+            a = assign_to_rings(user, dislikes, archetypes, food_ids, contributions=contributions)
+            foods = a.ring_0 + a.ring_1 + a.ring_2
+            assert [fd.food_name for fd in foods] == [fd.food_name for fd in reference], \
+                "Failed: ring order differs from FoodDistance sort"
+            for fd, ref in zip(foods, reference):
+                assert fd.distance == ref.distance, f"Failed: distance for {fd.food_name}"
+                assert fd.dimension_contributions == ref.dimension_contributions, \
+                    f"Failed: contributions for {fd.food_name}"
+                assert list(fd.dimension_contributions) == list(ref.dimension_contributions), \
+                    "Failed: contribution key order"
+            for ring_num, ring in enumerate((a.ring_0, a.ring_1, a.ring_2)):
+                assert all(fd.ring == ring_num for fd in ring), "Failed: ring numbers"
+            for fd in foods:
+                assert fd.distance == math.sqrt(sum(fd.dimension_penalties)), "Failed: penalty row sum"
+            if contributions:
+                assert len(foods[0].table.penalties) == 5 * len(foods), "Failed: n × 5 penalty matrix"
+            first = foods[0].dimension_contributions
+            first["mutated"] = 1.0
+            assert "mutated" not in foods[0].dimension_contributions, "Failed: contribution dicts must not be shared"
+
+    print("  ✓ Distance table consistent")
+
+
+def test_personality_table():
+    """Table lookups and lazy explanations match the rules evaluated directly."""
+    print("Testing Personality Table...")
+
+    import itertools
+    from backend.explanations import (
+        determine_personality, generate_personality_explanation, personality_ranking, score_personalities
+    )
+
+    archetype_sets = [set(), {Archetype.HEAT_SEEKER}, {Archetype.COMFORT_MAXIMALIST, Archetype.TEXTURE_AVOIDER}]
+    ring_sizes = [(6, 6, 6), (10, 5, 3), (3, 5, 10)]
+    vectors = list(itertools.product(VALID_VALUES, repeat=5))[::7] + [(0.3, 0.9, 0.1, 0.45, 0.55)]
+
+    for vec in vectors:
+        for archetypes in archetype_sets:
+            for sizes in ring_sizes:
+                assert personality_ranking(vec, archetypes, sizes) == score_personalities(vec, archetypes, sizes), \
+                    f"Failed: ranking for {vec}, {archetypes}, {sizes}"
+
+    user = UserTasteVector(0.2, 0.5, 0.2, 0.2, 0.2)
+    archetypes = {Archetype.COMFORT_MAXIMALIST, Archetype.REFINED_MINIMALIST}
+    rings = ([None] * 9, [None] * 5, [None] * 4)
+    profile = determine_personality(user, archetypes, *rings)
+    assert profile.explanation == generate_personality_explanation(
+        profile.primary_personality, user, archetypes, *rings
+    ), "Failed: lazy explanation differs"
+    assert profile.explanation.startswith("Your preparation familiarity preference is 0.2 (low)"), \
+        "Failed: explanation template"
+
+    print("  ✓ Personality table consistent")
+
+
+def test_streamed_reports():
+    """Streamed reports match the string reports; foods are found through the assignment index."""
+    print("Testing Streamed Reports...")
+
+    import io
+    from backend.explanations import (
+        explain_food_distance, explain_ring_assignment, write_food_distance, write_ring_assignment
+    )
+
+    user = UserTasteVector(0.8, 0.8, 0.8, 0.5, 0.8)
+    a = assign_to_rings(user, {"Cheeseburger"}, {Archetype.FLAVOR_EXPLORER, Archetype.HEAT_SEEKER})
+
+    out = io.StringIO()
+    write_ring_assignment(a, out)
+    report = out.getvalue()
+    assert report == explain_ring_assignment(a), "Failed: streamed report differs"
+    assert "DISLIKES: Cheeseburger" in report, "Failed: dislikes missing"
+    assert report.count("foods)") == 3, "Failed: ring sections"
+
+    for ring_num, ring in enumerate((a.ring_0, a.ring_1, a.ring_2)):
+        for position, fd in enumerate(ring):
+            assert a.food_index()[fd.food_name] == (ring_num, position), "Failed: food index"
+            assert a.find_food(fd.food_name) is fd, "Failed: find_food"
+
+    out = io.StringIO()
+    write_food_distance("Steak tartare", a, out)
+    assert out.getvalue() == explain_food_distance("Steak tartare", a), "Failed: streamed detail differs"
+    assert "DETAILED EXPLANATION: Steak tartare" in out.getvalue(), "Failed: detail header"
+
+    assert a.find_food("Nope") is None, "Failed: unknown food found"
+    assert explain_food_distance("Nope", a) == "Food 'Nope' not found.", "Failed: not-found message"
+    try:
+        write_food_distance("Nope", a, io.StringIO())
+        assert False, "Failed: unknown food should raise KeyError"
+    except KeyError:
+        pass
+
+    print("  ✓ Streamed reports consistent")
+
+
+def test_approximate_thresholds():
+    """Sampled thresholds stay within their rank error bound; small selections stay exact."""
+    print("Testing Approximate Thresholds...")
+
+    import random
+    from backend.catalog import build_catalog
+    from backend.distance import catalog_distances
+    from backend.food_registry import FoodProfile
+    from backend.ring_assignment import compute_ring_thresholds, estimate_ring_thresholds
+
+    rng = random.Random(7)
+    registry = {}
+    for i in range(5000):
+        food_id = f"synthetic-{i}"
+        registry[food_id] = FoodProfile(food_id, food_id, *[rng.choice(VALID_VALUES) for _ in range(5)], "", "", "", "")
+    catalog = build_catalog(registry)
+    user = UserTasteVector(0.5, 0.2, 0.8, 0.5, 0.2)
+    error = 0.05
+
+    distances = catalog_distances(user.to_tuple(), set(), set(), catalog)
+    (t0, t1), bound = estimate_ring_thresholds(distances, set(), error)
+    assert bound == error, "Failed: error bound not reported"
+    n = len(distances)
+    for threshold, p in ((t0, 0.33), (t1, 0.66)):
+        below = sum(d < threshold for d in distances) / n
+        at_or_below = sum(d <= threshold for d in distances) / n
+        assert below <= p + error + 1 / n and at_or_below >= p - error, \
+            f"Failed: threshold {threshold} outside the rank bound of percentile {p}"
+
+    a = assign_to_rings(user, set(), {Archetype.FLAVOR_EXPLORER}, catalog=catalog, threshold_error=error)
+    assert a.threshold_error == error, "Failed: assignment error bound"
+    # Sample-first, single-pass assignment: same estimate as sampling the full distance array
+    explorer_distances = catalog_distances(user.to_tuple(), set(), {Archetype.FLAVOR_EXPLORER}, catalog)
+    assert a.ring_thresholds == estimate_ring_thresholds(explorer_distances, {Archetype.FLAVOR_EXPLORER}, error)[0], \
+        "Failed: single-pass thresholds differ from the sampled estimate"
+    lean = assign_to_rings(
+        user, set(), {Archetype.FLAVOR_EXPLORER}, catalog=catalog, threshold_error=error, contributions=False
+    )
+    assert [(fd.food_name, fd.distance, fd.ring) for fd in lean.ring_1] == \
+        [(fd.food_name, fd.distance, fd.ring) for fd in a.ring_1], "Failed: lean single pass differs"
+    assert len(a.ring_0) + len(a.ring_1) + len(a.ring_2) == n, "Failed: partition completeness"
+    t0, t1 = a.ring_thresholds
+    assert all(fd.distance <= t0 for fd in a.ring_0) and all(fd.distance > t1 for fd in a.ring_2), \
+        "Failed: rings disagree with approximate thresholds"
+
+    # The 18-food catalog is far smaller than the sample: exact thresholds, bound 0
+    exact = assign_to_rings(user, set(), set())
+    approx = assign_to_rings(user, set(), set(), threshold_error=error)
+    assert approx.threshold_error == 0.0, "Failed: small catalog should be exact"
+    assert approx.ring_thresholds == exact.ring_thresholds, "Failed: small catalog thresholds differ"
+    assert exact.ring_thresholds == compute_ring_thresholds([fd.distance for fd in exact.ring_0 + exact.ring_1 + exact.ring_2], set()), \
+        "Failed: exact thresholds"
+
+    # Every other ring-producing path uses the same estimate (0.45 samples 14 of the 18 foods)
+    from backend import streaming
+    from backend.binary_format import decode_ring_response, encode_ring_response
+    from backend.catalog import get_catalog
+    from backend.neighborhood import neighborhood_preview
+    from backend.topk import top_k_stretch
+
+    error = 0.45
+    approx = assign_to_rings(user, set(), set(), threshold_error=error)
+    assert approx.threshold_error == error, "Failed: 18 foods should be sampled at error 0.45"
+    subset = iter(list(FOODS)[:16])  # any iterable selection, read once
+    filtered = assign_to_rings(user, set(), set(), food_ids=subset, threshold_error=error)
+    filtered_distances = catalog_distances(user.to_tuple(), set(), set(), get_catalog(), range(16))
+    assert filtered.threshold_error == error and sum(map(len, (filtered.ring_0, filtered.ring_1, filtered.ring_2))) == 16, \
+        "Failed: filtered selection should be sampled and complete"
+    assert filtered.ring_thresholds == estimate_ring_thresholds(filtered_distances, set(), error)[0], \
+        "Failed: filtered sampled thresholds"
+    field = {"quantile": error, "confidence": 0.99}
+    event, payload = next(streaming.ring_events(user, set(), set(), lambda fd: fd.food_name, threshold_error=error))
+    assert payload["ring_thresholds"] == list(approx.ring_thresholds) and payload["threshold_error"] == field, \
+        "Failed: streamed thresholds should be approximate"
+    preview = neighborhood_preview(user, set(), set(), threshold_error=error)
+    assert preview["base"]["ring_thresholds"] == list(approx.ring_thresholds) and preview["threshold_error"] == field, \
+        "Failed: neighborhood thresholds should be approximate"
+    stretch = top_k_stretch(user, set(), set(), 3, threshold_error=error)
+    assert stretch.ring_thresholds == approx.ring_thresholds and stretch.threshold_error == error, \
+        "Failed: top-K thresholds should be approximate"
+    assert "threshold_error" not in neighborhood_preview(user, set(), set()), "Failed: exact preview has no bound"
+
+    catalog = get_catalog()
+    response = {
+        "ring_0": [], "ring_1": [], "ring_2": [],
+        "personality": {
+            "primary_personality": "p", "secondary_personality": "s",
+            "confidence_primary": 0.5, "confidence_secondary": 0.5, "explanation": "",
+        },
+        "ring_thresholds": list(approx.ring_thresholds),
+        "result_hash": "0" * 20,
+    }
+    assert "threshold_error" not in decode_ring_response(encode_ring_response(response, catalog), catalog), \
+        "Failed: exact binary response"
+    response["threshold_error"] = field
+    assert decode_ring_response(encode_ring_response(response, catalog), catalog)["threshold_error"] == field, \
+        "Failed: binary threshold_error round trip"
+
+    print("  ✓ Approximate thresholds within bound")
+
+
+def test_runtime_registry_changes():
+    """Foods added to or removed from the registry at runtime are scored."""
+    print("Testing Runtime Registry Changes...")
+
+    from dataclasses import replace
+    from backend.catalog import get_catalog, register_food, unregister_food
+    from backend.food_registry import FOOD_REGISTRY
+
+    user = UserTasteVector(0.5, 0.5, 0.5, 0.5, 0.5)
+    count = len(FOODS)
+    base = FOOD_REGISTRY["Sushi"]
+    try:
+        register_food(replace(base, food_id="Sushi roll", display_name="Sushi Roll"))
+        a = assign_to_rings(user, set(), set())
+        names = {fd.food_name for fd in a.ring_0 + a.ring_1 + a.ring_2}
+        assert len(names) == count + 1 and "Sushi roll" in names, "Failed: registered food not scored"
+
+        # Direct registry edits that change the food count are picked up too
+        FOOD_REGISTRY["Nigiri"] = replace(base, food_id="Nigiri", display_name="Nigiri")
+        assert len(get_catalog()) == count + 2, "Failed: direct registry addition not noticed"
+    finally:
+        FOOD_REGISTRY.pop("Nigiri", None)
+        unregister_food("Sushi roll")
+    a = assign_to_rings(user, set(), set())
+    assert len(a.ring_0) + len(a.ring_1) + len(a.ring_2) == count, "Failed: unregistered food still scored"
+    assert len(FOODS) == count, "Failed: FOODS out of step"
+
+    print("  ✓ Runtime registry changes scored")
+
+
 def run_all_tests():
     """Run all test cases."""
     print("\n" + "=" * 80)
@@ -272,6 +698,16 @@ def run_all_tests():
         test_i17_update_food_consistency,
         test_dislike_penalty,
         test_archetype_effects,
+        test_catalog_snapshot,
+        test_neighborhood_preview,
+        test_top_k_stretch,
+        test_spatial_index,
+        test_food_similarity,
+        test_distance_table,
+        test_personality_table,
+        test_streamed_reports,
+        test_approximate_thresholds,
+        test_runtime_registry_changes,
     ]
     
     passed = 0
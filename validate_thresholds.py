@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Validation: approximate vs exact ring thresholds.
+
+On a synthetic catalog (random grid foods) or the real one, assigns a
+spread of taste profiles twice, with exact thresholds and with thresholds
+estimated within --error (FOOD_API_THRESHOLD_ERROR), and reports how often
+ring membership differs, plus the time spent finding the thresholds and
+the end-to-end assign_to_rings() time in each mode (approximate mode
+computes only the sample before classifying every food in one pass).
+
+Usage:
+    python validate_thresholds.py [--foods 200000] [--error 0.01] [--profiles 40]
+
+--foods 0 uses the installed catalog (too small to be sampled: no
+differences by construction).
+"""
+
+import argparse
+import itertools
+import random
+import statistics
+import time
+
+from backend import VALID_VALUES, Archetype, UserTasteVector
+from backend.approx_thresholds import THRESHOLD_CONFIDENCE, sample_size
+from backend.catalog import build_catalog, get_catalog
+from backend.distance import catalog_distances
+from backend.food_registry import FoodProfile
+from backend.ring_assignment import assign_to_rings, compute_ring_thresholds, estimate_ring_thresholds
+
+
+def synthetic_catalog(count: int, seed: int = 0):
+    """Catalog of `count` foods with random grid taste vectors."""
+    rng = random.Random(seed)
+    registry = {}
+    for i in range(count):
+        food_id = f"synthetic-{i:07d}"
+        vector = [rng.choice(VALID_VALUES) for _ in range(5)]
+        registry[food_id] = FoodProfile(food_id, food_id, *vector, "", "", "", "")
+    return build_catalog(registry)
+
+
+def _rings(distances, thresholds):
+    t0, t1 = thresholds
+    return [0 if d <= t0 else 1 if d <= t1 else 2 for d in distances]
+
+
+def _profiles(count: int):
+    archetype_sets = [set(), {Archetype.COMFORT_MAXIMALIST}, {Archetype.FLAVOR_EXPLORER, Archetype.HEAT_SEEKER}]
+    vectors = list(itertools.product(VALID_VALUES, repeat=5))
+    step = max(1, len(vectors) // count)
+    return list(zip(vectors[::step][:count], itertools.cycle(archetype_sets)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Approximate ring threshold validation")
+    parser.add_argument("--foods", type=int, default=200000, help="synthetic catalog size (0: installed catalog)")
+    parser.add_argument("--error", type=float, default=0.01, help="quantile rank error bound")
+    parser.add_argument("--confidence", type=float, default=THRESHOLD_CONFIDENCE)
+    parser.add_argument("--profiles", type=int, default=40)
+    args = parser.parse_args(argv)
+
+    catalog = synthetic_catalog(args.foods) if args.foods else get_catalog()
+    sample = sample_size(args.error, args.confidence)
+
+    disagreement, exact_ms, approx_ms, exact_assign_ms, approx_assign_ms = [], [], [], [], []
+    for vector, archetypes in _profiles(args.profiles):
+        distances = catalog_distances(vector, set(), archetypes, catalog)
+
+        start = time.perf_counter()
+        exact = compute_ring_thresholds(distances, archetypes)
+        exact_ms.append((time.perf_counter() - start) * 1e3)
+
+        start = time.perf_counter()
+        approx, _ = estimate_ring_thresholds(distances, archetypes, args.error, args.confidence)
+        approx_ms.append((time.perf_counter() - start) * 1e3)
+
+        differing = sum(a != b for a, b in zip(_rings(distances, exact), _rings(distances, approx)))
+        disagreement.append(differing / len(distances))
+
+        user_vector = UserTasteVector(*vector)
+        for error, timings in ((0.0, exact_assign_ms), (args.error, approx_assign_ms)):
+            start = time.perf_counter()
+            assign_to_rings(user_vector, set(), archetypes, contributions=False, catalog=catalog, threshold_error=error)
+            timings.append((time.perf_counter() - start) * 1e3)
+
+    print("=" * 80)
+    print(
+        f"THRESHOLD VALIDATION ({len(catalog)} foods, {len(disagreement)} profiles, "
+        f"error {args.error}, confidence {args.confidence})"
+    )
+    print("=" * 80)
+    print(f"  sample size              {sample if sample < len(catalog) else 'none (catalog too small: exact)'}")
+    print(f"  ring membership differs  mean {statistics.mean(disagreement):.4%}  max {max(disagreement):.4%}")
+    print(f"  profiles with any diff   {sum(d > 0 for d in disagreement)}/{len(disagreement)}")
+    print(f"  thresholds ms (median)   exact {statistics.median(exact_ms):.2f}  approximate {statistics.median(approx_ms):.2f}")
+    print(
+        f"  assign_to_rings ms (median, no contributions)  "
+        f"exact {statistics.median(exact_assign_ms):.1f}  approximate {statistics.median(approx_assign_ms):.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()